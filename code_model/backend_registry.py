@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+后端注册表模块
+按需加载NLP模型和分词器，记录每个后端的加载耗时和内存占用，
+并在超出内存预算时按最近最少使用（LRU）顺序卸载模型
+"""
+
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional
+
+
+def get_process_rss_mb() -> Optional[float]:
+    """获取当前进程的常驻内存（MB），无法获取时返回None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except Exception:
+        pass
+
+    # 没有psutil时，在Linux上读取/proc
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except Exception:
+        return None
+
+
+class BackendRegistry:
+    """
+    后端注册表
+
+    每个后端只注册一个加载函数，第一次被使用时才真正加载。
+    加载函数返回None或抛出异常都视为加载失败，失败后不再重复尝试。
+
+    设置内存预算后，已加载模型的估算占用超过预算时，按最近最少使用顺序
+    卸载可卸载的模型；被卸载的模型下次使用时会重新加载。
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None,
+                 allow: Optional[Callable[[str], bool]] = None):
+        """
+        Args:
+            memory_budget_mb: 模型内存预算（MB），None表示不限制；
+                默认读取环境变量 NLP_MODEL_MEMORY_BUDGET_MB
+            allow: 判断后端是否允许注册的函数（来自部署配置），None表示全部允许
+        """
+        self._allow = allow
+        if memory_budget_mb is None and os.environ.get('NLP_MODEL_MEMORY_BUDGET_MB'):
+            memory_budget_mb = float(os.environ['NLP_MODEL_MEMORY_BUDGET_MB'])
+        self.memory_budget_mb = memory_budget_mb
+
+        self._loaders = {}     # {名称: 加载函数}
+        self._groups = {}      # {名称: 分组}
+        self._evictable = {}   # {名称: 是否允许卸载}
+        self._instances = OrderedDict()  # {名称: 已加载的实例}，按最近使用排序
+        self._stats = {}       # {名称: 状态信息}
+        self._evictions = 0
+        self._over_budget = False  # 超出预算但已没有可卸载的模型
+        self._lock = threading.RLock()  # 保护实例表和状态，不在加载期间持有
+        self._load_locks = {}  # {名称: 加载锁}，同一后端同时只有一个线程加载
+        self._measure_lock = threading.Lock()  # 串行执行加载和RSS测量，避免并发加载互相计入
+
+    def register(self, name: str, loader: Callable[[], Any],
+                 group: str = 'nlp', description: str = '',
+                 evictable: bool = True) -> None:
+        """
+        注册后端加载函数
+
+        Args:
+            name: 后端名称（如 'jieba'、'stanza_zh'）
+            loader: 无参加载函数，返回模型实例
+            group: 分组（'nlp'、'segmenter'、'service'）
+            description: 后端描述，用于日志输出
+            evictable: 超出内存预算时是否允许卸载（模块级单例等卸载后不释放内存的应设为False）
+
+        被部署配置禁用的后端只记录为disabled状态，永远不会加载。
+        """
+        with self._lock:
+            enabled = self._allow is None or self._allow(name)
+            if enabled:
+                self._loaders[name] = loader
+            self._groups[name] = group
+            self._evictable[name] = evictable
+            self._stats[name] = {
+                'group': group,
+                'description': description or name,
+                'state': 'registered' if enabled else 'disabled',
+                'load_time': None,
+                'memory_mb': None,
+                'error': None,
+                'load_count': 0,
+                'last_used': None
+            }
+
+    def get(self, name: str) -> Any:
+        """
+        获取后端实例，未加载时先加载；不可用时返回None
+
+        已加载的实例只在全局锁内查找，不等待其他后端的加载；
+        加载在该后端自己的锁内进行（同一后端只加载一次），
+        加载完成后才重新获取全局锁登记实例并检查内存预算。
+        """
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is not None:
+                self._touch(name)
+                return instance
+            if name not in self._loaders or self._stats[name]['state'] == 'failed':
+                return None
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            # 等待期间其他线程可能已加载完成（或加载失败）
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is not None:
+                    self._touch(name)
+                    return instance
+                if self._stats[name]['state'] == 'failed':
+                    return None
+
+            instance = self._load(name)
+            if instance is None:
+                return None
+
+            with self._lock:
+                self._instances[name] = instance
+                self._touch(name)
+                evicted = self._enforce_budget(keep=name)
+
+        if evicted:
+            gc.collect()
+        return instance
+
+    def _touch(self, name: str) -> None:
+        """标记为最近使用（调用方持有全局锁）"""
+        self._instances.move_to_end(name)
+        self._stats[name]['last_used'] = time.time()
+
+    def _load(self, name: str) -> Any:
+        """
+        执行加载并记录耗时和内存（不持有全局锁）
+
+        内存占用按加载前后的进程RSS差值估算，测量锁保证其他后端不会同时加载。
+        卸载后重新加载时模块和缓存往往还在内存中，差值接近0，所以只保留测得的最大值
+        """
+        stats = self._stats[name]
+        stats['state'] = 'loading'
+
+        with self._measure_lock:
+            rss_before = get_process_rss_mb()
+            start_time = time.perf_counter()
+
+            try:
+                instance = self._loaders[name]()
+            except Exception as e:
+                instance = None
+                stats['error'] = str(e)
+
+            stats['load_time'] = round(time.perf_counter() - start_time, 4)
+            rss_after = get_process_rss_mb()
+
+        if rss_before is not None and rss_after is not None:
+            measured = round(max(rss_after - rss_before, 0.0), 2)
+            stats['memory_mb'] = max(stats['memory_mb'] or 0.0, measured)
+
+        if instance is None:
+            stats['state'] = 'failed'
+            print(f"✗ {stats['description']} 加载失败: {stats['error'] or '不可用'}")
+            return None
+
+        stats['state'] = 'loaded'
+        stats['load_count'] += 1
+        print(f"✓ {stats['description']} 按需加载完成，耗时 {stats['load_time']:.2f}s")
+        return instance
+
+    def _enforce_budget(self, keep: Optional[str] = None) -> int:
+        """
+        超出内存预算时按LRU顺序卸载模型（不会卸载刚刚使用的模型）
+
+        调用方持有全局锁，返回卸载的模型数（由调用方在释放锁后回收内存）
+        """
+        if self.memory_budget_mb is None:
+            return 0
+
+        used = self.memory_usage_mb()
+        evicted = 0
+        for name in list(self._instances):
+            if used <= self.memory_budget_mb:
+                break
+            if name != keep and self._evictable[name] and self._remove(name):
+                used -= self._stats[name]['memory_mb'] or 0.0
+                evicted += 1
+
+        over_budget = used > self.memory_budget_mb
+        if over_budget and not self._over_budget:
+            print(f"⚠ 模型内存 {used:.0f}MB 超出预算 {self.memory_budget_mb:.0f}MB，且没有可卸载的模型")
+        self._over_budget = over_budget
+        return evicted
+
+    def _remove(self, name: str) -> bool:
+        """从已加载实例中移除（调用方持有全局锁）"""
+        if name not in self._instances:
+            return False
+        del self._instances[name]
+        self._stats[name]['state'] = 'evicted'
+        self._evictions += 1
+        print(f"♻ 已卸载 {self._stats[name]['description']}")
+        return True
+
+    def evict(self, name: str) -> bool:
+        """卸载已加载的模型，下次使用时重新加载"""
+        with self._lock:
+            removed = self._remove(name)
+            if removed and self.memory_budget_mb is not None:
+                self._over_budget = self.memory_usage_mb() > self.memory_budget_mb
+        if removed:
+            gc.collect()
+        return removed
+
+    def memory_usage_mb(self) -> float:
+        """已加载模型的估算内存占用（MB）"""
+        return sum(self._stats[name]['memory_mb'] or 0.0 for name in list(self._instances))
+
+    def get_memory_stats(self) -> Dict:
+        """获取内存预算和LRU状态"""
+        with self._lock:
+            return {
+                'budget_mb': self.memory_budget_mb,
+                'used_mb': round(self.memory_usage_mb(), 2),
+                'evictions': self._evictions,
+                'over_budget': self._over_budget,  # 超出预算且没有可卸载的模型
+                'lru_order': list(self._instances),  # 从最久未用到最近使用
+                'footprints_mb': {name: self._stats[name]['memory_mb'] for name in self._instances}
+            }
+
+    def is_registered(self, name: str) -> bool:
+        """是否已注册"""
+        return name in self._loaders
+
+    def is_loaded(self, name: str) -> bool:
+        """是否已加载"""
+        return name in self._instances
+
+    def is_available(self, name: str) -> bool:
+        """是否可用（已注册且未加载失败），不会触发加载"""
+        return name in self._loaders and self._stats[name]['state'] != 'failed'
+
+    def registered_names(self, group: Optional[str] = None) -> List[str]:
+        """已注册的后端名称"""
+        return [name for name in self._loaders if group is None or self._groups[name] == group]
+
+    def loaded_names(self, group: Optional[str] = None) -> List[str]:
+        """已加载的后端名称"""
+        return [name for name in list(self._instances) if group is None or self._groups[name] == group]
+
+    def preload(self, names: Optional[List[str]] = None) -> Dict[str, bool]:
+        """预加载指定后端（默认全部），返回 {名称: 是否成功}"""
+        if names is None:
+            names = self.registered_names()
+        return {name: self.get(name) is not None for name in names}
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """获取每个后端的状态、加载耗时和内存占用"""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def view(self, group: str) -> 'BackendView':
+        """返回某个分组的字典视图"""
+        return BackendView(self, group)
+
+
+class BackendView(Mapping):
+    """
+    注册表的只读字典视图
+
+    兼容原有的 `'jieba' in self.segmenters`、`self.nlp_models['vader']` 写法：
+    成员检查和取值会触发按需加载，遍历只返回已加载的后端。
+    """
+
+    def __init__(self, registry: BackendRegistry, group: str):
+        self._registry = registry
+        self._group = group
+
+    def _owns(self, key) -> bool:
+        return self._registry._groups.get(key) == self._group
+
+    def __getitem__(self, key):
+        instance = self._registry.get(key) if self._owns(key) else None
+        if instance is None:
+            raise KeyError(key)
+        return instance
+
+    def __contains__(self, key) -> bool:
+        return self._owns(key) and self._registry.get(key) is not None
+
+    def __iter__(self):
+        return iter(self._registry.loaded_names(self._group))
+
+    def __len__(self) -> int:
+        return len(self._registry.loaded_names(self._group))
+
+    def __repr__(self) -> str:
+        return f"BackendView({self._group!r}, loaded={list(self)})"
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+语料库索引模块
+对大量文档统计词频和文档频率，按TF-IDF提取每篇文档的关键词和全语料的高频词
+"""
+
+import heapq
+import math
+import threading
+from array import array
+from typing import Dict, Hashable, List, Optional, Tuple
+
+# 延迟导入工具（只做规格检查，第一次使用时才真正导入）
+try:
+    from .lazy_imports import is_module_available, lazy_import
+except ImportError:
+    from lazy_imports import is_module_available, lazy_import
+
+SCIPY_AVAILABLE = is_module_available('scipy')
+scipy_sparse = lazy_import('scipy.sparse')
+
+
+class CorpusIndex:
+    """
+    语料库词项-文档索引
+
+    文档通过 TextProcessor.count_terms 入库（与词频统计相同的分词器和停用词过滤），
+    词项-文档计数按CSR（压缩稀疏行）格式保存在紧凑数组中：
+        indptr[i]:indptr[i+1] 为第i篇文档在 indices / counts 中的区间，
+        indices 为词编号（每篇文档内按编号升序），counts 为该词在文档中的出现次数。
+    每个词的文档频率和全语料词频随文档入库增量更新，添加文档不需要重建索引。
+
+    TF-IDF = 词频 / 文档词数 × (ln((1 + 文档数) / (1 + 文档频率)) + 1)
+
+    停用词等过滤条件在入库时生效，之后修改停用词不影响已入库的文档。
+
+    入库和跨多个数组的查询（top_terms、top_tfidf、get_document_terms）在同一把锁内进行，
+    查询看到的总是完整入库的文档；新词先追加文档频率和词频数组，再登记到词表。
+    """
+
+    def __init__(self, processor=None, **count_options):
+        """
+        Args:
+            processor: 用于分词和过滤的TextProcessor，None时新建一个
+            **count_options: 传给 TextProcessor.count_terms 的词频统计参数
+                             （如 segmentation_method、exclude_single_chars）
+        """
+        if processor is None:
+            try:
+                from .text_tools import TextProcessor
+            except ImportError:
+                from text_tools import TextProcessor
+            processor = TextProcessor()
+        self.processor = processor
+        self.count_options = count_options
+
+        self._vocabulary = {}         # {词: 编号}
+        self._terms = []              # 编号 -> 词
+        self._indptr = array('q', [0])
+        self._indices = array('i')
+        self._counts = array('i')
+        self._doc_lengths = array('q')  # 每篇文档过滤后的词数
+        self._df = array('i')           # 每个词的文档频率
+        self._term_totals = array('q')  # 每个词在全语料中的出现次数
+        self._doc_ids = []              # 行号 -> 文档ID
+        self._rows = {}                 # {文档ID: 行号}
+        self._lock = threading.Lock()
+
+    @property
+    def num_documents(self) -> int:
+        """文档数"""
+        return len(self._doc_ids)
+
+    @property
+    def vocabulary_size(self) -> int:
+        """不重复的词数"""
+        return len(self._terms)
+
+    def __len__(self) -> int:
+        return self.num_documents
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._rows
+
+    def add_document(self, text: str, doc_id: Optional[Hashable] = None) -> Hashable:
+        """添加一篇文档，返回文档ID（未指定时为行号）"""
+        return self.add_documents([text], None if doc_id is None else [doc_id])[0]
+
+    def add_documents(self, texts: List[str],
+                      doc_ids: Optional[List[Hashable]] = None) -> List[Hashable]:
+        """
+        批量添加文档（所有文档合并为一次分词）
+
+        Args:
+            texts: 文档文本列表
+            doc_ids: 与texts一一对应的文档ID，None时使用行号
+
+        Returns:
+            各文档的ID
+        """
+        texts = list(texts)
+        if doc_ids is not None:
+            doc_ids = list(doc_ids)
+            if len(doc_ids) != len(texts):
+                raise ValueError("文档ID数量与文档数不一致")
+            if len(set(doc_ids)) != len(doc_ids):
+                raise ValueError("文档ID重复")
+
+        counters = self.processor.count_terms(texts, **self.count_options)
+
+        with self._lock:
+            if doc_ids is None:
+                doc_ids = list(range(len(self._doc_ids), len(self._doc_ids) + len(texts)))
+            duplicated = [doc_id for doc_id in doc_ids if doc_id in self._rows]
+            if duplicated:
+                raise ValueError(f"文档ID已存在: {duplicated[:5]}")
+
+            vocabulary, terms = self._vocabulary, self._terms
+            for doc_id, counter in zip(doc_ids, counters):
+                row = []
+                for word, count in counter.items():
+                    term_id = vocabulary.get(word)
+                    if term_id is None:
+                        # 先追加每个词的数组，再登记词，不加锁的查询不会越界
+                        term_id = len(terms)
+                        self._df.append(0)
+                        self._term_totals.append(0)
+                        terms.append(word)
+                        vocabulary[word] = term_id
+                    row.append((term_id, count))
+                    self._df[term_id] += 1
+                    self._term_totals[term_id] += count
+                row.sort()
+
+                self._indices.extend(term_id for term_id, _ in row)
+                self._counts.extend(count for _, count in row)
+                self._doc_lengths.append(sum(counter.values()))
+                self._indptr.append(len(self._indices))
+                # 行数据写完后才登记文档ID，并发读取时查到的文档总是完整的
+                self._rows[doc_id] = len(self._doc_ids)
+                self._doc_ids.append(doc_id)
+        return doc_ids
+
+    def _idf(self, term_id: int) -> float:
+        return math.log((1 + self.num_documents) / (1 + self._df[term_id])) + 1
+
+    def idf(self, word: str) -> float:
+        """词的逆文档频率（平滑），未收录的词按文档频率0计算"""
+        term_id = self._vocabulary.get(word)
+        df = self._df[term_id] if term_id is not None else 0
+        return math.log((1 + self.num_documents) / (1 + df)) + 1
+
+    def document_frequency(self, word: str) -> int:
+        """包含该词的文档数"""
+        term_id = self._vocabulary.get(word)
+        return self._df[term_id] if term_id is not None else 0
+
+    def term_frequency(self, word: str) -> int:
+        """该词在全语料中的出现次数"""
+        term_id = self._vocabulary.get(word)
+        return self._term_totals[term_id] if term_id is not None else 0
+
+    def get_document_terms(self, doc_id: Hashable) -> Dict[str, int]:
+        """文档的词频 {词: 频率}"""
+        with self._lock:
+            row = self._row(doc_id)
+            start, end = self._indptr[row], self._indptr[row + 1]
+            terms = self._terms
+            return {terms[term_id]: count
+                    for term_id, count in zip(self._indices[start:end], self._counts[start:end])}
+
+    def top_tfidf(self, doc_id: Hashable, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        文档中TF-IDF最高的k个词
+
+        Returns:
+            [(词, TF-IDF), ...]，按TF-IDF降序
+        """
+        with self._lock:
+            row = self._row(doc_id)
+            start, end = self._indptr[row], self._indptr[row + 1]
+            length = self._doc_lengths[row]
+            if not length:
+                return []
+            scores = ((count / length * self._idf(term_id), term_id)
+                      for term_id, count in zip(self._indices[start:end], self._counts[start:end]))
+            terms = self._terms
+            return [(terms[term_id], score) for score, term_id in heapq.nlargest(k, scores)]
+
+    def top_terms(self, k: int = 10, by: str = 'count') -> List[Tuple[str, int]]:
+        """
+        全语料的高频词
+
+        Args:
+            k: 返回的词数
+            by: 'count' 按全语料出现次数，'df' 按文档频率
+
+        Returns:
+            [(词, 次数), ...]，按次数降序
+        """
+        if by == 'count':
+            values = self._term_totals
+        elif by == 'df':
+            values = self._df
+        else:
+            raise ValueError(f"未知的排序依据: {by}")
+        with self._lock:
+            terms = self._terms
+            top = heapq.nlargest(k, range(len(terms)), key=values.__getitem__)
+            return [(terms[term_id], values[term_id]) for term_id in top]
+
+    def _row(self, doc_id: Hashable) -> int:
+        row = self._rows.get(doc_id)
+        if row is None:
+            raise KeyError(f"文档不存在: {doc_id}")
+        return row
+
+    def to_scipy(self):
+        """导出为 scipy.sparse.csr_matrix（文档 × 词，值为出现次数），需要安装scipy"""
+        if not SCIPY_AVAILABLE:
+            raise ImportError("导出稀疏矩阵需要安装scipy")
+        with self._lock:
+            return scipy_sparse.csr_matrix(
+                (self._counts.tolist(), self._indices.tolist(), self._indptr.tolist()),
+                shape=(self.num_documents, self.vocabulary_size))
+
+    @property
+    def vocabulary(self) -> List[str]:
+        """按编号排列的词表（与 to_scipy() 的列对应）"""
+        return list(self._terms)
+
+    @property
+    def doc_ids(self) -> List[Hashable]:
+        """按行号排列的文档ID（与 to_scipy() 的行对应）"""
+        return list(self._doc_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """CSR数组占用的内存（不含词表字符串）"""
+        return sum(values.itemsize * len(values) for values in
+                   (self._indptr, self._indices, self._counts, self._doc_lengths,
+                    self._df, self._term_totals))
+
+    def get_stats(self) -> Dict:
+        """索引规模统计"""
+        with self._lock:
+            return {
+                'documents': self.num_documents,
+                'vocabulary_size': self.vocabulary_size,
+                'nonzeros': len(self._indices),
+                'total_terms': sum(self._doc_lengths),
+                'array_bytes': self.nbytes
+            }
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+高频词近似统计模块
+Space-Saving 算法：只保留固定数量的计数器，在无限长的词流上估计出现最多的词
+"""
+
+import heapq
+import math
+from operator import itemgetter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# 默认计数器数量
+DEFAULT_CAPACITY = 10000
+
+
+class SpaceSaving:
+    """
+    Space-Saving 高频词统计（Metwally 等，2005）
+
+    最多保留 capacity 个 (词, 计数, 误差)。新词到来且计数器已满时，替换计数最小的词，
+    新词的计数从被替换词的计数开始（误差记为该计数）。保证：
+      - 每个词的估计计数不低于真实计数，高估不超过 总词数 / capacity；
+      - 真实计数超过 总词数 / capacity 的词一定在保留的词中。
+    相对误差 max_error 对应 capacity = ceil(1 / max_error)。
+
+    计数最小的词用带延迟删除的最小堆查找：计数增加时不更新堆，
+    淘汰时发现堆顶计数过期再重新入堆。
+    """
+
+    def __init__(self, capacity: Optional[int] = None, max_error: Optional[float] = None):
+        """
+        Args:
+            capacity: 最多保留的词数（内存上限）
+            max_error: 允许的最大高估比例（相对总词数），与capacity同时指定时取较大的容量
+        """
+        if max_error is not None:
+            if not 0 < max_error < 1:
+                raise ValueError("max_error 应在 (0, 1) 之间")
+            capacity = max(capacity or 0, math.ceil(1 / max_error))
+        capacity = capacity or DEFAULT_CAPACITY
+        if capacity < 1:
+            raise ValueError("capacity 应为正整数")
+
+        self.capacity = capacity
+        self.total = 0        # 已处理的总词数（含权重）
+        self._counts = {}     # {词: 估计计数}
+        self._errors = {}     # {词: 最大高估量}
+        self._heap = []       # [(计数, 词)]，可能含过期项
+
+    def update(self, word: str, count: int = 1) -> None:
+        """记录词出现count次"""
+        self.total += count
+        counts = self._counts
+        if word in counts:
+            counts[word] += count
+            return
+        if len(counts) < self.capacity:
+            counts[word] = count
+            self._errors[word] = 0
+            heapq.heappush(self._heap, (count, word))
+            return
+
+        minimum, evicted = self._pop_min()
+        del counts[evicted], self._errors[evicted]
+        counts[word] = minimum + count
+        self._errors[word] = minimum
+        heapq.heappush(self._heap, (minimum + count, word))
+
+    def update_many(self, words: Iterable[str]) -> None:
+        """逐个记录词流"""
+        update = self.update
+        for word in words:
+            update(word)
+
+    def update_counts(self, counts: Mapping[str, int]) -> None:
+        """按 {词: 次数} 批量记录（如一批文本的Counter）"""
+        update = self.update
+        for word, count in counts.items():
+            update(word, count)
+
+    def _pop_min(self) -> Tuple[int, str]:
+        """弹出计数最小的词，跳过并刷新过期的堆项"""
+        heap, counts = self._heap, self._counts
+        if len(heap) > 2 * self.capacity:
+            # 过期项太多时按当前计数重建堆
+            heap[:] = [(count, word) for word, count in counts.items()]
+            heapq.heapify(heap)
+        while True:
+            count, word = heap[0]
+            current = counts.get(word)
+            if current == count:
+                return heapq.heappop(heap)
+            if current is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (current, word))
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """估计计数最高的n个词 [(词, 估计计数), ...]"""
+        return heapq.nlargest(n, self._counts.items(), key=itemgetter(1))
+
+    def entries(self, n: int = 10) -> List[Dict]:
+        """估计计数最高的n个词及其误差，guaranteed 表示真实计数确定不低于排在其后的词"""
+        top = self.top(n + 1)
+        following = top[n][1] if len(top) > n else 0
+        return [{
+            'word': word,
+            'count': count,
+            'error': self._errors[word],
+            'guaranteed': count - self._errors[word] >= following
+        } for word, count in top[:n]]
+
+    @property
+    def error_bound(self) -> float:
+        """任意词估计计数的最大高估量"""
+        return self.total / self.capacity
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._counts
+
+    def get_stats(self) -> Dict:
+        """计数器使用情况和误差上界"""
+        return {
+            'capacity': self.capacity,
+            'monitored': len(self._counts),
+            'total': self.total,
+            'error_bound': round(self.error_bound, 4)
+        }
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+延迟导入模块
+只用模块规格检查库是否安装，真正的导入推迟到第一次使用
+"""
+
+import importlib
+import importlib.util
+import threading
+
+
+def is_module_available(name: str) -> bool:
+    """检查模块是否已安装（不会导入模块本身）"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """
+    延迟导入的模块代理
+
+    第一次访问属性时才执行import，之后直接转发到真实模块。
+    导入失败时异常会在访问处抛出，由调用方按原有的降级逻辑处理。
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def is_imported(self) -> bool:
+        """是否已经真正导入"""
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = '已导入' if self._module is not None else '未导入'
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """创建延迟导入的模块代理"""
+    return LazyModule(name)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+最大匹配分词模块
+没有安装任何分词库时使用的内置分词器：基于前缀词典的双向最大匹配，
+标点和空白在同一遍正则扫描中跳过
+"""
+
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# 内置词典路径
+DEFAULT_DICT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'basic_dict.txt')
+
+# 汉字范围（CJK统一汉字、扩展A、兼容汉字）
+_HAN = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+
+# 一遍扫描切出汉字串和其他文字串（字母、数字），标点和空白不匹配，直接跳过
+TOKEN_PATTERN = re.compile(f'([{_HAN}]+)|[^\\W{_HAN}]+')
+
+
+class MaxMatchSegmenter:
+    """
+    双向最大匹配分词器
+
+    词典保存为前缀词典（与jieba的FREQ相同的思路）：词的每个前缀都是键，
+    值表示该前缀本身是否为词。匹配时从当前位置逐字延长，前缀不存在即停止，
+    每个位置只需一次扫描，不必从最大词长开始逐个截断尝试。
+    反向匹配使用词倒序后的前缀词典。
+
+    正向、反向结果不同时：词数少的优先，词数相同时单字少的优先，仍相同时取反向结果。
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._forward = {}   # {前缀: 是否为词}
+        self._backward = {}  # {倒序前缀: 是否为词}
+        self.word_count = 0
+        for word in words:
+            self.add_word(word)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_DICT_PATH, encoding: str = 'utf-8') -> 'MaxMatchSegmenter':
+        """从词典文件加载（每行一个词，可带词频等其他列，#开头为注释）"""
+        with open(path, 'r', encoding=encoding) as f:
+            words = [line.split()[0] for line in f if line.strip() and not line.startswith('#')]
+        return cls(words)
+
+    @staticmethod
+    def _insert(prefixes: Dict[str, bool], word: str) -> bool:
+        for i in range(1, len(word)):
+            prefixes.setdefault(word[:i], False)
+        added = not prefixes.get(word, False)
+        prefixes[word] = True
+        return added
+
+    def add_word(self, word: str) -> None:
+        """添加词"""
+        word = word.strip()
+        if word and self._insert(self._forward, word):
+            self._insert(self._backward, word[::-1])
+            self.word_count += 1
+
+    def remove_word(self, word: str) -> None:
+        """删除词（保留前缀，不影响其他词）"""
+        if self._forward.get(word):
+            self._forward[word] = False
+            self._backward[word[::-1]] = False
+            self.word_count -= 1
+
+    def __contains__(self, word: str) -> bool:
+        return self._forward.get(word, False)
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    @staticmethod
+    def _match(text: str, prefixes: Dict[str, bool]) -> List[int]:
+        """最大匹配，返回每个词的结束位置；未匹配的字按单字切分"""
+        ends = []
+        length = len(text)
+        i = 0
+        while i < length:
+            end = i + 1
+            j = i + 1
+            while j <= length:
+                is_word = prefixes.get(text[i:j])
+                if is_word is None:
+                    break
+                if is_word:
+                    end = j
+                j += 1
+            ends.append(end)
+            i = end
+        return ends
+
+    def _segment_run(self, run: str) -> List[Tuple[int, int]]:
+        """对一个汉字串做双向最大匹配，返回 [(起始, 结束), ...]"""
+        forward_ends = self._match(run, self._forward)
+        forward = list(zip([0] + forward_ends[:-1], forward_ends))
+        length = len(run)
+        backward_ends = self._match(run[::-1], self._backward)
+        backward = [(length - end, length - start)
+                    for start, end in zip([0] + backward_ends[:-1], backward_ends)][::-1]
+
+        if forward == backward or len(backward) < len(forward):
+            return backward
+        if len(forward) < len(backward):
+            return forward
+        singles_forward = sum(1 for start, end in forward if end - start == 1)
+        singles_backward = sum(1 for start, end in backward if end - start == 1)
+        return forward if singles_forward < singles_backward else backward
+
+    def tokenize(self, text: str) -> Iterator[Tuple[str, int]]:
+        """分词，产出 (词, 起始偏移)；标点和空白被跳过"""
+        for match in TOKEN_PATTERN.finditer(text):
+            if match.lastindex == 1:
+                run, base = match.group(), match.start()
+                if len(run) == 1:
+                    yield run, base
+                    continue
+                for start, end in self._segment_run(run):
+                    yield run[start:end], base + start
+            else:
+                yield match.group(), match.start()
+
+    def cut(self, text: str) -> List[str]:
+        """分词，返回词列表"""
+        return [word for word, _ in self.tokenize(text)]
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+模型文件解析模块
+从本地缓存目录查找模型文件，检查是否完整，加载时不访问网络；
+缺少文件时明确报告缺少哪些文件，而不是在加载时等待网络超时
+"""
+
+import os
+from typing import Dict, List, Optional
+
+try:
+    from .lazy_imports import is_module_available
+except ImportError:
+    from lazy_imports import is_module_available
+
+
+# 每个后端需要的模型文件
+# kind: 'huggingface'（transformers模型）、'stanza'（Stanza资源）、
+#       'pkuseg'（pkuseg领域模型）、'spacy'（spaCy模型包）
+MODEL_ARTIFACTS = {
+    'uer_roberta_dianping': {'kind': 'huggingface', 'id': 'uer/roberta-base-finetuned-dianping-chinese'},
+    'erlangshen_roberta_110m': {'kind': 'huggingface', 'id': 'IDEA-CCNL/Erlangshen-Roberta-110M-Sentiment'},
+    'erlangshen_roberta_330m': {'kind': 'huggingface', 'id': 'IDEA-CCNL/Erlangshen-Roberta-330M-Sentiment'},
+    'bert_base_chinese': {'kind': 'huggingface', 'id': 'bert-base-chinese'},
+    'stanza_zh': {'kind': 'stanza', 'id': 'zh-hans'},
+    'stanza_en': {'kind': 'stanza', 'id': 'en'},
+    'spacy_zh': {'kind': 'spacy', 'id': 'zh_core_web_sm'},
+    'spacy_en': {'kind': 'spacy', 'id': 'en_core_web_sm'},
+    'pkuseg_news': {'kind': 'pkuseg', 'id': 'news'},
+    'pkuseg_web': {'kind': 'pkuseg', 'id': 'web'},
+    'pkuseg_medicine': {'kind': 'pkuseg', 'id': 'medicine'},
+    'pkuseg_tourism': {'kind': 'pkuseg', 'id': 'tourism'},
+    'pkuseg_pos_default': {'kind': 'pkuseg', 'id': 'postag'},
+}
+
+# 带词性标注的领域分词器需要领域模型和词性标注模型
+for _domain in ['news', 'web', 'medicine', 'tourism']:
+    MODEL_ARTIFACTS[f'pkuseg_pos_{_domain}'] = {'kind': 'pkuseg', 'id': _domain, 'extra': ['postag']}
+
+# transformers模型目录中必须存在的文件（每组满足其一即可）
+HF_REQUIRED_FILES = [
+    ['config.json'],
+    ['pytorch_model.bin', 'model.safetensors'],
+    ['vocab.txt', 'tokenizer.json', 'sentencepiece.bpe.model', 'spiece.model'],
+]
+
+# Stanza流水线使用的处理器
+STANZA_PROCESSORS = ['tokenize', 'pos', 'lemma', 'depparse']
+
+
+class ModelArtifactMissing(RuntimeError):
+    """本地缓存中缺少模型文件"""
+
+    def __init__(self, name: str, missing: List[str], searched: List[str]):
+        self.name = name
+        self.missing = missing
+        self.searched = searched
+        super().__init__(
+            f"{name} 的模型文件不完整，缺少: {', '.join(missing)}"
+            f"（查找位置: {', '.join(searched) or '无'}）"
+        )
+
+
+def _default_hf_cache() -> str:
+    """huggingface模型缓存目录（与huggingface_hub的环境变量约定一致）"""
+    if os.environ.get('HF_HUB_CACHE'):
+        return os.environ['HF_HUB_CACHE']
+    hf_home = os.environ.get('HF_HOME') or os.path.join(os.path.expanduser('~'), '.cache', 'huggingface')
+    return os.path.join(hf_home, 'hub')
+
+
+class ModelResolver:
+    """
+    模型文件解析器
+
+    查找顺序：
+        1. NLP_MODEL_CACHE_DIR 下的 <组织>/<模型名> 目录（save_pretrained 或 git clone 得到的目录）
+        2. huggingface缓存（HF_HUB_CACHE / HF_HOME）中的 models--<组织>--<模型名>/snapshots/<版本>
+
+    只做文件系统检查，不发起任何网络请求，也不修改全局socket设置。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 hf_cache_dir: Optional[str] = None,
+                 stanza_dir: Optional[str] = None,
+                 pkuseg_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: 本地模型目录，默认读取环境变量 NLP_MODEL_CACHE_DIR
+            hf_cache_dir: huggingface缓存目录，默认 HF_HUB_CACHE 或 HF_HOME/hub
+            stanza_dir: Stanza资源目录，默认 STANZA_RESOURCES_DIR 或 ~/stanza_resources
+            pkuseg_dir: pkuseg模型目录，默认 PKUSEG_HOME 或 ~/.pkuseg
+        """
+        self.cache_dir = cache_dir or os.environ.get('NLP_MODEL_CACHE_DIR')
+        self.hf_cache_dir = hf_cache_dir or _default_hf_cache()
+        self.stanza_dir = stanza_dir or os.environ.get('STANZA_RESOURCES_DIR') or \
+            os.path.join(os.path.expanduser('~'), 'stanza_resources')
+        self.pkuseg_dir = pkuseg_dir or os.environ.get('PKUSEG_HOME') or \
+            os.path.join(os.path.expanduser('~'), '.pkuseg')
+
+    def check(self, name: str) -> Dict:
+        """
+        检查某个后端的模型文件
+
+        Returns:
+            {'available': bool, 'path': 模型路径或None, 'missing': [缺少的文件], 'searched': [查找位置]}
+            不需要额外模型文件的后端（jieba、thulac等随包提供）总是可用
+        """
+        artifact = MODEL_ARTIFACTS.get(name)
+        if artifact is None:
+            return {'available': True, 'path': None, 'missing': [], 'searched': []}
+
+        kind = artifact['kind']
+        if kind == 'huggingface':
+            result = self._check_huggingface(artifact['id'])
+        elif kind == 'stanza':
+            result = self._check_stanza(artifact['id'])
+        elif kind == 'spacy':
+            result = self._check_spacy(artifact['id'])
+        else:
+            result = self._check_pkuseg(artifact['id'], artifact.get('extra', []))
+
+        result['available'] = not result['missing']
+        return result
+
+    def require(self, name: str) -> Optional[str]:
+        """返回模型路径，文件不完整时抛出 ModelArtifactMissing"""
+        result = self.check(name)
+        if not result['available']:
+            raise ModelArtifactMissing(name, result['missing'], result['searched'])
+        return result['path']
+
+    def report(self, names: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """批量检查模型文件，默认检查所有已知后端"""
+        return {name: self.check(name) for name in (MODEL_ARTIFACTS if names is None else names)}
+
+    def _hf_candidates(self, model_id: str) -> List[str]:
+        """某个transformers模型可能所在的目录"""
+        candidates = []
+        if self.cache_dir:
+            candidates.append(os.path.join(self.cache_dir, *model_id.split('/')))
+
+        repo_dir = os.path.join(self.hf_cache_dir, 'models--' + model_id.replace('/', '--'))
+        ref_file = os.path.join(repo_dir, 'refs', 'main')
+        snapshots = os.path.join(repo_dir, 'snapshots')
+        if os.path.isfile(ref_file):
+            with open(ref_file, 'r', encoding='utf-8') as f:
+                candidates.append(os.path.join(snapshots, f.read().strip()))
+        elif os.path.isdir(snapshots):
+            candidates.extend(os.path.join(snapshots, rev) for rev in sorted(os.listdir(snapshots)))
+        else:
+            candidates.append(snapshots)
+        return candidates
+
+    def _check_huggingface(self, model_id: str) -> Dict:
+        candidates = self._hf_candidates(model_id)
+        best = None
+        for path in candidates:
+            missing = [' / '.join(group) for group in HF_REQUIRED_FILES
+                       if not any(os.path.isfile(os.path.join(path, file)) for file in group)]
+            if not missing:
+                return {'path': path, 'missing': [], 'searched': candidates}
+            if best is None or len(missing) < len(best[1]):
+                best = (path, missing)
+        return {'path': None, 'missing': best[1], 'searched': candidates}
+
+    def _check_stanza(self, lang: str) -> Dict:
+        lang_dir = os.path.join(self.stanza_dir, lang)
+        missing = []
+        if not os.path.isfile(os.path.join(self.stanza_dir, 'resources.json')):
+            missing.append('resources.json')
+        missing.extend(f'{lang}/{processor}' for processor in STANZA_PROCESSORS
+                       if not os.path.isdir(os.path.join(lang_dir, processor)))
+        return {'path': self.stanza_dir, 'missing': missing, 'searched': [self.stanza_dir]}
+
+    def _check_spacy(self, package: str) -> Dict:
+        missing = [] if is_module_available(package) else [f'spaCy模型包 {package}']
+        return {'path': package, 'missing': missing, 'searched': ['site-packages']}
+
+    def _check_pkuseg(self, model: str, extra: List[str]) -> Dict:
+        missing = [name for name in [model] + list(extra)
+                   if not os.path.isdir(os.path.join(self.pkuseg_dir, name))]
+        return {'path': os.path.join(self.pkuseg_dir, model), 'missing': missing,
+                'searched': [self.pkuseg_dir]}
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+段落级增量分析模块
+文档按空行分段，每段以内容哈希标识，分析结果按段落缓存；
+编辑后只重新分析内容变化的段落，再与未变化段落的结果合并
+"""
+
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+# 默认最多缓存的段落结果数
+DEFAULT_MAX_PARAGRAPHS = 20000
+
+# 最多保留的计数汇总数（每种分析参数组合一个）
+MAX_AGGREGATES = 8
+
+
+def split_paragraphs(text: str) -> List[Tuple[int, str]]:
+    """按空行（'\\n\\n'）分段，返回 [(段落起始偏移, 段落文本), ...]，跳过空白段落"""
+    paragraphs = []
+    offset = 0
+    for paragraph in text.split('\n\n'):
+        if paragraph.strip():
+            paragraphs.append((offset, paragraph))
+        offset += len(paragraph) + 2
+    return paragraphs
+
+
+def paragraph_key(paragraph: str) -> bytes:
+    """段落的内容哈希"""
+    return hashlib.blake2b(paragraph.encode('utf-8'), digest_size=16).digest()
+
+
+class ParagraphCache:
+    """
+    段落级分析结果缓存
+
+    get() 按 (分析名, 参数, 段落哈希) 缓存单个段落的结果（LRU）。
+    count() 用于可以按段落相加的计数类分析（如词频）：记住上次参与汇总的段落，
+    新文本只对删除的段落减去计数、对新增的段落加上计数。
+
+    结果只由段落内容和参数决定，编辑文本不需要主动失效；
+    分词词典等影响所有结果的设置变化时调用 clear()。
+    """
+
+    def __init__(self, max_paragraphs: int = DEFAULT_MAX_PARAGRAPHS):
+        self.max_paragraphs = max_paragraphs
+        self._results = OrderedDict()     # {(分析名, 参数, 段落哈希): 结果}，按最近使用排序
+        self._aggregates = OrderedDict()  # {(分析名, 参数): {'paragraphs': {哈希: (出现次数, 计数)}, 'total': 计数}}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+
+    def get(self, name: str, params: Hashable, paragraph: str,
+            compute: Callable[[str], Any], key: bytes = None) -> Any:
+        """获取段落的分析结果，未缓存时调用compute计算（调用方不应修改返回的结果）"""
+        cache_key = (name, params, key or paragraph_key(paragraph))
+        with self._lock:
+            if cache_key in self._results:
+                self._results.move_to_end(cache_key)
+                self._hits += 1
+                return self._results[cache_key]
+            self._misses += 1
+
+        result = compute(paragraph)
+
+        with self._lock:
+            self._results[cache_key] = result
+            while len(self._results) > self.max_paragraphs:
+                self._results.popitem(last=False)
+        return result
+
+    def count(self, name: str, params: Hashable, paragraphs: List[str],
+              compute: Callable[[List[str]], List[Counter]]) -> Counter:
+        """
+        所有段落的计数之和
+
+        与上次同一 (分析名, 参数) 的段落比较：删除的段落减去其计数，
+        新增的段落（优先使用段落缓存）加上其计数，未变化的段落不重新计算。
+
+        compute在锁外调用：先在锁内找出需要计算的段落，计算完成后再在锁内合并，
+        计算期间其他线程的查询和汇总不会被阻塞。
+
+        Args:
+            compute: 批量计算函数，传入所有未缓存的段落，按顺序返回各段落的计数
+                    （一次调用处理多个段落，便于合并分词）
+
+        Returns:
+            汇总计数的副本（只含正数）
+        """
+        keys = Counter()
+        texts = {}
+        for paragraph in paragraphs:
+            key = paragraph_key(paragraph)
+            keys[key] += 1
+            texts[key] = paragraph
+
+        computed = {}
+        while True:
+            with self._lock:
+                aggregate = self._aggregates.get((name, params))
+                contributions = aggregate['paragraphs'] if aggregate else {}
+                missing = [key for key in keys
+                           if key not in contributions and key not in computed
+                           and (name, params, key) not in self._results]
+                if not missing:
+                    return Counter(self._merge(name, params, keys, computed))
+                self._misses += len(missing)
+
+            # 计算期间其他线程可能改变了汇总或淘汰了段落结果，合并前会重新检查
+            for key, counts in zip(missing, compute([texts[key] for key in missing])):
+                computed[key] = counts
+
+    def _merge(self, name: str, params: Hashable, keys: Counter,
+               computed: Dict[bytes, Counter]) -> Counter:
+        """把段落计数合并进汇总（调用方持有锁，所有新增段落的计数都已在缓存或computed中）"""
+        aggregate = self._aggregates.pop((name, params), None)
+        if aggregate is None:
+            aggregate = {'paragraphs': {}, 'total': Counter()}
+        self._aggregates[(name, params)] = aggregate
+        while len(self._aggregates) > MAX_AGGREGATES:
+            self._aggregates.popitem(last=False)
+
+        contributions = aggregate['paragraphs']
+        total = aggregate['total']
+
+        # 删除或出现次数变化的段落：先整体减去（出现次数变化的段落稍后按新次数加回）
+        removed = {}
+        for key in list(contributions):
+            times, counts = contributions[key]
+            if keys.get(key) == times:
+                continue
+            for word, value in counts.items():
+                remaining = total[word] - value * times
+                if remaining > 0:
+                    total[word] = remaining
+                else:
+                    del total[word]
+            removed[key] = counts
+            del contributions[key]
+
+        # 新增或出现次数变化的段落：刚计算的或刚减去的直接使用，其余取段落缓存
+        for key, times in keys.items():
+            if key in contributions:
+                continue
+            counts = computed.get(key, removed.get(key))
+            if counts is None:
+                cache_key = (name, params, key)
+                self._results.move_to_end(cache_key)
+                self._hits += 1
+                counts = self._results[cache_key]
+            for word, value in counts.items():
+                total[word] += value * times
+            contributions[key] = (times, counts)
+
+        for key, counts in computed.items():
+            self._results[(name, params, key)] = counts
+        while len(self._results) > self.max_paragraphs:
+            self._results.popitem(last=False)
+        return total
+
+    def clear(self) -> None:
+        """清空所有段落结果和汇总"""
+        with self._lock:
+            self._results.clear()
+            self._aggregates.clear()
+
+    def get_stats(self) -> Dict:
+        """获取段落缓存命中统计"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'paragraphs': len(self._results),
+                'max_paragraphs': self.max_paragraphs,
+                'aggregates': len(self._aggregates),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+部署配置模块
+用命名配置（lite / standard / full）声明TextProcessor允许加载哪些后端，
+而不是只要库能导入就使用
+"""
+
+import fnmatch
+import json
+import os
+from typing import Dict, List, Optional
+
+# 内置部署配置
+# warmup 为启动时预热的后端：分析流程默认会用到的后端，而不是所有允许的后端
+BUILTIN_PROFILES = {
+    'lite': {
+        'description': '精简部署：jieba分词 + 词典情感分析，启动快、内存最小',
+        'backends': ['jieba'],
+        'warmup': ['jieba']
+    },
+    'standard': {
+        'description': '标准部署：jieba/pkuseg默认模型分词，SnowNLP/VADER/TextBlob情感分析，Qwen3服务',
+        'backends': ['jieba', 'pkuseg_default', 'pkuseg_pos_default',
+                     'snownlp', 'vader', 'textblob', 'qwen3'],
+        'warmup': ['jieba', 'pkuseg_default', 'snownlp', 'vader', 'textblob']
+    },
+    'full': {
+        'description': '完整部署：所有已安装的后端（spaCy、Stanza、transformers、全部分词模型）',
+        'backends': ['*'],
+        'warmup': ['jieba', 'pkuseg_default', 'snownlp', 'vader', 'textblob',
+                   'spacy_zh', 'uer_roberta_dianping']
+    }
+}
+
+DEFAULT_PROFILE = 'full'
+
+# 默认配置文件路径（项目根目录）
+DEFAULT_PROFILE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'deploy_profiles.json')
+
+
+class DeploymentProfile:
+    """部署配置：决定哪些后端可以被注册和加载"""
+
+    def __init__(self, name: str, backends: List[str], description: str = '',
+                 warmup: Optional[List[str]] = None):
+        """
+        Args:
+            name: 配置名称
+            backends: 允许的后端（支持通配符）
+            description: 配置描述
+            warmup: 启动时预热的后端，None表示 backends 中不含通配符的后端
+        """
+        self.name = name
+        self.backends = list(backends)
+        self.description = description
+        if warmup is None:
+            warmup = [pattern for pattern in self.backends if not any(c in pattern for c in '*?[')]
+        self.warmup = list(warmup)
+
+    def allows(self, backend_name: str) -> bool:
+        """是否允许该后端（支持 'pkuseg_*' 这样的通配符）"""
+        return any(fnmatch.fnmatchcase(backend_name, pattern) for pattern in self.backends)
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'description': self.description,
+            'backends': list(self.backends),
+            'warmup': list(self.warmup)
+        }
+
+    def __repr__(self) -> str:
+        return f"DeploymentProfile({self.name!r}, backends={self.backends})"
+
+
+def load_profiles(path: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    加载部署配置：内置配置 + 配置文件中的自定义配置
+
+    配置文件格式（JSON）:
+        {
+            "default": "standard",
+            "profiles": {
+                "news": {"description": "...", "backends": ["jieba", "pkuseg_news"],
+                         "warmup": ["jieba"]}   # warmup可省略，默认为backends中的具体后端
+            }
+        }
+    """
+    profiles = {name: dict(config) for name, config in BUILTIN_PROFILES.items()}
+    path = path or os.environ.get('NLP_PROFILE_FILE') or DEFAULT_PROFILE_FILE
+
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for name, config in data.get('profiles', {}).items():
+            if 'backends' not in config:
+                raise ValueError(f"部署配置 {name} 缺少 backends 字段")
+            profiles[name] = config
+        if data.get('default'):
+            profiles['__default__'] = {'alias': data['default']}
+
+    return profiles
+
+
+def resolve_profile(name: Optional[str] = None, path: Optional[str] = None) -> DeploymentProfile:
+    """
+    解析部署配置
+
+    优先级：参数name > 环境变量NLP_PROFILE > 配置文件中的default > 内置默认（full）
+    """
+    profiles = load_profiles(path)
+    default_name = profiles.pop('__default__', {}).get('alias', DEFAULT_PROFILE)
+    name = name or os.environ.get('NLP_PROFILE') or default_name
+
+    if name not in profiles:
+        raise ValueError(f"未知的部署配置: {name}，可选: {', '.join(sorted(profiles))}")
+
+    config = profiles[name]
+    return DeploymentProfile(name, config['backends'], config.get('description', ''),
+                             config.get('warmup'))
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Qwen3服务健康监测模块
+后台定期探测大模型接口，并用熔断器（关闭/打开/半开）决定请求是否放行
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    - closed（关闭）: 正常放行请求，连续失败达到阈值后打开
+    - open（打开）: 直接拒绝请求，等待恢复时间后进入半开
+    - half_open（半开）: 只放行一个试探请求，成功则关闭，失败则重新打开
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """当前状态（打开状态超过恢复时间时自动转为半开）"""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def _refresh_state(self) -> None:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+    def can_attempt(self) -> bool:
+        """只读检查：现在发出请求是否会被放行（不占用半开状态的试探名额）"""
+        with self._lock:
+            self._refresh_state()
+            return self._state == self.CLOSED or (self._state == self.HALF_OPEN and not self._trial_in_flight)
+
+    def allow_request(self) -> bool:
+        """是否放行请求（半开状态下占用唯一的试探名额，调用方必须随后记录成功或失败）"""
+        with self._lock:
+            self._refresh_state()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """记录一次成功，熔断器关闭"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """记录一次失败，达到阈值或半开试探失败时打开熔断器"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def get_status(self) -> Dict:
+        """获取熔断器状态"""
+        with self._lock:
+            self._refresh_state()
+            status = {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'recovery_timeout': self.recovery_timeout
+            }
+            if self._state == self.OPEN:
+                status['retry_in'] = round(max(self.recovery_timeout - (self._clock() - self._opened_at), 0.0), 2)
+            return status
+
+
+class Qwen3HealthMonitor:
+    """
+    Qwen3服务健康监测器
+
+    后台线程定期探测接口并更新熔断器；请求路径只查询熔断器状态，
+    不会再为服务不可用而阻塞等待请求超时。
+    """
+
+    def __init__(self, api_url: str, model: str,
+                 interval: float = 30.0, probe_timeout: float = 3.0,
+                 breaker: Optional[CircuitBreaker] = None,
+                 probe: Optional[Callable[[], bool]] = None):
+        """
+        Args:
+            api_url: 对话接口地址（如 http://localhost:6006/api/chat）
+            model: 模型名称
+            interval: 后台探测间隔（秒）
+            probe_timeout: 单次探测超时（秒）
+            breaker: 熔断器，默认连续失败1次即打开
+            probe: 自定义探测函数，返回是否健康
+        """
+        self.api_url = api_url
+        self.model = model
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self.breaker = breaker or CircuitBreaker(failure_threshold=1, recovery_timeout=interval)
+        self._probe = probe or self._default_probe
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._first_check = threading.Event()
+        self._lock = threading.Lock()
+        self.last_check_time = None
+        self.last_latency = None
+        self.last_error = None
+
+    def _default_probe(self) -> bool:
+        """探测Ollama的模型列表接口（不会触发模型推理）"""
+        import requests
+
+        tags_url = self.api_url.rsplit('/api/', 1)[0] + '/api/tags'
+        response = requests.get(tags_url, timeout=self.probe_timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"状态码: {response.status_code}")
+        return True
+
+    def check_now(self) -> bool:
+        """立即执行一次探测并更新熔断器"""
+        start_time = time.perf_counter()
+        try:
+            healthy = bool(self._probe())
+            error = None if healthy else '探测失败'
+        except Exception as e:
+            healthy = False
+            error = str(e)
+
+        self.last_latency = round(time.perf_counter() - start_time, 4)
+        self.last_check_time = time.time()
+        self.last_error = error
+
+        if healthy:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        self._first_check.set()
+        return healthy
+
+    def start(self) -> None:
+        """启动后台探测线程（重复调用无副作用）"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='qwen3-health', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """停止后台探测线程"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.probe_timeout + 1)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.check_now()
+            self._stop_event.wait(self.interval)
+
+    def is_available(self) -> bool:
+        """
+        只读检查：熔断器现在是否会放行请求（可重复调用，不占用半开状态的试探名额）
+
+        第一次调用时启动后台探测但不等待结果：首次探测完成前状态未知，视为不可用（调用方降级）。
+        """
+        self.start()
+        if not self._first_check.is_set():
+            return False
+        return self.breaker.can_attempt()
+
+    def wait_first_check(self, timeout: Optional[float] = None) -> bool:
+        """启动后台探测并等待首次探测完成（供预热使用），返回是否在超时前完成"""
+        self.start()
+        return self._first_check.wait(self.probe_timeout + 0.5 if timeout is None else timeout)
+
+    def allow_request(self) -> bool:
+        """紧挨着实际请求调用一次：放行时返回True，之后必须调用 record_success / record_failure"""
+        return self.breaker.allow_request()
+
+    def record_success(self) -> None:
+        """记录一次成功的业务请求"""
+        self.breaker.record_success()
+
+    def record_failure(self) -> None:
+        """记录一次失败的业务请求"""
+        self.breaker.record_failure()
+
+    def get_status(self) -> Dict:
+        """获取健康状态"""
+        status = self.breaker.get_status()
+        status.update({
+            'api_url': self.api_url,
+            'model': self.model,
+            'monitoring': self._thread is not None and self._thread.is_alive(),
+            'last_check_time': self.last_check_time,
+            'last_latency': self.last_latency,
+            'last_error': self.last_error
+        })
+        return status
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+分词结果缓存模块
+按文本内容哈希缓存分词结果，同一请求中的词频统计、摘要、情感分析等功能共用一次分词
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+try:
+    from .segmented_doc import SegmentedDoc
+except ImportError:
+    from segmented_doc import SegmentedDoc
+
+# 默认缓存容量（MB）
+DEFAULT_SEGMENT_CACHE_MB = 64
+
+
+class SegmentCache:
+    """
+    分词结果缓存
+
+    键为 (文本哈希, 分词方法, 分词模式, 是否词性标注)，值为SegmentedDoc。
+    总大小超过容量时按最近最少使用（LRU）顺序淘汰。
+    缓存的SegmentedDoc由多个调用方共享，调用方不应修改其内容。
+    """
+
+    def __init__(self, max_mb: Optional[float] = None):
+        """
+        Args:
+            max_mb: 缓存容量（MB），0表示不缓存；
+                None表示读取环境变量 NLP_SEGMENT_CACHE_MB，未设置则为64MB
+        """
+        if max_mb is None:
+            max_mb = float(os.environ.get('NLP_SEGMENT_CACHE_MB', DEFAULT_SEGMENT_CACHE_MB))
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+        self._entries = OrderedDict()  # {键: (SegmentedDoc, 字节数)}，按最近使用排序
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, method: str, mode: str, with_pos: bool) -> Tuple:
+        """生成缓存键（文本只保存哈希，不保存原文）"""
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        return digest, method, mode, bool(with_pos)
+
+    def get(self, key: Tuple) -> Optional[SegmentedDoc]:
+        """查询缓存，命中时标记为最近使用"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple, doc: SegmentedDoc) -> None:
+        """写入缓存，超出容量时淘汰最久未用的结果"""
+        if self.max_bytes <= 0:
+            return
+        size = doc.nbytes
+        if size > self.max_bytes:
+            return  # 单个结果超过容量，不缓存
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (doc, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存（分词词典变化后需要调用）"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict:
+        """获取命中率和容量统计"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions
+            }
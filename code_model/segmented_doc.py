@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+分词结果模块
+用紧凑的数组结构保存分词结果，替代每个词一个字典的列表
+"""
+
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class SegmentedDoc(Sequence):
+    """
+    紧凑的分词结果
+
+    词保存为驻留（interned）字符串列表，重复的词共用同一个字符串对象；
+    词性保存为本文档词性表中的编号数组（array('H')），每个词只占2字节。
+    百万级词数时内存占用只有字典列表的一小部分。
+
+    可选地保存每个词在原文中的起始偏移（array('q')），结束偏移为起始偏移加词长。
+
+    兼容原来的 [{'word': '词', 'pos': '词性'}, ...] 用法：
+    下标访问和遍历返回字典（按需构造），to_list() 返回可直接JSON序列化的列表。
+    需要高吞吐时直接使用 words / pos_tags 或 iter_pairs()，不会构造字典。
+    """
+
+    __slots__ = ('_words', '_pos_ids', '_pos_table', '_starts')
+
+    def __init__(self, words: Optional[List[str]] = None,
+                 pos_ids: Optional[array] = None,
+                 pos_table: Optional[List[str]] = None,
+                 starts: Optional[array] = None):
+        self._words = words if words is not None else []
+        self._pos_ids = pos_ids          # None表示不含词性
+        self._pos_table = pos_table or []
+        self._starts = starts            # None表示不含偏移
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], pos: Optional[str] = None,
+                   text: Optional[str] = None) -> 'SegmentedDoc':
+        """
+        由词序列构造
+
+        Args:
+            words: 按原文顺序、互不重叠的词序列
+            pos: 所有词使用同一个词性（如 'UNK'），None表示不含词性
+            text: 原文，提供时在构造的同一遍扫描中记录每个词的偏移
+        """
+        intern = sys.intern
+        if text is None:
+            word_list = [intern(word) for word in words]
+            starts = None
+        else:
+            locate = _Locator(text)
+            word_list = []
+            starts = array('q')
+            for word in words:
+                starts.append(locate(word))
+                word_list.append(intern(word))
+
+        if pos is None:
+            return cls(word_list, starts=starts)
+        return cls(word_list, array('H', bytes(2 * len(word_list))), [pos], starts)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[str, str]], text: Optional[str] = None) -> 'SegmentedDoc':
+        """由按原文顺序、互不重叠的 (词, 词性) 序列构造，提供原文时同时记录偏移"""
+        intern = sys.intern
+        locate = _Locator(text) if text is not None else None
+        word_list = []
+        pos_ids = array('H')
+        starts = array('q') if locate else None
+        pos_index = {}
+        pos_table = []
+        for word, pos in pairs:
+            if locate:
+                starts.append(locate(word))
+            word_list.append(intern(word))
+            pos_id = pos_index.get(pos)
+            if pos_id is None:
+                pos_id = pos_index[pos] = len(pos_table)
+                pos_table.append(pos)
+            pos_ids.append(pos_id)
+        return cls(word_list, pos_ids, pos_table, starts)
+
+    @classmethod
+    def from_spans(cls, spans: Iterable[Tuple[str, int]], pos: Optional[str] = None) -> 'SegmentedDoc':
+        """由分词器直接给出的 (词, 起始偏移) 序列构造（如 jieba.tokenize、正则匹配）"""
+        intern = sys.intern
+        word_list = []
+        starts = array('q')
+        for word, start in spans:
+            word_list.append(intern(word))
+            starts.append(start)
+        if pos is None:
+            return cls(word_list, starts=starts)
+        return cls(word_list, array('H', bytes(2 * len(word_list))), [pos], starts)
+
+    @classmethod
+    def concat(cls, docs: Iterable['SegmentedDoc']) -> 'SegmentedDoc':
+        """
+        按顺序拼接多个文档（如并行分词的各个分片），合并各自的词性表
+
+        只有所有文档都含词性（偏移）时结果才含词性（偏移）；
+        偏移原样保留，拼接前应已通过 shifted() 转换为全文偏移
+        """
+        docs = list(docs)
+        intern = sys.intern
+        word_list = []
+        for doc in docs:
+            word_list.extend(intern(word) for word in doc._words)  # 跨进程传回的词需要重新驻留
+
+        pos_ids = None
+        pos_table = []
+        if docs and all(doc._pos_ids is not None for doc in docs):
+            pos_ids = array('H')
+            pos_index = {}
+            for doc in docs:
+                mapping = []
+                for pos in doc._pos_table:
+                    pos_id = pos_index.get(pos)
+                    if pos_id is None:
+                        pos_id = pos_index[pos] = len(pos_table)
+                        pos_table.append(pos)
+                    mapping.append(pos_id)
+                pos_ids.extend(mapping[pos_id] for pos_id in doc._pos_ids)
+
+        starts = None
+        if docs and all(doc._starts is not None for doc in docs):
+            starts = array('q')
+            for doc in docs:
+                starts.extend(doc._starts)
+
+        return cls(word_list, pos_ids, pos_table, starts)
+
+    @property
+    def has_pos(self) -> bool:
+        """是否包含词性标注"""
+        return self._pos_ids is not None
+
+    @property
+    def words(self) -> List[str]:
+        """词列表（不复制）"""
+        return self._words
+
+    @property
+    def pos_tags(self) -> Optional[List[str]]:
+        """词性列表，不含词性时返回None"""
+        if self._pos_ids is None:
+            return None
+        table = self._pos_table
+        return [table[pos_id] for pos_id in self._pos_ids]
+
+    @property
+    def has_offsets(self) -> bool:
+        """是否包含字符偏移"""
+        return self._starts is not None
+
+    @property
+    def starts(self) -> Optional[array]:
+        """每个词的起始偏移，不含偏移时返回None"""
+        return self._starts
+
+    def with_offsets(self, starts: array) -> 'SegmentedDoc':
+        """返回带偏移的新文档（与原文档共用词和词性数组）"""
+        if len(starts) != len(self._words):
+            raise ValueError("偏移数量与词数不一致")
+        return SegmentedDoc(self._words, self._pos_ids, self._pos_table, starts)
+
+    def shifted(self, base: int) -> 'SegmentedDoc':
+        """返回偏移整体加上base的新文档（用于把分块内偏移转换为全文偏移）"""
+        if self._starts is None or base == 0:
+            return self
+        return self.with_offsets(array('q', [start + base for start in self._starts]))
+
+    @property
+    def nbytes(self) -> int:
+        """估算占用的内存（词列表 + 不重复的词字符串 + 词性数组）"""
+        size = sys.getsizeof(self) + sys.getsizeof(self._words)
+        size += sum(sys.getsizeof(word) for word in set(self._words))
+        for values in (self._pos_ids, self._starts):
+            if values is not None:
+                size += values.itemsize * len(values)
+        return size
+
+    def iter_pairs(self) -> Iterator[Tuple[str, Optional[str]]]:
+        """遍历 (词, 词性)，不构造字典"""
+        if self._pos_ids is None:
+            return ((word, None) for word in self._words)
+        table = self._pos_table
+        return ((word, table[pos_id]) for word, pos_id in zip(self._words, self._pos_ids))
+
+    def _token(self, index: int) -> Dict:
+        word = self._words[index]
+        token = {'word': word}
+        if self._pos_ids is not None:
+            token['pos'] = self._pos_table[self._pos_ids[index]]
+        if self._starts is not None:
+            start = self._starts[index]
+            token['start'] = start
+            token['end'] = start + len(word)
+        return token
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            pos_ids = self._pos_ids[index] if self._pos_ids is not None else None
+            starts = self._starts[index] if self._starts is not None else None
+            return SegmentedDoc(self._words[index], pos_ids, self._pos_table, starts)
+        return self._token(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        if self._starts is not None:
+            return (self._token(index) for index in range(len(self._words)))
+        if self._pos_ids is None:
+            return ({'word': word} for word in self._words)
+        return ({'word': word, 'pos': pos} for word, pos in self.iter_pairs())
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def to_list(self) -> List[Dict[str, str]]:
+        """转换为 [{'word': ..., 'pos': ...}, ...]，用于JSON序列化"""
+        return list(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SegmentedDoc):
+            return (self._words == other._words and self.pos_tags == other.pos_tags
+                    and self._starts == other._starts)
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self._words, self._pos_ids, self._pos_table, self._starts
+
+    def __setstate__(self, state):
+        self._words, self._pos_ids, self._pos_table, self._starts = state
+
+    def __repr__(self) -> str:
+        preview = ' / '.join(self._words[:10])
+        more = ' ...' if len(self._words) > 10 else ''
+        return f"SegmentedDoc({len(self)} tokens: {preview}{more})"
+
+
+class _Locator:
+    """
+    分词时顺序记录偏移
+
+    分词器按原文顺序输出词，被丢弃的只有空白和标点，所以下一个词通常就从
+    当前位置开始，只在跳过被丢弃的字符时才向后查找，整体为线性时间。
+    """
+
+    __slots__ = ('_text', '_cursor')
+
+    def __init__(self, text: str):
+        self._text = text
+        self._cursor = 0
+
+    def __call__(self, word: str) -> int:
+        text, cursor = self._text, self._cursor
+        if text.startswith(word, cursor):
+            start = cursor
+        else:
+            start = text.find(word, cursor)
+            if start < 0:
+                start = cursor  # 分词器改写了文本（如全角转半角），记为当前位置
+        self._cursor = start + len(word)
+        return start
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+自动分词器选择模块
+在运行时测量每个分词器的吞吐量，method='auto' 时按文本长度和延迟预算
+选择能在预算内完成的最准确的分词器，并给出选择理由
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# 候选分词器，按准确度从高到低排列（basic总是可用）
+AUTO_CANDIDATES = ['pkuseg_default', 'jieba', 'thulac', 'basic']
+
+# 尚未测量时使用的吞吐量估计（字符/秒），偏保守
+DEFAULT_THROUGHPUT = {
+    'pkuseg_default': 40_000,
+    'jieba': 400_000,
+    'thulac': 30_000,
+    'basic': 1_500_000,
+}
+
+# 词性标注时吞吐量按此比例折算（测量到后使用实测值）
+POS_THROUGHPUT_FACTOR = 0.5
+
+# 默认延迟预算（毫秒）
+DEFAULT_LATENCY_BUDGET_MS = 500
+
+# 短文本的耗时主要是固定开销，不参与吞吐量统计
+MIN_SAMPLE_CHARS = 200
+
+# 吞吐量指数移动平均的权重
+EWMA_ALPHA = 0.3
+
+# 实测吞吐量的半衰期（秒）：长时间没有新样本（如一直因超出预算被跳过）的分词器，
+# 估计值逐渐回到默认估计，之后会被重新选中并重新测量
+THROUGHPUT_HALF_LIFE_S = 600
+
+
+class SegmenterPolicy:
+    """
+    分词器选择策略
+
+    每次分词后记录 (分词器, 是否词性标注) 的吞吐量（指数移动平均），
+    选择时按准确度顺序估算 文本长度 / 吞吐量，选第一个在预算内的分词器；
+    都超出预算时选预计最快的分词器。只在估算通过后才检查可用性，
+    所以长文本不会为了被跳过的分词器去加载模型。
+
+    每个分词器的第一个样本（词典初始化等一次性开销）不计入统计；
+    实测值随时间向默认估计衰减，偶然偏慢的样本不会让分词器永远不被选中。
+    """
+
+    def __init__(self, latency_budget_ms: Optional[float] = None,
+                 candidates: Optional[List[str]] = None):
+        """
+        Args:
+            latency_budget_ms: 单次分词的延迟预算（毫秒）；
+                None表示读取环境变量 NLP_AUTO_LATENCY_MS，未设置则为500
+            candidates: 候选分词器，按准确度从高到低排列
+        """
+        if latency_budget_ms is None:
+            latency_budget_ms = float(os.environ.get('NLP_AUTO_LATENCY_MS', DEFAULT_LATENCY_BUDGET_MS))
+        self.latency_budget_ms = latency_budget_ms
+        self.candidates = list(candidates or AUTO_CANDIDATES)
+
+        self._throughput = {}   # {(分词器, 是否词性标注): 字符/秒}
+        self._samples = {}      # {(分词器, 是否词性标注): 样本数}
+        self._measured_at = {}  # {(分词器, 是否词性标注): 最近一次样本的时间}
+        self._warmed = set()    # 已丢弃第一个样本的 (分词器, 是否词性标注)
+        self._lock = threading.Lock()
+
+    def record(self, method: str, chars: int, seconds: float, with_pos: bool = False) -> None:
+        """记录一次分词的耗时（每个分词器的第一个样本只用于预热，不计入）"""
+        if chars < MIN_SAMPLE_CHARS or seconds <= 0:
+            return
+        key = (method, bool(with_pos))
+        rate = chars / seconds
+        with self._lock:
+            if key not in self._warmed:
+                self._warmed.add(key)
+                return
+            previous = self._throughput.get(key)
+            self._throughput[key] = rate if previous is None else \
+                EWMA_ALPHA * rate + (1 - EWMA_ALPHA) * previous
+            self._samples[key] = self._samples.get(key, 0) + 1
+            self._measured_at[key] = time.monotonic()
+
+    def throughput(self, method: str, with_pos: bool = False) -> float:
+        """分词器的吞吐量（字符/秒），没有测量值时使用默认估计，实测值按半衰期向默认估计衰减"""
+        key = (method, bool(with_pos))
+        rate = DEFAULT_THROUGHPUT.get(method, DEFAULT_THROUGHPUT['basic'])
+        if with_pos:
+            rate *= POS_THROUGHPUT_FACTOR
+        measured = self._throughput.get(key)
+        if measured is None:
+            return rate
+        age = time.monotonic() - self._measured_at[key]
+        weight = 0.5 ** (age / THROUGHPUT_HALF_LIFE_S)
+        return weight * measured + (1 - weight) * rate
+
+    def estimate_ms(self, method: str, text_length: int, with_pos: bool = False) -> float:
+        """估算分词耗时（毫秒）"""
+        return text_length / self.throughput(method, with_pos) * 1000
+
+    def choose(self, text_length: int, is_available: Callable[[str], bool],
+               with_pos: bool = False) -> Dict:
+        """
+        选择分词器
+
+        Args:
+            text_length: 文本字符数
+            is_available: 判断分词器是否可用的函数（可以触发按需加载）
+            with_pos: 是否词性标注
+
+        Returns:
+            {'method': 选择的分词器, 'reason': 选择理由, 'estimated_ms': 预计耗时,
+             'budget_ms': 延迟预算, 'text_length': 文本长度, 'skipped': [被跳过的分词器及原因]}
+        """
+        budget = self.latency_budget_ms
+        skipped = []
+        over_budget = []
+
+        for method in self.candidates:
+            estimated = self.estimate_ms(method, text_length, with_pos)
+            if estimated > budget:
+                skipped.append({'method': method, 'reason': f'预计 {estimated:.0f}ms 超出预算'})
+                over_budget.append((estimated, method))  # 可用性留到需要时再检查
+                continue
+            if not (method == 'basic' or is_available(method)):
+                skipped.append({'method': method, 'reason': '不可用'})
+                continue
+            return self._decision(method, f'预计 {estimated:.0f}ms，是延迟预算内准确度最高的分词器',
+                                  estimated, text_length, skipped)
+
+        # 都超出预算：选预计最快的可用分词器
+        for estimated, method in sorted(over_budget):
+            if method == 'basic' or is_available(method):
+                return self._decision(method, f'所有分词器都超出 {budget:.0f}ms 预算，选择预计最快的分词器',
+                                      estimated, text_length, skipped)
+        return self._decision('basic', '没有可用的分词器', 0.0, text_length, skipped)
+
+    def _decision(self, method: str, reason: str, estimated: float,
+                  text_length: int, skipped: List[Dict]) -> Dict:
+        return {
+            'method': method,
+            'reason': reason,
+            'estimated_ms': round(estimated, 2),
+            'budget_ms': self.latency_budget_ms,
+            'text_length': text_length,
+            'skipped': [item for item in skipped if item['method'] != method]
+        }
+
+    def get_stats(self) -> Dict:
+        """获取延迟预算和每个分词器的吞吐量（measured为实测，default为默认估计）"""
+        with self._lock:
+            stats = {}
+            for method in self.candidates:
+                for with_pos in (False, True):
+                    key = (method, with_pos)
+                    name = f'{method}+pos' if with_pos else method
+                    stats[name] = {
+                        'chars_per_second': round(self.throughput(method, with_pos)),
+                        'source': 'measured' if key in self._throughput else 'default',
+                        'samples': self._samples.get(key, 0)
+                    }
+            return {'budget_ms': self.latency_budget_ms, 'throughput': stats}
@@ -4,6 +4,7 @@
 """
 
 import os
+import threading
 
 def load_hit_stopwords():
     """加载哈工大停用词表"""
@@ -162,35 +163,64 @@ ENGLISH_STOPWORDS = {
 }
 
 class StopwordsManager:
-    """停用词管理器"""
+    """
+    停用词管理器
+
+    合并后的停用词集合缓存为frozenset，只有自定义停用词变化时才重建；
+    version在每次变化后加1，下游缓存可以用它作为键的一部分
+    """
 
     def __init__(self):
         # 加载哈工大停用词表作为中文停用词
         self.chinese_stopwords = load_hit_stopwords()
         self.english_stopwords = ENGLISH_STOPWORDS.copy()
         self.custom_stopwords = set()
-    
+
+        self.version = 0      # 停用词集合的版本号
+        self._merged = None   # 合并后的停用词集合（frozenset），None表示需要重建
+        self._lock = threading.Lock()
+
+    def _invalidate(self):
+        """自定义停用词变化后使合并集合失效"""
+        with self._lock:
+            self._merged = None
+            self.version += 1
+
     def add_custom_stopwords(self, words):
         """添加自定义停用词"""
         if isinstance(words, str):
             words = [words]
+        size = len(self.custom_stopwords)
         for word in words:
             self.custom_stopwords.add(word.strip())
+        if len(self.custom_stopwords) != size:
+            self._invalidate()
     
     def remove_custom_stopwords(self, words):
         """移除自定义停用词"""
         if isinstance(words, str):
             words = [words]
+        size = len(self.custom_stopwords)
         for word in words:
             self.custom_stopwords.discard(word.strip())
+        if len(self.custom_stopwords) != size:
+            self._invalidate()
     
     def clear_custom_stopwords(self):
         """清空自定义停用词"""
-        self.custom_stopwords.clear()
+        if self.custom_stopwords:
+            self.custom_stopwords.clear()
+            self._invalidate()
     
     def get_all_stopwords(self):
-        """获取所有停用词（包括默认和自定义）"""
-        return self.chinese_stopwords | self.english_stopwords | self.custom_stopwords
+        """获取所有停用词（包括默认和自定义），返回缓存的frozenset，调用方不应修改"""
+        merged = self._merged
+        if merged is None:
+            with self._lock:
+                if self._merged is None:
+                    self._merged = frozenset(self.chinese_stopwords | self.english_stopwords | self.custom_stopwords)
+                merged = self._merged
+        return merged
     
     def is_stopword(self, word):
         """判断是否为停用词"""
@@ -3,104 +3,78 @@
 包含查找替换、词频统计、文本摘要等核心功能
 """
 
+import bisect
 import re
 import string
 import os
+import json
+import math
+import multiprocessing
+import threading
+import time
+from array import array
 from collections import Counter
-from typing import List, Dict, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Dict, Tuple, Optional, Iterable, Iterator, Union
 
-# 高级自然语言处理库
+# 延迟导入工具（只做规格检查，第一次使用时才真正导入）
 try:
-    import spacy
-    SPACY_AVAILABLE = True
-except (ImportError, ValueError) as e:
-    SPACY_AVAILABLE = False
-    print(f"spaCy不可用: {e}")
+    from .lazy_imports import is_module_available, lazy_import
+except ImportError:
+    from lazy_imports import is_module_available, lazy_import
 
-try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except (ImportError, ValueError) as e:
-    TEXTBLOB_AVAILABLE = False
-    print(f"TextBlob不可用: {e}")
+# 高级自然语言处理库
+SPACY_AVAILABLE = is_module_available('spacy')
+spacy = lazy_import('spacy')
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    VADER_AVAILABLE = True
-except (ImportError, ValueError) as e:
-    VADER_AVAILABLE = False
-    print(f"VADER不可用: {e}")
+TEXTBLOB_AVAILABLE = is_module_available('textblob')
+textblob = lazy_import('textblob')
 
-try:
-    import stanza
-    STANZA_AVAILABLE = True
-except (ImportError, ValueError) as e:
-    STANZA_AVAILABLE = False
-    print(f"Stanza不可用: {e}")
+VADER_AVAILABLE = is_module_available('vaderSentiment')
+vader_sentiment = lazy_import('vaderSentiment.vaderSentiment')
+
+STANZA_AVAILABLE = is_module_available('stanza')
+stanza = lazy_import('stanza')
 
 # 深度学习情感分析库
-try:
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-    import torch
-    TRANSFORMERS_AVAILABLE = True
-except (ImportError, ValueError) as e:
-    TRANSFORMERS_AVAILABLE = False
-    print(f"Transformers不可用: {e}")
+TRANSFORMERS_AVAILABLE = is_module_available('transformers') and is_module_available('torch')
+transformers = lazy_import('transformers')
+torch = lazy_import('torch')
 
-try:
-    from snownlp import SnowNLP
-    SNOWNLP_AVAILABLE = True
-except (ImportError, ValueError) as e:
-    SNOWNLP_AVAILABLE = False
-    print(f"SnowNLP不可用: {e}")
+SNOWNLP_AVAILABLE = is_module_available('snownlp')
+snownlp = lazy_import('snownlp')
 
 # 中文分词库
-try:
-    import jieba
-    import jieba.posseg as pseg
-    JIEBA_AVAILABLE = True
-except (ImportError, ValueError) as e:
-    JIEBA_AVAILABLE = False
-    print(f"jieba不可用: {e}")
+JIEBA_AVAILABLE = is_module_available('jieba')
+jieba = lazy_import('jieba')
+pseg = lazy_import('jieba.posseg')
 
-try:
-    import pkuseg
-    PKUSEG_AVAILABLE = True
-    print("✓ pkuseg可用")
-except (ImportError, ValueError) as e:
-    PKUSEG_AVAILABLE = False
-    print(f"pkuseg不可用: {e}")
+PKUSEG_AVAILABLE = is_module_available('pkuseg')
+pkuseg = lazy_import('pkuseg')
 
-try:
-    import thulac
-    THULAC_AVAILABLE = True
-    print("✓ thulac可用")
-except (ImportError, ValueError) as e:
-    THULAC_AVAILABLE = False
-    print(f"thulac不可用: {e}")
-
-# TextTeaser摘要库（由于依赖问题，我们实现自己的轻量级版本）
-# try:
-#     from textteaser import TextTeaser
-#     TEXTTEASER_AVAILABLE = True
-#     print("✓ TextTeaser可用")
-# except (ImportError, ValueError) as e:
-#     TEXTTEASER_AVAILABLE = False
-#     print(f"TextTeaser不可用: {e}")
-
-# 我们实现自己的TextTeaser风格算法
+THULAC_AVAILABLE = is_module_available('thulac')
+thulac = lazy_import('thulac')
+
+# 我们实现自己的TextTeaser风格算法（不依赖外部库）
 TEXTTEASER_AVAILABLE = True
-print("✓ 轻量级TextTeaser算法可用")
 
 # Qwen3大模型摘要
-try:
-    import requests
-    import json
-    QWEN3_AVAILABLE = True
-    print("✓ Requests库可用，支持Qwen3摘要")
-except (ImportError, ValueError) as e:
-    QWEN3_AVAILABLE = False
-    print(f"Requests库不可用: {e}")
+QWEN3_AVAILABLE = is_module_available('requests')
+requests = lazy_import('requests')
+
+LIBRARY_AVAILABILITY = {
+    'spacy': SPACY_AVAILABLE,
+    'textblob': TEXTBLOB_AVAILABLE,
+    'vaderSentiment': VADER_AVAILABLE,
+    'stanza': STANZA_AVAILABLE,
+    'transformers': TRANSFORMERS_AVAILABLE,
+    'snownlp': SNOWNLP_AVAILABLE,
+    'jieba': JIEBA_AVAILABLE,
+    'pkuseg': PKUSEG_AVAILABLE,
+    'thulac': THULAC_AVAILABLE,
+    'requests': QWEN3_AVAILABLE
+}
 
 # 导入停用词管理器
 try:
@@ -112,11 +86,102 @@ except ImportError:
     except ImportError:
         print("停用词管理器不可用，将使用基础功能")
 
+# 导入Qwen3健康监测（熔断器）
+try:
+    from .qwen3_health import Qwen3HealthMonitor
+except ImportError:
+    from qwen3_health import Qwen3HealthMonitor
+
+# 导入后端注册表（按需加载模型）
+try:
+    from .backend_registry import BackendRegistry
+except ImportError:
+    from backend_registry import BackendRegistry
+
+# 导入部署配置
+try:
+    from .profiles import resolve_profile
+except ImportError:
+    from profiles import resolve_profile
+
+# 导入紧凑的分词结果结构
+try:
+    from .segmented_doc import SegmentedDoc
+except ImportError:
+    from segmented_doc import SegmentedDoc
+
+# 导入分词结果缓存
+try:
+    from .segment_cache import SegmentCache
+except ImportError:
+    from segment_cache import SegmentCache
+
+# 导入自动分词器选择策略
+try:
+    from .segmenter_policy import SegmenterPolicy
+except ImportError:
+    from segmenter_policy import SegmenterPolicy
+
+# 导入段落级增量分析缓存
+try:
+    from .paragraph_cache import ParagraphCache, split_paragraphs
+except ImportError:
+    from paragraph_cache import ParagraphCache, split_paragraphs
+
+# 导入高频词近似统计（流式top-k）
+try:
+    from .heavy_hitters import SpaceSaving, DEFAULT_CAPACITY as DEFAULT_HEAVY_HITTER_CAPACITY
+except ImportError:
+    from heavy_hitters import SpaceSaving, DEFAULT_CAPACITY as DEFAULT_HEAVY_HITTER_CAPACITY
+
+# 导入内置的最大匹配分词器（不依赖分词库）
+try:
+    from .mm_segmenter import MaxMatchSegmenter
+except ImportError:
+    from mm_segmenter import MaxMatchSegmenter
+
+# 导入用户词典管理
+try:
+    from .user_dict import UserDictionary
+except ImportError:
+    from user_dict import UserDictionary
+
+# 导入模型文件解析器（只从本地缓存加载模型）
+try:
+    from .model_resolver import ModelResolver, MODEL_ARTIFACTS
+except ImportError:
+    from model_resolver import ModelResolver, MODEL_ARTIFACTS
+
 
 class TextProcessor:
     """文本处理器主类"""
     
-    def __init__(self):
+    def __init__(self, memory_budget_mb: Optional[float] = None,
+                 quantized_models: Optional[List[str]] = None,
+                 profile: Optional[str] = None,
+                 model_cache_dir: Optional[str] = None,
+                 segment_cache_mb: Optional[float] = None,
+                 auto_latency_budget_ms: Optional[float] = None,
+                 parallel_segment_chars: Optional[int] = None,
+                 segment_workers: Optional[int] = None):
+        """
+        Args:
+            memory_budget_mb: 模型内存预算（MB），超出时按LRU卸载模型；
+                None表示读取环境变量 NLP_MODEL_MEMORY_BUDGET_MB，未设置则不限制
+            quantized_models: 使用int8动态量化推理的情感模型键（如 ['uer_roberta_dianping']），
+                ['all']表示全部；None表示读取环境变量 NLP_QUANTIZED_MODELS（逗号分隔）
+            profile: 部署配置名称（'lite'、'standard'、'full'或配置文件中的自定义配置）；
+                None表示读取环境变量 NLP_PROFILE，未设置则使用配置文件默认值或'full'
+            model_cache_dir: 本地模型目录，None表示读取环境变量 NLP_MODEL_CACHE_DIR，
+                未设置时使用huggingface/Stanza/pkuseg的默认缓存目录
+            segment_cache_mb: 分词结果缓存容量（MB），0表示不缓存；
+                None表示读取环境变量 NLP_SEGMENT_CACHE_MB，未设置则为64MB
+            auto_latency_budget_ms: method='auto' 时单次分词的延迟预算（毫秒），
+                None表示读取环境变量 NLP_AUTO_LATENCY_MS，未设置则为500
+            parallel_segment_chars: pkuseg/thulac分词时，达到此长度的文本拆分到多个进程并行处理，
+                0表示不并行；None表示读取环境变量 NLP_PARALLEL_SEGMENT_CHARS，未设置则为200000
+            segment_workers: 并行分词的进程数，None表示读取环境变量 NLP_SEGMENT_WORKERS，未设置则为CPU核数
+        """
         self.text = ""
         self.original_text = ""
 
@@ -127,9 +192,48 @@ class TextProcessor:
             self.stopwords_manager = None
             print("停用词管理器初始化失败，将不使用停用词过滤")
 
-        # 初始化NLP模型和分词器
-        self.nlp_models = {}
-        self.segmenters = {}
+        # int8动态量化的模型（按模型键选择）
+        if quantized_models is None:
+            quantized_models = [key.strip() for key in os.environ.get('NLP_QUANTIZED_MODELS', '').split(',')
+                                if key.strip()]
+        self.quantized_models = set(quantized_models)
+
+        # 部署配置决定哪些后端可以注册
+        self.profile = resolve_profile(profile)
+
+        # 模型文件只从本地缓存解析，加载时不访问网络
+        self.model_resolver = ModelResolver(cache_dir=model_cache_dir)
+
+        # 注册NLP模型和分词器（首次使用时才加载）
+        self.backends = BackendRegistry(memory_budget_mb=memory_budget_mb,
+                                        allow=self.profile.allows)
+        self.nlp_models = self.backends.view('nlp')
+        self.segmenters = self.backends.view('segmenter')
+
+        # 分词结果缓存（同一文本的多个功能共用一次分词）
+        self.segment_cache = SegmentCache(segment_cache_mb)
+
+        # 段落级分析结果缓存（编辑文本后只重新分析变化的段落）
+        self.paragraph_cache = ParagraphCache()
+
+        # method='auto' 时按实测吞吐量和延迟预算选择分词器
+        self.segmenter_policy = SegmenterPolicy(auto_latency_budget_ms)
+
+        # 长文本的pkuseg/thulac分词拆分到多个进程
+        if parallel_segment_chars is None:
+            parallel_segment_chars = int(os.environ.get('NLP_PARALLEL_SEGMENT_CHARS', 200_000))
+        if segment_workers is None:
+            segment_workers = int(os.environ.get('NLP_SEGMENT_WORKERS', 0)) or os.cpu_count() or 1
+        self.parallel_segment_chars = parallel_segment_chars
+        self.segment_workers = segment_workers
+        self._segment_pool = None  # 并行/批量分词共用的进程池，首次使用时创建
+        self._segment_pool_lock = threading.Lock()
+        # 工作进程构造处理器后调用的函数（需可pickle，如模块级函数），用于注册自定义后端
+        self.segment_worker_setup: Optional[Callable[['TextProcessor'], None]] = None
+
+        # 用户词典（每个部署配置独立，jieba加载时应用）
+        self.user_dict = UserDictionary(self.profile.name)
+        self._basic_segmenter = None  # 内置最大匹配分词器，首次使用时加载
         self._init_nlp_models()
         self._init_segmenters()
 
@@ -137,10 +241,20 @@ class TextProcessor:
         self.textteaser = None
         self._init_textteaser()
 
-        # 初始化Qwen3客户端
-        self.qwen3_client = None
+        # 初始化Qwen3客户端（连接测试推迟到首次使用）
         self._init_qwen3()
 
+        # 预热状态（warmup()执行后更新）
+        self._warmup_lock = threading.Lock()
+        self._warmup_state = {'state': 'pending', 'started_at': None, 'duration': None, 'models': {}}
+
+    @property
+    def qwen3_client(self):
+        """Qwen3客户端是否可用（只读检查熔断器状态，可重复读取；实际放行在 _post_qwen3 中）"""
+        if self.qwen3_monitor and self.qwen3_monitor.is_available():
+            return True
+        return None
+
 
     
     def load_text(self, text: str) -> None:
@@ -213,6 +327,14 @@ class TextProcessor:
         
         return matches
     
+    # 词频统计时替换为空格的标点符号（中文标点 + 英文标点）
+    FREQ_PUNCTUATION = '，。！？；：""（）【】《》、“”……' + string.punctuation
+
+    # 一次扫描完成全部替换：标点和换行符都替换为空格
+    # （字符类正则对中文文本比str.translate快数倍，translate对非ASCII字符逐个查字典）
+    _FREQ_PUNCT_PATTERN = re.compile('[' + re.escape(FREQ_PUNCTUATION + '\n\r') + ']')
+    _NEWLINE_PATTERN = re.compile('[\n\r]')
+
     def word_frequency(self, ignore_case: bool = True,
                       min_word_length: int = 1,
                       exclude_punctuation: bool = True,
@@ -239,70 +361,172 @@ class TextProcessor:
             return {}
         text = self.text
 
-        if ignore_case:
-            text = text.lower()
-
-        # 移除标点符号和换行符，替换为空格
-        if exclude_punctuation:
-            # 中文标点符号
-            chinese_punctuation = '，。！？；：""''（）【】《》、“”……'
-            # 英文标点符号
-            english_punctuation = string.punctuation
-            all_punctuation = chinese_punctuation + english_punctuation
-
-            # 将标点符号替换为空格，而不是直接删除
-            for punct in all_punctuation:
-                text = text.replace(punct, ' ')
-
-        # 将换行符也替换为空格
-        text = text.replace('\n', ' ').replace('\r', ' ')
-
-        # 使用智能分词替代简单分割
-        segments = self.segment_text(
-            text=text,
-            method=segmentation_method,
-            mode='accurate',
-            with_pos=False
-        )
+        # 按全文长度解析一次分词方法，各段落使用同一个分词器
+        params, count = self._word_counter(
+            len(text), ignore_case, min_word_length, exclude_punctuation,
+            segmentation_method, exclude_stopwords, exclude_numbers, exclude_single_chars)
+
+        # 按段落统计后相加：上次统计过的段落直接复用，只重新统计变化的段落
+        paragraphs = [paragraph for _, paragraph in split_paragraphs(text)]
+        return dict(self.paragraph_cache.count('word_frequency', params, paragraphs, count))
+
+    def count_terms(self, texts: List[str], ignore_case: bool = True,
+                    min_word_length: int = 1,
+                    exclude_punctuation: bool = True,
+                    segmentation_method: str = 'auto',
+                    exclude_stopwords: bool = True,
+                    exclude_numbers: bool = True,
+                    exclude_single_chars: bool = True) -> List[Counter]:
+        """
+        分别统计多个文本的词频（与word_frequency相同的分词和过滤），不使用也不修改当前文本
 
-        # 提取词汇
-        words = [seg['word'] for seg in segments]
+        所有文本合并为一次分词，适合批量导入文档
 
-        # 过滤标点符号（如果需要）
-        if exclude_punctuation:
-            # 中文标点符号
-            chinese_punctuation = '，。！？；：""''（）【】《》、""……'
-            # 英文标点符号
-            english_punctuation = string.punctuation
-            all_punctuation = chinese_punctuation + english_punctuation
+        Returns:
+            与texts一一对应的 Counter({词: 频率})
+        """
+        if not texts:
+            return []
+        _, count = self._word_counter(
+            max(len(text) for text in texts), ignore_case, min_word_length, exclude_punctuation,
+            segmentation_method, exclude_stopwords, exclude_numbers, exclude_single_chars)
+        return count(texts)
+
+    def _word_counter(self, text_length: int, ignore_case: bool, min_word_length: int,
+                      exclude_punctuation: bool, segmentation_method: str, exclude_stopwords: bool,
+                      exclude_numbers: bool, exclude_single_chars: bool):
+        """
+        按词频统计参数准备批量计数函数
 
-            # 过滤纯标点符号的词
-            words = [word for word in words if not all(c in all_punctuation for c in word)]
+        Returns:
+            (决定统计结果的参数元组, 计数函数：传入文本列表，返回各文本的Counter)
+        """
+        method = self._resolve_segment_method(segmentation_method, text_length)
+        self._refresh_user_dict(method)
 
-        # 过滤短词和空词
-        words = [word for word in words if word.strip() and len(word) >= min_word_length]
+        # 标点符号和换行符替换为空格（一次扫描）
+        pattern = self._FREQ_PUNCT_PATTERN if exclude_punctuation else self._NEWLINE_PATTERN
 
-        # 过滤纯数字
-        if exclude_numbers:
-            words = [word for word in words if not word.isdigit()]
+        # 所有过滤条件合并为一个判断，词直接流入计数器，不生成中间列表
+        # （标点已在分词前替换为空格，分词结果中不会再有纯标点的词）
+        stopwords = None
+        if exclude_stopwords and self.stopwords_manager:
+            stopwords = self.stopwords_manager.get_all_stopwords()
+        min_length = max(min_word_length, 2 if exclude_single_chars else 1)
+        keep = self._compile_word_filter(min_length, exclude_numbers, stopwords)
 
-        # 过滤单字符（如果启用）
-        if exclude_single_chars:
-            words = [word for word in words if len(word) > 1]
+        params = (ignore_case, exclude_punctuation, method, min_length, exclude_numbers,
+                  self.get_stopwords_version() if stopwords is not None else None)
+        return params, lambda texts: self._count_paragraph_words(texts, method, pattern, keep, ignore_case)
 
-        # 过滤停用词
-        if exclude_stopwords and self.stopwords_manager:
-            words = self.stopwords_manager.filter_stopwords(words)
+    def _count_paragraph_words(self, paragraphs: List[str], method: str, pattern,
+                               keep, ignore_case: bool) -> List[Counter]:
+        """
+        统计多个段落（或文本）各自的词频
 
-        # 统计频率
-        word_count = Counter(words)
+        所有段落拼接后只分词一次（长文本仍可使用分词缓存和并行分词），
+        再按词的起始偏移把词分回各自的段落
+        """
+        if ignore_case:
+            paragraphs = [paragraph.lower() for paragraph in paragraphs]
+        text = pattern.sub(' ', '\n\n'.join(paragraphs))
+        doc = self.segment_text(text=text, method=method, mode='accurate', with_pos=False)
+
+        counters = [Counter() for _ in paragraphs]
+        if not doc.has_offsets:
+            if len(paragraphs) == 1:
+                counters[0].update(filter(keep, doc.words))
+                return counters
+            # 分词结果不含偏移时逐段分词
+            return [self._count_paragraph_words([paragraph], method, pattern, keep, False)[0]
+                    for paragraph in paragraphs]
+
+        ends = []
+        end = 0
+        for paragraph in paragraphs:
+            end += len(paragraph) + 2
+            ends.append(end)
+        index = 0
+        for word, start in zip(doc.words, doc.starts):
+            while start >= ends[index]:
+                index += 1
+            if keep(word):
+                counters[index][word] += 1
+        return counters
+
+    @staticmethod
+    def _compile_word_filter(min_length: int, exclude_numbers: bool,
+                             stopwords: Optional[set] = None):
+        """
+        生成词频统计的过滤函数：长度、空白、停用词、纯数字一次判断
 
-        return dict(word_count)
+        按开销从低到高排列，大部分被过滤的词（单字、停用词）在前两项就被排除
+        """
+        min_length = max(min_length, 1)
+        stopwords = stopwords or frozenset()
+        if exclude_numbers:
+            return lambda word: (len(word) >= min_length and word not in stopwords
+                                 and not word.isdigit() and not word.isspace())
+        return lambda word: len(word) >= min_length and word not in stopwords and not word.isspace()
     
-    def get_top_words(self, n: int = 10, **kwargs) -> List[Tuple[str, int]]:
-        """获取出现频率最高的n个词"""
+    def get_top_words(self, n: int = 10, streaming: bool = False,
+                      capacity: Optional[int] = None, max_error: Optional[float] = None,
+                      **kwargs) -> List[Tuple[str, int]]:
+        """
+        获取出现频率最高的n个词
+
+        Args:
+            n: 返回的词数
+            streaming: 是否使用流式近似统计（Space-Saving，内存不随不重复词数增长，
+                       计数为不低于真实值的估计值）
+            capacity: 流式统计保留的最多词数
+            max_error: 流式统计允许的最大高估比例（相对总词数）
+            **kwargs: word_frequency 的参数
+        """
+        if streaming:
+            # 保留的词数至少为n
+            if capacity is None and max_error is None:
+                capacity = DEFAULT_HEAVY_HITTER_CAPACITY
+            capacity = max(capacity or 0, n)
+            texts = (paragraph for _, paragraph in split_paragraphs(self.text))
+            return self.stream_top_words(texts, capacity, max_error, **kwargs).top(n)
         word_freq = self.word_frequency(**kwargs)
         return Counter(word_freq).most_common(n)
+
+    # 流式统计时每批分词的字符数（一批文本的计数用完即丢弃）
+    STREAM_BATCH_CHARS = 1_000_000
+
+    def stream_top_words(self, texts: Iterable[str], capacity: Optional[int] = None,
+                         max_error: Optional[float] = None, **kwargs) -> SpaceSaving:
+        """
+        在文本流上近似统计高频词（与word_frequency相同的分词和过滤）
+
+        文本按 STREAM_BATCH_CHARS 分批分词计数，每批的计数并入固定容量的 Space-Saving 计数器，
+        内存只取决于批大小和capacity，与不重复的词数和流的长度无关
+
+        Args:
+            texts: 文本序列（可以是不断产生文本的迭代器）
+            capacity: 最多保留的词数
+            max_error: 允许的最大高估比例（相对总词数）
+            **kwargs: count_terms 的参数
+
+        Returns:
+            SpaceSaving，top(n) 获取高频词，get_stats() 获取误差上界
+        """
+        sketch = SpaceSaving(capacity, max_error)
+        batch = []
+        batch_chars = 0
+        for text in texts:
+            batch.append(text)
+            batch_chars += len(text)
+            if batch_chars >= self.STREAM_BATCH_CHARS:
+                for counts in self.count_terms(batch, **kwargs):
+                    sketch.update_counts(counts)
+                batch = []
+                batch_chars = 0
+        for counts in self.count_terms(batch, **kwargs):
+            sketch.update_counts(counts)
+        return sketch
     
     def generate_summary(self, num_sentences: int = 3,
                         method: str = 'frequency', title: str = '') -> str:
@@ -353,6 +577,33 @@ class TextProcessor:
 
         return sentences
     
+    def _sentence_word_lists(self, sentences: List[str]) -> List[List[str]]:
+        """
+        各句子的分词结果（小写，与word_frequency的键一致）
+
+        按全文长度解析一次分词方法，对word_frequency（忽略大小写、排除标点）分词的同一文本分词，
+        直接命中分词缓存；再按句子在原文中的偏移截取词列表，句子不在原文中时才单独分词
+        """
+        method = self._resolve_segment_method('auto', len(self.text))
+        text = '\n\n'.join(paragraph for _, paragraph in split_paragraphs(self.text))
+        # 标点替换为等长的空格，小写不改变长度时偏移与原文一致
+        normalized = self._FREQ_PUNCT_PATTERN.sub(' ', text.lower())
+        doc = self.segment_text(normalized if len(normalized) == len(text) else text, method=method)
+        words, starts = doc.words, doc.starts
+
+        word_lists = []
+        cursor = 0
+        for sentence in sentences:
+            begin = text.find(sentence, cursor)
+            if begin < 0 or starts is None:
+                word_lists.append([word.lower() for word in self.segment_text(sentence, method=method).words])
+                continue
+            end = cursor = begin + len(sentence)
+            word_lists.append([words[i].lower()
+                               for i in range(bisect.bisect_left(starts, begin), bisect.bisect_left(starts, end))
+                               if starts[i] + len(words[i]) <= end])
+        return word_lists
+
     def _frequency_based_summary(self, sentences: List[str], num_sentences: int) -> str:
         """基于词频的摘要"""
         # 计算词频
@@ -360,8 +611,7 @@ class TextProcessor:
         
         # 计算句子得分
         sentence_scores = []
-        for sentence in sentences:
-            words = sentence.lower().translate(str.maketrans('', '', string.punctuation)).split()
+        for sentence, words in zip(sentences, self._sentence_word_lists(sentences)):
             score = sum(word_freq.get(word, 0) for word in words)
             sentence_scores.append((score, sentence))
         
@@ -402,8 +652,8 @@ class TextProcessor:
         total_sentences = len(sentences)
         
         sentence_scores = []
-        for i, sentence in enumerate(sentences):
-            words = sentence.lower().translate(str.maketrans('', '', string.punctuation)).split()
+        word_lists = self._sentence_word_lists(sentences)
+        for i, (sentence, words) in enumerate(zip(sentences, word_lists)):
             freq_score = sum(word_freq.get(word, 0) for word in words)
             
             # 位置权重：开头和结尾句子权重更高
@@ -652,10 +902,7 @@ class TextProcessor:
 
             # 调用Qwen3模型API
             headers = {'Content-type': 'application/json'}
-            response = requests.post(self.qwen3_api_url,
-                                   data=json.dumps(data),
-                                   headers=headers,
-                                   timeout=60)
+            response = self._post_qwen3(data, headers)
 
             if response.status_code == 200:
                 response_data = response.json()
@@ -748,81 +995,132 @@ class TextProcessor:
         else:
             return []
 
+    def get_stopwords_version(self) -> int:
+        """停用词集合的版本号（自定义停用词每次变化后加1），可作为依赖停用词的缓存键"""
+        return self.stopwords_manager.version if self.stopwords_manager else 0
+
+    def add_user_words(self, words) -> int:
+        """
+        添加用户词汇（立即生效，不重新初始化jieba）
+
+        Args:
+            words: '词'、{'word': '词', 'freq': 词频, 'tag': '词性'} 或 (词, 词频, 词性) 的列表
+
+        Returns:
+            实际变化的词数
+        """
+        if isinstance(words, (str, dict)):
+            words = [words]
+        changed = self.user_dict.add_words(words)
+        if changed:
+            self._on_user_dict_changed()
+        return changed
+
+    def remove_user_words(self, words) -> int:
+        """删除词汇（删除后该词会被强制切分）"""
+        if isinstance(words, str):
+            words = [words]
+        changed = self.user_dict.remove_words(words)
+        if changed:
+            self._on_user_dict_changed()
+        return changed
+
+    def load_user_dict(self, file_path: str, encoding: str = 'utf-8') -> int:
+        """批量导入jieba用户词典格式（每行 "词语 [词频] [词性]"）的文件"""
+        changed = self.user_dict.load_file(file_path, encoding)
+        if changed:
+            self._on_user_dict_changed()
+        return changed
+
+    def get_user_words(self) -> Dict[str, List]:
+        """获取当前部署配置的用户词汇"""
+        return self.user_dict.get_words()
+
+    def _refresh_user_dict(self, method: str) -> None:
+        """其他工作进程修改了用户词典时增量应用，并使缓存的分词结果失效"""
+        if method in ('jieba', 'basic') and self.user_dict.refresh():
+            self._on_user_dict_changed()
+
+    def _on_user_dict_changed(self) -> None:
+        """用户词典变化后清空分词缓存和段落缓存，内置分词器下次使用时按新词典重建"""
+        self.segment_cache.clear()
+        self.paragraph_cache.clear()
+        self._basic_segmenter = None
+
+    @property
+    def basic_segmenter(self) -> MaxMatchSegmenter:
+        """内置的双向最大匹配分词器（首次使用时加载内置词典和用户词典）"""
+        if self._basic_segmenter is None:
+            segmenter = MaxMatchSegmenter.from_file()
+            user_words = self.user_dict.get_words()
+            for item in user_words['words']:
+                segmenter.add_word(item['word'])
+            for word in user_words['removed']:
+                segmenter.remove_word(word)
+            self._basic_segmenter = segmenter
+        return self._basic_segmenter
+
     def _init_nlp_models(self):
-        """初始化NLP模型"""
-        # 初始化spaCy模型
+        """注册NLP模型加载器（按需加载，构造时不加载任何模型）"""
+        # 注册spaCy模型（中文优先，中文不可用时才会尝试英文）
         if SPACY_AVAILABLE:
-            try:
-                # 尝试加载中文模型
-                self.nlp_models['spacy_zh'] = spacy.load("zh_core_web_sm")
-                print("✓ spaCy中文模型加载成功")
-            except Exception as e:
-                print(f"spaCy中文模型加载失败: {e}")
-                try:
-                    # 如果中文模型不可用，尝试英文模型
-                    self.nlp_models['spacy_en'] = spacy.load("en_core_web_sm")
-                    print("✓ spaCy英文模型加载成功")
-                except Exception as e2:
-                    print(f"spaCy英文模型加载失败: {e2}")
+            self.backends.register('spacy_zh', lambda: self._load_spacy('spacy_zh'),
+                                   group='nlp', description='spaCy中文模型')
+            self.backends.register('spacy_en', lambda: self._load_spacy('spacy_en'),
+                                   group='nlp', description='spaCy英文模型')
 
-        # 初始化VADER情感分析器
+        # 注册VADER情感分析器
         if VADER_AVAILABLE:
-            try:
-                self.nlp_models['vader'] = SentimentIntensityAnalyzer()
-                print("✓ VADER情感分析器加载成功")
-            except Exception as e:
-                print(f"VADER加载失败: {e}")
+            self.backends.register('vader', lambda: vader_sentiment.SentimentIntensityAnalyzer(),
+                                   group='nlp', description='VADER情感分析器', evictable=False)
 
-        # 初始化Stanza模型（离线优先模式）
+        # 注册Stanza模型（离线优先模式）
         if STANZA_AVAILABLE:
-            try:
-                # 尝试初始化中文模型（离线模式）
-                self.nlp_models['stanza_zh'] = stanza.Pipeline(
-                    'zh-hans',
-                    processors='tokenize,pos,lemma,depparse',
-                    download_method=stanza.DownloadMethod.REUSE_RESOURCES,
-                    verbose=False,
-                    use_gpu=False
-                )
-                print("✓ Stanza中文模型加载成功")
-            except Exception as e:
-                print(f"Stanza中文模型加载失败: {e}")
-                try:
-                    # 如果中文模型不可用，尝试英文模型（离线模式）
-                    self.nlp_models['stanza_en'] = stanza.Pipeline(
-                        'en',
-                        processors='tokenize,pos,lemma,depparse',
-                        download_method=stanza.DownloadMethod.REUSE_RESOURCES,
-                        verbose=False,
-                        use_gpu=False
-                    )
-                    print("✓ Stanza英文模型加载成功")
-                except Exception as e2:
-                    print(f"Stanza英文模型加载失败: {e2}")
-                    print("💡 提示: 运行 'python download_models.py' 预下载模型文件")
+            self.backends.register('stanza_zh', lambda: self._load_stanza('stanza_zh'),
+                                   group='nlp', description='Stanza中文模型')
+            self.backends.register('stanza_en', lambda: self._load_stanza('stanza_en'),
+                                   group='nlp', description='Stanza英文模型')
 
-        # 初始化深度学习情感分析模型
+        # 注册深度学习情感分析模型
         self._init_advanced_sentiment_models()
 
-        # 初始化SnowNLP
+        # 注册TextBlob
+        if TEXTBLOB_AVAILABLE:
+            self.backends.register('textblob', lambda: textblob.TextBlob,
+                                   group='nlp', description='TextBlob情感分析', evictable=False)
+
+        # 注册SnowNLP（不需要预加载，使用时直接创建实例）
         if SNOWNLP_AVAILABLE:
-            try:
-                # SnowNLP不需要预加载，使用时直接创建实例
-                self.nlp_models['snownlp'] = True  # 标记可用
-                print("✓ SnowNLP中文情感分析器可用")
-            except Exception as e:
-                print(f"SnowNLP初始化失败: {e}")
+            self.backends.register('snownlp', lambda: True,
+                                   group='nlp', description='SnowNLP中文情感分析器', evictable=False)
 
         # 添加基础NLP功能（不依赖外部库）
         self._init_basic_nlp()
 
+    def _load_spacy(self, name: str):
+        """加载spaCy模型包（模型包未安装时直接报告缺失，不尝试下载）"""
+        package = self.model_resolver.require(name)
+        return spacy.load(package)
+
+    def _load_stanza(self, name: str):
+        """从本地资源目录加载Stanza句法分析模型（不下载、不访问网络）"""
+        resources_dir = self.model_resolver.require(name)
+        return stanza.Pipeline(
+            MODEL_ARTIFACTS[name]['id'],
+            dir=resources_dir,
+            processors='tokenize,pos,lemma,depparse',
+            download_method=None,
+            verbose=False,
+            use_gpu=False
+        )
+
     def _init_advanced_sentiment_models(self):
-        """初始化深度学习情感分析模型"""
+        """注册深度学习情感分析模型"""
         if not TRANSFORMERS_AVAILABLE:
-            print("Transformers不可用，跳过深度学习模型初始化")
+            print("Transformers不可用，跳过深度学习模型注册")
             return
 
-        # 预训练中文情感分析模型配置（按优先级排序）
+        # 预训练中文情感分析模型配置（按优先级排序，分析时按此顺序按需加载）
         sentiment_models = {
             'uer_roberta_dianping': {
                 'model_name': 'uer/roberta-base-finetuned-dianping-chinese',
@@ -841,53 +1139,57 @@ class TextProcessor:
             },
         }
 
-        # 尝试加载预训练情感分析模型
-        loaded_models = 0
         for model_key, config in sentiment_models.items():
-            try:
-                print(f"尝试加载 {config['description']}...")
-
-                # 创建情感分析pipeline
-                sentiment_pipeline = pipeline(
-                    "sentiment-analysis",
-                    model=config['model_name'],
-                    tokenizer=config['model_name'],
-                    return_all_scores=True
-                )
+            quantize = self._is_quantized(model_key)
+            self.backends.register(
+                model_key,
+                lambda model_key=model_key, quantize=quantize:
+                    self._load_sentiment_pipeline(model_key, quantize),
+                group='nlp',
+                description=config['description'] + ('（int8量化）' if quantize else '')
+            )
 
-                self.nlp_models[model_key] = sentiment_pipeline
-                print(f"✓ {config['description']} 加载成功")
-                loaded_models += 1
+        # 通用中文BERT模型（没有情感分类头，仅在显式需要时加载）
+        self.backends.register('bert_base_chinese', self._load_bert_base_chinese,
+                               group='nlp', description='通用中文BERT模型')
 
-                # 如果成功加载了一个高优先级模型，可以选择是否继续加载其他模型
-                if config['priority'] == 1:
-                    print("已加载高优先级模型，跳过其他模型以节省内存")
-                    break
+    def _is_quantized(self, model_key: str) -> bool:
+        """该模型是否启用int8量化推理"""
+        return 'all' in self.quantized_models or model_key in self.quantized_models
 
-            except Exception as e:
-                print(f"✗ {config['description']} 加载失败: {e}")
-                continue
+    def _load_sentiment_pipeline(self, model_key: str, quantize: bool = False):
+        """
+        从本地缓存加载情感分析pipeline（local_files_only，不查询huggingface hub），
+        quantize为True时对Linear层做int8动态量化（仅CPU）
+        """
+        model_path = self.model_resolver.require(model_key)
+        sentiment_pipeline = transformers.pipeline(
+            "sentiment-analysis",
+            model=model_path,
+            tokenizer=model_path,
+            model_kwargs={'local_files_only': True},
+            return_all_scores=True
+        )
 
-        # 如果没有成功加载任何预训练模型，尝试加载通用中文模型
-        if loaded_models == 0:
-            try:
-                print("尝试加载通用中文BERT模型...")
-                # 使用通用的中文BERT模型
-                tokenizer = AutoTokenizer.from_pretrained('bert-base-chinese')
-                model = AutoModelForSequenceClassification.from_pretrained('bert-base-chinese')
-
-                self.nlp_models['bert_base_chinese'] = {
-                    'tokenizer': tokenizer,
-                    'model': model
-                }
-                print("✓ 通用中文BERT模型加载成功")
-            except Exception as e:
-                print(f"通用中文BERT模型加载失败: {e}")
+        if quantize:
+            quantization = getattr(torch, 'ao', torch).quantization
+            sentiment_pipeline.model = quantization.quantize_dynamic(
+                sentiment_pipeline.model.to('cpu').eval(),
+                {torch.nn.Linear},
+                dtype=torch.qint8
+            )
 
-        if loaded_models > 0:
-            print(f"✓ 成功加载 {loaded_models} 个深度学习情感分析模型")
-        else:
-            print("⚠ 未能加载任何深度学习情感分析模型，将使用传统方法")
+        return sentiment_pipeline
+
+    def _load_bert_base_chinese(self) -> Dict:
+        """加载通用中文BERT模型"""
+        model_path = self.model_resolver.require('bert_base_chinese')
+        tokenizer = transformers.AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+        model = transformers.AutoModelForSequenceClassification.from_pretrained(model_path, local_files_only=True)
+        return {
+            'tokenizer': tokenizer,
+            'model': model
+        }
 
     def _init_basic_nlp(self):
         """初始化基础NLP功能"""
@@ -969,107 +1271,108 @@ class TextProcessor:
         print("✓ 基础NLP功能初始化完成")
 
     def _init_segmenters(self):
-        """初始化中文分词器"""
-        # 初始化jieba分词器
+        """注册中文分词器加载器（按需加载）"""
+        # 注册jieba分词器
         if JIEBA_AVAILABLE:
-            try:
-                # 设置jieba为静默模式
-                jieba.setLogLevel(20)
-                # 预加载词典
-                jieba.initialize()
-                self.segmenters['jieba'] = jieba
-                print("✓ jieba分词器加载成功")
-            except Exception as e:
-                print(f"jieba分词器加载失败: {e}")
+            # jieba是模块级单例，卸载不会释放内存
+            self.backends.register('jieba', self._load_jieba,
+                                   group='segmenter', description='jieba分词器', evictable=False)
 
-        # 初始化pkuseg分词器
+        # 注册pkuseg分词器（默认模型和各领域模型）
         if PKUSEG_AVAILABLE:
-            try:
-                # 使用默认模型，支持多种领域
-                self.segmenters['pkuseg_default'] = pkuseg.pkuseg()
-                print("✓ pkuseg默认分词器加载成功")
-
-                # 尝试加载不同领域的模型
-                domain_models = {
-                    'pkuseg_news': 'news',      # 新闻领域
-                    'pkuseg_web': 'web',        # 网络领域
-                    'pkuseg_medicine': 'medicine',  # 医药领域
-                    'pkuseg_tourism': 'tourism'     # 旅游领域
-                }
+            self.backends.register('pkuseg_default', lambda: pkuseg.pkuseg(),
+                                   group='segmenter', description='pkuseg默认分词器')
+
+            domain_models = {
+                'pkuseg_news': 'news',      # 新闻领域
+                'pkuseg_web': 'web',        # 网络领域
+                'pkuseg_medicine': 'medicine',  # 医药领域
+                'pkuseg_tourism': 'tourism'     # 旅游领域
+            }
 
-                for model_key, domain in domain_models.items():
-                    try:
-                        self.segmenters[model_key] = pkuseg.pkuseg(model_name=domain)
-                        print(f"✓ pkuseg {domain}领域分词器加载成功")
-                    except Exception as e:
-                        print(f"pkuseg {domain}领域分词器加载失败: {e}")
+            # 领域模型和词性标注模型需要事先放入pkuseg模型目录，缺失时报告缺少的文件而不是下载
+            for model_key, domain in domain_models.items():
+                self.backends.register(
+                    model_key,
+                    lambda model_key=model_key: pkuseg.pkuseg(model_name=self.model_resolver.require(model_key)),
+                    group='segmenter',
+                    description=f'pkuseg {domain}领域分词器'
+                )
 
-            except Exception as e:
-                print(f"pkuseg分词器加载失败: {e}")
+            # 带词性标注的pkuseg分词器，每个领域只加载一次并复用
+            self.backends.register('pkuseg_pos_default', lambda: self._load_pkuseg_pos('pkuseg_pos_default'),
+                                   group='pos_segmenter', description='pkuseg默认词性标注分词器')
+            for model_key, domain in domain_models.items():
+                pos_key = model_key.replace('pkuseg_', 'pkuseg_pos_')
+                self.backends.register(
+                    pos_key,
+                    lambda pos_key=pos_key: self._load_pkuseg_pos(pos_key),
+                    group='pos_segmenter',
+                    description=f'pkuseg {domain}领域词性标注分词器'
+                )
 
-        # 初始化thulac分词器
+        # 注册thulac分词器
         if THULAC_AVAILABLE:
-            try:
-                # 使用默认模型
-                self.segmenters['thulac'] = thulac.thulac()
-                print("✓ thulac分词器加载成功")
-            except Exception as e:
-                print(f"thulac分词器加载失败: {e}")
-
-        print("✓ 分词器初始化完成")
+            self.backends.register('thulac', lambda: thulac.thulac(),
+                                   group='segmenter', description='thulac分词器')
+
+    def _load_pkuseg_pos(self, name: str):
+        """加载带词性标注的pkuseg分词器（模型文件已在本地时pkuseg不会下载）"""
+        model_path = self.model_resolver.require(name)
+        if name == 'pkuseg_pos_default':
+            return pkuseg.pkuseg(postag=True)
+        return pkuseg.pkuseg(model_name=model_path, postag=True)
+
+    def _load_jieba(self):
+        """加载jieba分词器，并应用用户词典（优先使用编译缓存）"""
+        # 设置jieba为静默模式
+        jieba.setLogLevel(20)
+        # 预加载词典（编译缓存指纹匹配时跳过jieba.initialize()）
+        self.user_dict.attach(jieba.dt)
+        return jieba
 
     def _init_textteaser(self):
         """初始化TextTeaser摘要器（轻量级实现）"""
         if TEXTTEASER_AVAILABLE:
             # 我们使用自己的轻量级实现，不需要外部库
             self.textteaser = True  # 标记为可用
-            print("✓ 轻量级TextTeaser算法加载成功")
         else:
             self.textteaser = None
 
     def _init_qwen3(self):
-        """初始化Qwen3大模型客户端"""
-        if QWEN3_AVAILABLE:
-            try:
-                # 设置API端点
-                self.qwen3_api_url = 'http://localhost:6006/api/chat'
-                self.qwen3_model = 'qwen3:8b'  # 根据您提供的模型信息
-
-                # 测试连接
-                test_data = {
-                    "model": self.qwen3_model,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": "测试连接"
-                        }
-                    ],
-                    "stream": False
-                }
+        """初始化Qwen3大模型客户端配置，健康监测在首次使用时于后台启动"""
+        # 设置API端点
+        self.qwen3_api_url = 'http://localhost:6006/api/chat'
+        self.qwen3_model = 'qwen3:8b'  # 根据您提供的模型信息
 
-                headers = {'Content-type': 'application/json'}
-                response = requests.post(self.qwen3_api_url,
-                                       data=json.dumps(test_data),
-                                       headers=headers,
-                                       timeout=10)
+        if QWEN3_AVAILABLE and self.profile.allows('qwen3'):
+            self.qwen3_monitor = Qwen3HealthMonitor(self.qwen3_api_url, self.qwen3_model)
+        else:
+            self.qwen3_monitor = None
 
-                if response.status_code == 200:
-                    self.qwen3_client = True  # 标记为可用
-                    print(f"✓ Qwen3模型连接成功: {self.qwen3_model}")
-                else:
-                    print(f"⚠ Qwen3模型连接失败，状态码: {response.status_code}")
-                    self.qwen3_client = None
+    def _post_qwen3(self, data: Dict, headers: Dict):
+        """调用Qwen3接口，并把结果反馈给熔断器（熔断器只在这里放行一次请求）"""
+        if not self.qwen3_monitor or not self.qwen3_monitor.allow_request():
+            raise RuntimeError("Qwen3服务熔断中，暂不可用")
+        try:
+            response = requests.post(self.qwen3_api_url,
+                                     data=json.dumps(data),
+                                     headers=headers,
+                                     timeout=60)
+        except Exception:
+            self.qwen3_monitor.record_failure()
+            raise
 
-            except Exception as e:
-                print(f"Qwen3模型连接失败: {e}")
-                self.qwen3_client = None
+        if response.status_code == 200:
+            self.qwen3_monitor.record_success()
         else:
-            self.qwen3_client = None
+            self.qwen3_monitor.record_failure()
+        return response
 
     def segment_text(self, text: Optional[str] = None,
                     method: str = 'auto',
                     mode: str = 'accurate',
-                    with_pos: bool = False) -> List[Dict]:
+                    with_pos: bool = False) -> SegmentedDoc:
         """
         中文分词功能
 
@@ -1080,59 +1383,324 @@ class TextProcessor:
             with_pos: 是否包含词性标注
 
         Returns:
-            [{'word': '词', 'pos': '词性'}, ...] 或 [{'word': '词'}, ...]
+            SegmentedDoc，按 [{'word': '词', 'pos': '词性', 'start': 起始偏移, 'end': 结束偏移}, ...]
+            访问（不含词性时没有'pos'），偏移为词在text中的字符位置；
+            to_list() 转换为可JSON序列化的列表
         """
         if text is None:
             text = self.text
 
         if not text.strip():
-            return []
-
-        # 自动选择最佳分词器
-        if method == 'auto':
-            if 'pkuseg_default' in self.segmenters:
-                method = 'pkuseg_default'  # pkuseg准确度较高
-            elif 'jieba' in self.segmenters:
-                method = 'jieba'   # jieba速度较快
-            elif 'thulac' in self.segmenters:
-                method = 'thulac'  # thulac也不错
-            else:
-                method = 'basic'   # 降级到基础方法
-
-        # 使用指定的分词器
-        if method == 'jieba' and 'jieba' in self.segmenters:
+            return SegmentedDoc()
+
+        method = self._resolve_segment_method(method, len(text), with_pos)
+        self._refresh_user_dict(method)
+
+        # 查询分词缓存
+        use_cache = self.segment_cache.max_bytes > 0
+        if use_cache:
+            cache_key = SegmentCache.make_key(text, method, mode, with_pos)
+            cached = self.segment_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        doc = self._run_segmenter(text, method, mode, with_pos)
+
+        if use_cache:
+            self.segment_cache.put(cache_key, doc)
+        return doc
+
+    def _run_segmenter(self, text: str, method: str, mode: str, with_pos: bool) -> SegmentedDoc:
+        """使用指定的分词器分词（method已解析，不经过缓存），并记录吞吐量"""
+        # 先检查可用性（会触发按需加载），模型加载时间不计入吞吐量
+        if not ((method == 'jieba' or method.startswith('pkuseg') or method == 'thulac')
+                and method in self.segmenters):
+            method = 'basic'
+        if with_pos and method.startswith('pkuseg'):
+            self.backends.get(method.replace('pkuseg_', 'pkuseg_pos_'))
+
+        parallel = self._use_parallel_segment(text, method)
+        # 进程池刚创建时包含启动工作进程的时间，不计入吞吐量
+        measure = not parallel or self._segment_pool is not None
+        start_time = time.perf_counter()
+        if parallel:
+            doc = self._parallel_segment(text, method, mode, with_pos)
+        else:
+            doc = self._segment_in_process(text, method, mode, with_pos)
+        if measure:
+            self.segmenter_policy.record(method, len(text), time.perf_counter() - start_time, with_pos)
+        return doc
+
+    def _segment_in_process(self, text: str, method: str, mode: str, with_pos: bool) -> SegmentedDoc:
+        """在当前进程中分词（method为已加载的分词器或'basic'）"""
+        if method == 'jieba':
             return self._jieba_segment(text, mode, with_pos)
-        elif method.startswith('pkuseg') and method in self.segmenters:
+        elif method.startswith('pkuseg'):
             return self._pkuseg_segment(text, with_pos, method)
-        elif method == 'thulac' and 'thulac' in self.segmenters:
+        elif method == 'thulac':
             return self._thulac_segment(text, with_pos)
-        else:
-            return self._basic_segment(text, with_pos)
+        return self._basic_segment(text, with_pos)
+
+    # 单线程较慢、值得拆分到多个进程的分词器
+    PARALLEL_SEGMENT_METHODS = ('pkuseg', 'thulac')
+
+    # 并行分词时每个分片的最小字符数（分片太小时进程间通信开销超过分词本身）
+    PARALLEL_MIN_PIECE_CHARS = 20_000
+
+    def _use_parallel_segment(self, text: str, method: str) -> bool:
+        """是否把文本拆分到多个进程分词"""
+        return (0 < self.parallel_segment_chars <= len(text)
+                and self.segment_workers > 1
+                and method.startswith(self.PARALLEL_SEGMENT_METHODS)
+                # 只在主进程中并行（工作进程内不再嵌套进程池）
+                and multiprocessing.parent_process() is None)
+
+    def _parallel_segment(self, text: str, method: str, mode: str, with_pos: bool) -> SegmentedDoc:
+        """
+        在句子边界处把长文本拆分为分片，由进程池中的多个分词器并行处理，
+        再按原顺序拼接，偏移转换为全文偏移
+        """
+        # 分片数为进程数的两倍，长短不一的分片也能较均匀地分配
+        piece_chars = max(self.PARALLEL_MIN_PIECE_CHARS, math.ceil(len(text) / (self.segment_workers * 2)))
+        pieces = [(offset, piece, method, mode, with_pos)
+                  for offset, piece in self._split_text(text, piece_chars) if piece.strip()]
+        if len(pieces) <= 1:
+            return self._segment_in_process(text, method, mode, with_pos)
+        return SegmentedDoc.concat(self._map_in_pool(_segment_piece, pieces))
+
+    def _get_segment_pool(self) -> ProcessPoolExecutor:
+        """
+        获取并行/批量分词共用的进程池（首次使用时创建，之后一直复用）
+
+        Web服务是多线程的，fork出的子进程可能继承其他线程持有的锁而死锁，
+        所以使用forkserver（不支持时用spawn）启动工作进程：每个工作进程按同样的
+        部署配置构造自己的处理器，模型在工作进程第一次用到时加载，之后常驻复用
+        """
+        with self._segment_pool_lock:
+            if self._segment_pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                config = {
+                    'profile': self.profile.name,
+                    'memory_budget_mb': self.backends.memory_budget_mb,
+                    'model_cache_dir': self.model_resolver.cache_dir,
+                    'setup': self.segment_worker_setup
+                }
+                self._segment_pool = ProcessPoolExecutor(
+                    max_workers=self.segment_workers, mp_context=context,
+                    initializer=_init_batch_worker, initargs=(config,))
+            return self._segment_pool
+
+    def _map_in_pool(self, func: Callable, items: List) -> List[Any]:
+        """在分词进程池中按顺序处理items；进程池损坏时丢弃，下次使用时重新创建"""
+        pool = self._get_segment_pool()
+        try:
+            return list(pool.map(func, items))
+        except BrokenProcessPool:
+            with self._segment_pool_lock:
+                if self._segment_pool is pool:
+                    self._segment_pool = None
+            pool.shutdown(wait=False)
+            raise
+
+    def shutdown_segment_pool(self) -> None:
+        """关闭分词进程池（之后再使用时会重新创建）"""
+        with self._segment_pool_lock:
+            pool, self._segment_pool = self._segment_pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def select_segmenter(self, text_length: int, with_pos: bool = False) -> Dict:
+        """
+        method='auto' 时选择分词器：在延迟预算内选准确度最高的，都超出预算时选最快的
 
-    def _jieba_segment(self, text: str, mode: str = 'accurate', with_pos: bool = False) -> List[Dict]:
+        Args:
+            text_length: 文本字符数
+            with_pos: 是否词性标注
+
+        Returns:
+            {'method': 分词器, 'reason': 选择理由, 'estimated_ms': 预计耗时,
+             'budget_ms': 延迟预算, 'text_length': 文本长度, 'skipped': [被跳过的分词器及原因]}
+        """
+        return self.segmenter_policy.choose(text_length, lambda name: name in self.segmenters, with_pos)
+
+    def _resolve_segment_method(self, method: str, text_length: int = 0, with_pos: bool = False) -> str:
+        """把'auto'解析为具体的分词器"""
+        if method == 'auto':
+            method = self.select_segmenter(text_length, with_pos)['method']
+        return method
+
+    def segment_batch(self, texts: List[str],
+                      method: str = 'auto',
+                      mode: str = 'accurate',
+                      with_pos: bool = False,
+                      workers: Optional[int] = None) -> List[SegmentedDoc]:
+        """
+        批量分词，把文本分片到进程池中并行处理
+
+        Args:
+            texts: 要分词的文本列表
+            method: 分词方法，同 segment_text
+            mode: 分词模式，同 segment_text
+            with_pos: 是否包含词性标注
+            workers: 工作进程数，None或超过 segment_workers 时为 segment_workers；1表示在当前进程中顺序处理
+
+        Returns:
+            与texts顺序一一对应的分词结果列表
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+
+        # 在父进程中解析分词方法（'auto'按最长的文本选择，保证每篇文本都在延迟预算内）
+        method = self._resolve_segment_method(method, max(len(text) for text in texts), with_pos)
+
+        # 使用共用的进程池，workers只限制分片数，不超过进程池大小
+        workers = min(workers or self.segment_workers, self.segment_workers, len(texts))
+        if workers <= 1:
+            return [self.segment_text(text, method, mode, with_pos) for text in texts]
+
+        # 每个进程分到若干个分片，分片不宜太小，以免进程间通信开销超过分词本身
+        chunk_size = max(1, math.ceil(len(texts) / (workers * 4)))
+        chunks = [(texts[i:i + chunk_size], method, mode, with_pos)
+                  for i in range(0, len(texts), chunk_size)]
+
+        results = []
+        for chunk_result in self._map_in_pool(_segment_chunk, chunks):
+            results.extend(chunk_result)
+        return results
+
+    # 流式分词时允许切分分块的句子边界（不含'.'，避免切开小数和英文缩写）
+    CHUNK_BOUNDARIES = '。！？!?；;\n'
+
+    def segment_file(self, path: str,
+                     method: str = 'auto',
+                     chunk_chars: int = 1_000_000,
+                     mode: str = 'accurate',
+                     with_pos: bool = False,
+                     encoding: str = 'utf-8',
+                     batch: bool = False) -> Iterator[Union[Dict, SegmentedDoc]]:
+        """
+        流式分词：分块读取文件，内存占用与文件大小无关
+
+        分块只在句子边界处切分，不会切开词语；没有句子边界的超长片段
+        依次退回到空白字符处和分块末尾切分。
+
+        Args:
+            path: 文件路径
+            method: 分词方法，同 segment_text
+            chunk_chars: 每个分块的字符数
+            mode: 分词模式，同 segment_text
+            with_pos: 是否包含词性标注
+            encoding: 文件编码
+            batch: False时逐个产出词，True时每个分块产出一个SegmentedDoc
+
+        Yields:
+            {'word': '词', 'pos': '词性', 'start': 起始偏移, 'end': 结束偏移}，
+            或带偏移的SegmentedDoc；偏移为词在整个文件（解码后、不转换换行符）中的字符位置
+        """
+        if chunk_chars <= 0:
+            raise ValueError("chunk_chars必须为正数")
+        # 'auto'按单个分块的长度选择（延迟预算针对每个分块）
+        method = self._resolve_segment_method(method, min(chunk_chars, os.path.getsize(path)), with_pos)
+
+        for offset, chunk in self._read_chunks(path, chunk_chars, encoding):
+            if not chunk.strip():
+                continue
+            doc = self._run_segmenter(chunk, method, mode, with_pos).shifted(offset)
+            if batch:
+                yield doc
+            else:
+                yield from doc
+
+    def _read_chunks(self, path: str, chunk_chars: int, encoding: str) -> Iterator[Tuple[int, str]]:
+        """按句子边界分块读取文件，产出 (分块起始偏移, 分块文本)"""
+        offset = 0
+        buffer = ''
+        with open(path, 'r', encoding=encoding, newline='') as f:
+            while True:
+                data = f.read(chunk_chars)
+                buffer += data
+                if data and len(buffer) < chunk_chars:
+                    continue
+                if not data:
+                    # 文件结束，剩余内容作为最后一个分块
+                    if buffer:
+                        yield offset, buffer
+                    return
+
+                cut = self._boundary_cut(buffer)
+                yield offset, buffer[:cut]
+                offset += cut
+                buffer = buffer[cut:]
+
+    def _split_text(self, text: str, chunk_chars: int) -> Iterator[Tuple[int, str]]:
+        """按句子边界把文本切分为不超过chunk_chars的分块，产出 (分块起始偏移, 分块文本)"""
+        offset = 0
+        while len(text) - offset > chunk_chars:
+            window = text[offset:offset + chunk_chars]
+            cut = self._boundary_cut(window)
+            yield offset, window[:cut]
+            offset += cut
+        if offset < len(text):
+            yield offset, text[offset:]
+
+    @classmethod
+    def _boundary_cut(cls, buffer: str) -> int:
+        """分块的切分位置：最后一个句子边界之后，没有句子边界时依次退回到空白字符和分块末尾"""
+        cut = max(buffer.rfind(char) for char in cls.CHUNK_BOUNDARIES) + 1
+        if cut == 0:
+            # 没有句子边界，退回到最后一个空白字符
+            cut = max(buffer.rfind(' '), buffer.rfind('\t'), buffer.rfind('\u3000')) + 1
+        if cut == 0:
+            cut = len(buffer)
+        return cut
+
+    @staticmethod
+    def _align_offsets(text: str, words: List[str], base: int = 0) -> array:
+        """
+        在原文中定位每个词的起始偏移
+
+        顺序分词结果从上一个词之后查找；全模式/搜索引擎模式产生的重叠词
+        在已扫描的范围内向前查找；找不到（分词器改写了文本）时记为当前位置。
+        """
+        starts = array('q')
+        word_char = re.compile(r'\w')
+        cursor = 0
+        for word in words:
+            start = text.find(word, cursor)
+            # 向后跳过了文字内容，说明是重叠词，优先在已扫描范围内查找
+            if start < 0 or (start > cursor and word_char.search(text, cursor, start)):
+                overlap = text.rfind(word, 0, cursor + len(word) - 1)
+                if overlap >= 0:
+                    start = overlap
+                elif start < 0:
+                    start = cursor
+            starts.append(base + start)
+            cursor = max(cursor, start + len(word))
+        return starts
+
+    def _jieba_segment(self, text: str, mode: str = 'accurate', with_pos: bool = False) -> SegmentedDoc:
         """使用jieba进行分词"""
         try:
             if with_pos:
-                # 带词性标注的分词
+                # 带词性标注的分词（偏移在构造时顺序记录）
                 words = pseg.cut(text)
-                return [{'word': word, 'pos': pos} for word, pos in words if word.strip()]
+                return SegmentedDoc.from_pairs(((word, pos) for word, pos in words if word.strip()), text=text)
+            elif mode == 'full':
+                # 全模式的词互相重叠，按已扫描范围定位偏移
+                words = [word for word in jieba.cut(text, cut_all=True) if word.strip()]
+                return SegmentedDoc.from_words(words).with_offsets(self._align_offsets(text, words))
             else:
-                # 根据模式选择分词方法
-                if mode == 'accurate':
-                    words = jieba.cut(text, cut_all=False)
-                elif mode == 'full':
-                    words = jieba.cut(text, cut_all=True)
-                elif mode == 'search':
-                    words = jieba.cut_for_search(text)
-                else:
-                    words = jieba.cut(text, cut_all=False)
-
-                return [{'word': word} for word in words if word.strip()]
+                # 精确模式和搜索引擎模式由jieba.tokenize直接给出偏移
+                tokenize_mode = 'search' if mode == 'search' else 'default'
+                tokens = jieba.tokenize(text, mode=tokenize_mode)
+                return SegmentedDoc.from_spans((word, start) for word, start, _ in tokens if word.strip())
         except Exception as e:
             print(f"jieba分词失败: {e}")
             return self._basic_segment(text, with_pos)
 
-    def _pkuseg_segment(self, text: str, with_pos: bool = False, model_key: str = 'pkuseg_default') -> List[Dict]:
+    def _pkuseg_segment(self, text: str, with_pos: bool = False, model_key: str = 'pkuseg_default') -> SegmentedDoc:
         """使用pkuseg进行分词"""
         try:
             segmenter = self.segmenters.get(model_key)
@@ -1143,57 +1711,48 @@ class TextProcessor:
                     return self._basic_segment(text, with_pos)
 
             if with_pos:
-                # 使用带词性标注的pkuseg
-                try:
-                    # 创建带词性标注的分词器
-                    pos_segmenter = pkuseg.pkuseg(postag=True)
-                    words_pos = pos_segmenter.cut(text)
-                    return [{'word': word, 'pos': pos} for word, pos in words_pos if word.strip()]
-                except:
-                    # 如果词性标注失败，降级到普通分词
-                    words = segmenter.cut(text)
-                    return [{'word': word, 'pos': 'UNK'} for word in words if word.strip()]
+                # 使用缓存的同领域词性标注分词器，不可用时退回默认词性标注模型
+                pos_segmenter = (self.backends.get(model_key.replace('pkuseg_', 'pkuseg_pos_'))
+                                 or self.backends.get('pkuseg_pos_default'))
+                if pos_segmenter:
+                    try:
+                        words_pos = pos_segmenter.cut(text)
+                        return SegmentedDoc.from_pairs(((word, pos) for word, pos in words_pos if word.strip()),
+                                                       text=text)
+                    except Exception as e:
+                        print(f"pkuseg词性标注失败: {e}")
+
+                # 如果词性标注失败，降级到普通分词
+                words = segmenter.cut(text)
+                return SegmentedDoc.from_words((word for word in words if word.strip()), pos='UNK', text=text)
             else:
                 words = segmenter.cut(text)
-                return [{'word': word} for word in words if word.strip()]
+                return SegmentedDoc.from_words((word for word in words if word.strip()), text=text)
         except Exception as e:
             print(f"pkuseg分词失败: {e}")
             return self._basic_segment(text, with_pos)
 
-    def _thulac_segment(self, text: str, with_pos: bool = False) -> List[Dict]:
+    def _thulac_segment(self, text: str, with_pos: bool = False) -> SegmentedDoc:
         """使用thulac进行分词"""
         try:
             words_pos = self.segmenters['thulac'].cut(text)
             if with_pos:
-                return [{'word': word, 'pos': pos} for word, pos in words_pos if word.strip()]
+                return SegmentedDoc.from_pairs(((word, pos) for word, pos in words_pos if word.strip()), text=text)
             else:
-                return [{'word': word} for word, pos in words_pos if word.strip()]
+                return SegmentedDoc.from_words((word for word, pos in words_pos if word.strip()), text=text)
         except Exception as e:
             print(f"thulac分词失败: {e}")
             return self._basic_segment(text, with_pos)
 
-    def _basic_segment(self, text: str, with_pos: bool = False) -> List[Dict]:
-        """基础分词方法（按标点和空白字符分割）"""
-        # 中文标点符号
-        chinese_punctuation = '，。！？；：""''（）【】《》、""……'
-        # 英文标点符号
-        english_punctuation = string.punctuation
-        all_punctuation = chinese_punctuation + english_punctuation
-
-        # 将标点符号替换为空格
-        for punct in all_punctuation:
-            text = text.replace(punct, ' ')
-
-        # 将换行符也替换为空格
-        text = text.replace('\n', ' ').replace('\r', ' ')
-
-        # 分词（按空白字符分割，并过滤空字符串）
-        words = [word.strip() for word in text.split() if word.strip()]
+    def _basic_segment(self, text: str, with_pos: bool = False) -> SegmentedDoc:
+        """
+        基础分词方法（不依赖分词库）
 
-        if with_pos:
-            return [{'word': word, 'pos': 'UNK'} for word in words]
-        else:
-            return [{'word': word} for word in words]
+        汉字串使用内置词典做双向最大匹配，字母数字串保持完整，
+        标点和空白在同一遍扫描中跳过；分词器直接给出偏移
+        """
+        spans = self.basic_segmenter.tokenize(text)
+        return SegmentedDoc.from_spans(spans, pos='UNK' if with_pos else None)
 
     def extract_entities(self, text: Optional[str] = None, method: str = 'hybrid',
                         deduplicate: bool = True) -> Dict[str, List[Dict]]:
@@ -1219,13 +1778,20 @@ class TextProcessor:
         if not text.strip():
             return {'entities': [], 'available': False, 'model_used': None, 'deduplicated': False}
 
-        # 执行实体识别
-        if method == 'regex':
-            result = self._basic_entity_recognition(text)
-        elif method == 'spacy':
-            result = self._spacy_entity_recognition(text)
-        else:  # method == 'hybrid'
-            result = self._hybrid_entity_recognition(text)
+        # 逐段落执行实体识别（结果按段落缓存，编辑后只重新识别变化的段落），
+        # 再把段落内位置转换为全文位置
+        entities = []
+        model_used = None
+        for offset, paragraph in split_paragraphs(text):
+            paragraph_result = self.paragraph_cache.get(
+                'entities', method, paragraph, self._recognize_paragraph_entities(method))
+            model_used = model_used or paragraph_result['model_used']
+            for entity in paragraph_result['entities']:
+                entity = dict(entity)
+                entity['start'] += offset
+                entity['end'] += offset
+                entities.append(entity)
+        result = {'entities': entities, 'available': True, 'model_used': model_used}
 
         # 如果需要去重
         if deduplicate and result['available'] and result['entities']:
@@ -1236,6 +1802,14 @@ class TextProcessor:
 
         return result
 
+    def _recognize_paragraph_entities(self, method: str):
+        """返回识别单个段落实体的函数"""
+        if method == 'regex':
+            return self._basic_entity_recognition
+        elif method == 'spacy':
+            return self._spacy_entity_recognition
+        return self._hybrid_entity_recognition  # method == 'hybrid'
+
     def _spacy_entity_recognition(self, text: str) -> Dict[str, List[Dict]]:
         """使用spaCy进行实体识别"""
         # 优先使用中文spaCy模型
@@ -1501,9 +2075,9 @@ class TextProcessor:
                 })
 
         # 4. 使用TextBlob进行情感分析
-        if TEXTBLOB_AVAILABLE:
+        if 'textblob' in self.nlp_models:
             try:
-                blob = TextBlob(text)
+                blob = self.nlp_models['textblob'](text)
                 polarity = blob.sentiment.polarity
                 subjectivity = blob.sentiment.subjectivity
 
@@ -1584,15 +2158,13 @@ class TextProcessor:
         ]
 
         for model_key in dl_models:
+            if model_key in ['bert_base_chinese', 'chinese_bert_wwm', 'chinese_roberta_wwm_ext']:
+                # 需要微调的通用模型（暂时跳过，也不触发加载）
+                continue
             if model_key in self.nlp_models:
                 try:
-                    if model_key in ['bert_base_chinese', 'chinese_bert_wwm', 'chinese_roberta_wwm_ext']:
-                        # 处理需要微调的通用模型（暂时跳过）
-                        print(f"跳过未微调的模型: {model_key}")
-                        continue
-                    else:
-                        # 处理预训练的情感分析模型
-                        dl_result = self._predict_with_pipeline(text, model_key)
+                    # 处理预训练的情感分析模型
+                    dl_result = self._predict_with_pipeline(text, model_key)
 
                     if dl_result['available']:
                         result.update(dl_result)
@@ -1660,7 +2232,8 @@ class TextProcessor:
                     'model_details': {model_key: {
                         'best_prediction': best_pred,
                         'all_predictions': predictions,
-                        'model_type': 'transformer_pipeline'
+                        'model_type': 'transformer_pipeline',
+                        'quantized': self._is_quantized(model_key)
                     }}
                 }
 
@@ -1693,7 +2266,7 @@ class TextProcessor:
             return result
 
         try:
-            snow = SnowNLP(text)
+            snow = snownlp.SnowNLP(text)
             sentiment_score = snow.sentiments  # 返回0-1之间的值，>0.5为积极
 
             # 确定情感倾向（调整阈值，让判断更敏感）
@@ -1758,12 +2331,9 @@ class TextProcessor:
         # 预处理文本
         text_clean = text.strip()
 
-        # 使用jieba分词（如果可用）
-        if JIEBA_AVAILABLE:
-            try:
-                words = list(jieba.cut(text_clean))
-            except:
-                words = text_clean.split()
+        # 使用jieba分词（如果可用且部署配置允许），结果与其他功能共用分词缓存
+        if 'jieba' in self.segmenters:
+            words = self.segment_text(text_clean, method='jieba').words
         else:
             # 简单的中文分词（按字符和标点分割）
             import re
@@ -2075,9 +2645,9 @@ class TextProcessor:
         total_sentences = len(sentences)
 
         sentence_scores = []
-        for i, sentence in enumerate(sentences):
+        word_lists = self._sentence_word_lists(sentences)
+        for i, (sentence, words) in enumerate(zip(sentences, word_lists)):
             # 基础词频分数
-            words = sentence.lower().translate(str.maketrans('', '', string.punctuation)).split()
             freq_score = sum(word_freq.get(word, 0) for word in words)
 
             # 位置权重
@@ -2164,24 +2734,28 @@ class TextProcessor:
 
     def get_nlp_capabilities(self) -> Dict:
         """获取当前可用的NLP功能"""
-        # 检查可用的情感分析方法
+        # 检查可用的情感分析方法（只检查注册状态，不触发模型加载）
+        available = self.backends.is_available
         sentiment_methods = []
-        if self.nlp_models.get('vader'):
+        if available('vader'):
             sentiment_methods.append('vader')
-        if TEXTBLOB_AVAILABLE:
+        if available('textblob'):
             sentiment_methods.append('textblob')
-        if self.nlp_models.get('snownlp'):
+        if available('snownlp'):
             sentiment_methods.append('snownlp')
 
         # 检查深度学习模型
-        dl_models = ['erlangshen_roberta_330m', 'erlangshen_roberta_110m', 'chinese_roberta_wwm_ext']
-        available_dl_models = [model for model in dl_models if model in self.nlp_models]
+        dl_models = ['uer_roberta_dianping', 'erlangshen_roberta_330m', 'erlangshen_roberta_110m', 'chinese_roberta_wwm_ext']
+        available_dl_models = [model for model in dl_models if available(model)]
         if available_dl_models:
             sentiment_methods.extend(available_dl_models)
 
         # 基础方法总是可用
         sentiment_methods.append('basic_dictionary')
 
+        # Qwen3以熔断器状态为准（不发起探测）
+        qwen3_available = bool(self.qwen3_monitor) and self.qwen3_monitor.breaker.state != 'open'
+
         return {
             'entity_recognition': {
                 'available': True,
@@ -2193,20 +2767,162 @@ class TextProcessor:
             },
             'syntax_analysis': {
                 'available': True,
-                'methods': ['basic'] + ([model for model in ['stanza_zh', 'stanza_en'] if model in self.nlp_models])
+                'methods': ['basic'] + ([model for model in ['stanza_zh', 'stanza_en'] if available(model)])
             },
             'enhanced_summary': True,
             'textteaser_summary': bool(self.textteaser),
-            'qwen3_summary': bool(self.qwen3_client),
+            'qwen3_summary': qwen3_available,
             'intelligent_rewrite': True,
-            'qwen3_rewrite': bool(self.qwen3_client),
-            'advanced_entity_recognition': bool(self.nlp_models.get('spacy_zh') or self.nlp_models.get('spacy_en')),
+            'qwen3_rewrite': qwen3_available,
+            'qwen3_health': self.qwen3_monitor.get_status() if self.qwen3_monitor else None,
+            'advanced_entity_recognition': available('spacy_zh') or available('spacy_en'),
             'advanced_sentiment_analysis': len(sentiment_methods) > 1,
-            'advanced_syntax_analysis': bool(self.nlp_models.get('stanza_zh') or self.nlp_models.get('stanza_en'))
+            'advanced_syntax_analysis': available('stanza_zh') or available('stanza_en'),
+            'profile': self.profile.to_dict(),
+            'libraries': dict(LIBRARY_AVAILABILITY),
+            'backends': self.backends.get_stats(),
+            'model_artifacts': self.model_resolver.report(
+                [name for name in self.backends.registered_names() if name in MODEL_ARTIFACTS]),
+            'model_memory': self.backends.get_memory_stats(),
+            'segment_cache': self.segment_cache.get_stats(),
+            'paragraph_cache': self.paragraph_cache.get_stats(),
+            'auto_segmenter': self.segmenter_policy.get_stats()
         }
 
+    # 预热使用的代表性文本
+    WARMUP_TEXT_ZH = "人工智能技术在医疗领域的应用越来越广泛，这个产品的体验非常好。"
+    WARMUP_TEXT_EN = "The new product works well and the service was excellent."
+
+    def warmup_names(self) -> List[str]:
+        """
+        默认预热的后端：环境变量 NLP_WARMUP_BACKENDS（逗号分隔）或部署配置的 warmup 列表，
+        只保留已注册（已安装且配置允许）的后端
+        """
+        configured = os.environ.get('NLP_WARMUP_BACKENDS')
+        names = ([name.strip() for name in configured.split(',') if name.strip()]
+                 if configured is not None else self.profile.warmup)
+        return [name for name in dict.fromkeys(names) if self.backends.is_registered(name)]
+
+    def warmup(self, names: Optional[List[str]] = None) -> Dict:
+        """
+        预热模型：加载后端并执行一次代表性推理，
+        把图构建、JIT编译和内存分配的开销从第一个请求中移出
+
+        设置了内存预算时，已知占用会超出预算的后端不加载；某次加载导致其他模型被卸载后，
+        预算已用完，剩余的后端也跳过（状态为skipped），避免预热时互相卸载。
+
+        Args:
+            names: 要预热的后端名称，None表示 warmup_names()
+
+        Returns:
+            预热状态，格式同 get_warmup_status()
+        """
+        if names is None:
+            names = self.warmup_names()
+
+        with self._warmup_lock:
+            self._warmup_state = {
+                'state': 'warming',
+                'started_at': time.time(),
+                'duration': None,
+                'models': {name: {'state': 'loading', 'load_time': None,
+                                  'warmup_time': None, 'error': None} for name in names}
+            }
+        start_time = time.perf_counter()
+        # 请求路径不等待健康探测，在预热时拿到首个结果，就绪后的第一个请求就能使用Qwen3
+        if self.qwen3_monitor:
+            self.qwen3_monitor.wait_first_check()
+        budget = self.backends.memory_budget_mb
+        evictions = self.backends.get_memory_stats()['evictions']
+        budget_exhausted = False
+
+        for name in names:
+            model_state = self._warmup_state['models'][name]
+            if budget is not None and not self.backends.is_loaded(name):
+                used = self.backends.memory_usage_mb()
+                footprint = self.backends.get_stats().get(name, {}).get('memory_mb') or 0.0
+                if budget_exhausted or used + footprint > budget:
+                    model_state['state'] = 'skipped'
+                    model_state['error'] = f"超出内存预算（已用 {used:.0f}MB / 预算 {budget:.0f}MB）"
+                    continue
+
+            load_start = time.perf_counter()
+            instance = self.backends.get(name)
+            model_state['load_time'] = round(time.perf_counter() - load_start, 4)
+
+            if instance is None:
+                model_state['state'] = 'failed'
+                model_state['error'] = self.backends.get_stats().get(name, {}).get('error') or '不可用'
+                continue
+
+            inference_start = time.perf_counter()
+            try:
+                self._warmup_backend(name, instance)
+                model_state['state'] = 'warm'
+            except Exception as e:
+                model_state['state'] = 'failed'
+                model_state['error'] = str(e)
+            model_state['warmup_time'] = round(time.perf_counter() - inference_start, 4)
+
+            if self.backends.get_memory_stats()['evictions'] > evictions:
+                budget_exhausted = True
+
+        self._warmup_state['duration'] = round(time.perf_counter() - start_time, 4)
+        self._warmup_state['state'] = 'complete'
+
+        warm = sum(1 for info in self._warmup_state['models'].values() if info['state'] == 'warm')
+        print(f"✓ 模型预热完成: {warm}/{len(names)} 个后端，耗时 {self._warmup_state['duration']:.2f}s")
+        return self.get_warmup_status()
+
+    def _warmup_backend(self, name: str, instance) -> None:
+        """对单个后端执行一次代表性推理，失败时抛出异常"""
+        text_zh, text_en = self.WARMUP_TEXT_ZH, self.WARMUP_TEXT_EN
+
+        if name == 'jieba':
+            list(jieba.cut(text_zh))
+            list(pseg.cut(text_zh))
+        elif name.startswith('pkuseg') or name == 'thulac':
+            instance.cut(text_zh)
+        elif name == 'vader':
+            instance.polarity_scores(text_en)
+        elif name == 'textblob':
+            instance(text_en).sentiment
+        elif name == 'snownlp':
+            snownlp.SnowNLP(text_zh).sentiments
+        elif name.startswith('spacy') or name.startswith('stanza'):
+            instance(text_zh if name.endswith('_zh') else text_en)
+        elif callable(instance):
+            # transformers情感分析pipeline
+            instance(text_zh)
+
+    def get_warmup_status(self) -> Dict:
+        """
+        获取预热状态
+
+        Returns:
+            {'state': 'pending'|'warming'|'complete', 'ready': bool, 'duration': 秒,
+             'models': {名称: {'state': 'loading'|'warm'|'failed'|'skipped', 'load_time', 'warmup_time', 'error'}}}
+        """
+        with self._warmup_lock:
+            state = self._warmup_state
+            return {
+                'state': state['state'],
+                'ready': state['state'] == 'complete',
+                'started_at': state['started_at'],
+                'duration': state['duration'],
+                'models': {name: dict(info) for name, info in state['models'].items()}
+            }
+
+    def is_ready(self) -> bool:
+        """预热是否已完成（加载失败的后端会退回到其他方法，不影响就绪）"""
+        return self._warmup_state['state'] == 'complete'
+
     def _qwen3_rewrite(self, style: str, intensity: str) -> str:
         """使用Qwen3模型进行智能改写"""
+        if not self.qwen3_client:
+            # Qwen3不可用（熔断器打开）时直接降级，不等待请求超时
+            return self._basic_rewrite(style, intensity)
+
         try:
             # 读取提示词文件
             prompt_content = self._load_rewrite_prompt()
@@ -2261,10 +2977,7 @@ class TextProcessor:
 
             # 调用Qwen3模型API
             headers = {'Content-type': 'application/json'}
-            response = requests.post(self.qwen3_api_url,
-                                   data=json.dumps(data),
-                                   headers=headers,
-                                   timeout=60)
+            response = self._post_qwen3(data, headers)
 
             if response.status_code == 200:
                 response_data = response.json()
@@ -2639,10 +3352,7 @@ class TextProcessor:
 
             # 调用Qwen3模型API
             headers = {'Content-type': 'application/json'}
-            response = requests.post(self.qwen3_api_url,
-                                   data=json.dumps(data),
-                                   headers=headers,
-                                   timeout=60)
+            response = self._post_qwen3(data, headers)
 
             if response.status_code == 200:
                 response_data = response.json()
@@ -2720,19 +3430,6 @@ class TextProcessor:
             print(f"加载提示词文件失败: {e}")
             return "你是一位语言风格专家，请根据用户要求对文本进行改写。"
 
-    def _is_offline_mode(self) -> bool:
-        """检测是否处于离线模式（无法连接到huggingface.co）"""
-        try:
-            import urllib.request
-            import socket
-
-            # 尝试连接huggingface.co，超时时间设为3秒
-            socket.setdefaulttimeout(3)
-            urllib.request.urlopen('https://huggingface.co', timeout=3)
-            return False  # 能连接，不是离线模式
-        except Exception:
-            return True   # 无法连接，是离线模式
-
     def get_text_stats(self) -> Dict[str, any]:
         """
         获取文本统计信息
@@ -2772,3 +3469,32 @@ class TextProcessor:
             stats['平均句子长度'] = round(stats['字符总数'] / stats['句子数'], 2)
 
         return stats
+
+
+# 批量分词的工作进程状态（每个进程一个处理器实例）
+_batch_processor = None
+
+
+def _init_batch_worker(config: Dict) -> None:
+    """进程池初始化：按父进程的部署配置构造处理器（工作进程内不缓存分词结果、不再并行）"""
+    global _batch_processor
+    _batch_processor = TextProcessor(memory_budget_mb=config['memory_budget_mb'],
+                                     profile=config['profile'],
+                                     model_cache_dir=config['model_cache_dir'],
+                                     segment_cache_mb=0,
+                                     parallel_segment_chars=0)
+    if config['setup'] is not None:
+        config['setup'](_batch_processor)
+
+
+def _segment_chunk(args) -> List[SegmentedDoc]:
+    """在工作进程中对一个分片分词"""
+    texts, method, mode, with_pos = args
+    return [_batch_processor.segment_text(text, method, mode, with_pos) for text in texts]
+
+
+def _segment_piece(args) -> SegmentedDoc:
+    """在工作进程中对长文本的一个分片分词，偏移转换为全文偏移"""
+    offset, text, method, mode, with_pos = args
+    _batch_processor._refresh_user_dict(method)
+    return _batch_processor._run_segmenter(text, method, mode, with_pos).shifted(offset)
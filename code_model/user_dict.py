@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+用户词典模块
+按部署配置管理领域词汇，增量应用到jieba词典（不重新初始化），
+并把包含用户词汇的前缀词典编译结果持久化，新工作进程启动时直接加载
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# 默认用户词典目录（项目根目录下的user_dicts）
+DEFAULT_USER_DICT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'user_dicts')
+
+# 检查词典文件是否被其他进程修改的最小间隔（秒）
+REFRESH_INTERVAL = 2.0
+
+# 编译缓存格式版本，格式变化时使旧缓存失效
+CACHE_FORMAT = 1
+
+
+def _default_cache_dir() -> str:
+    """编译缓存目录：当前用户的缓存目录下的应用子目录（遵循XDG_CACHE_HOME约定）"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'nlp_process_demo')
+
+
+def parse_dict_lines(lines: Iterable[str]) -> List[Tuple[str, Optional[int], Optional[str]]]:
+    """
+    解析jieba用户词典格式：每行 "词语 [词频] [词性]"，#开头为注释
+
+    Returns:
+        [(词, 词频或None, 词性或None), ...]
+    """
+    terms = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split()
+        word, freq, tag = parts[0], None, None
+        for part in parts[1:3]:
+            if part.isdigit():
+                freq = int(part)
+            else:
+                tag = part
+        terms.append((word, freq, tag))
+    return terms
+
+
+class UserDictionary:
+    """
+    用户词典
+
+    词汇保存在 <词典目录>/<部署配置>.json 中，格式为 {词: [词频, 词性]}，
+    词频为0表示从词典中删除（强制切分）。修改通过jieba的add_word/del_word
+    增量应用，不会重建前缀词典；每次修改后把完整的前缀词典（FREQ、total）
+    用marshal写入缓存文件，新进程指纹匹配时直接加载，跳过jieba.initialize()。
+
+    多个工作进程共用同一个词典文件：某个进程修改后，其他进程在分词时
+    发现文件变化，按差异增量应用。
+    """
+
+    def __init__(self, profile: str = 'full',
+                 storage_dir: Optional[str] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Args:
+            profile: 部署配置名称，每个配置使用独立的词典
+            storage_dir: 词典目录，默认读取环境变量 NLP_USER_DICT_DIR，未设置则为项目根目录下的user_dicts
+            cache_dir: 编译缓存目录，默认读取环境变量 NLP_USER_DICT_CACHE_DIR，
+                未设置则为 ~/.cache/nlp_process_demo（缓存用marshal加载，不能放在所有用户可写的目录）
+        """
+        storage_dir = storage_dir or os.environ.get('NLP_USER_DICT_DIR') or DEFAULT_USER_DICT_DIR
+        cache_dir = cache_dir or os.environ.get('NLP_USER_DICT_CACHE_DIR') or _default_cache_dir()
+        self.profile = profile
+        self.path = os.path.join(storage_dir, f'{profile}.json')
+        self.cache_path = os.path.join(cache_dir, f'nlp_jieba_userdict_{profile}.cache')
+
+        self._terms = self._read_terms()   # {词: [词频, 词性]}
+        self._mtime = self._file_mtime()
+        self._tokenizer = None             # 已应用词典的jieba分词器
+        # 已应用的词汇（内置分词器按当前词汇构建，未加载jieba时也需要据此发现文件变化）
+        self._applied = {word: list(value) for word, value in self._terms.items()}
+        self._last_check = time.monotonic()
+        self._lock = threading.RLock()
+
+    # ---------- 词典文件 ----------
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _read_terms(self) -> Dict[str, List]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return {word: list(value) for word, value in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_terms(self) -> None:
+        """原子写入词典文件，避免其他进程读到写了一半的文件"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._terms, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+        self._mtime = self._file_mtime()
+
+    # ---------- 编译缓存 ----------
+
+    def _fingerprint(self, tokenizer) -> str:
+        """缓存指纹：主词典 + 用户词汇，任一变化都会使缓存失效"""
+        content = json.dumps([CACHE_FORMAT, repr(getattr(tokenizer, 'dictionary', None)),
+                              sorted(self._terms.items())], ensure_ascii=False)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def _load_compiled(self, tokenizer) -> bool:
+        """加载编译缓存，指纹不匹配或缓存损坏时返回False"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                fingerprint, freq, total, tags = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if fingerprint != self._fingerprint(tokenizer):
+            return False
+
+        with tokenizer.lock:
+            tokenizer.FREQ, tokenizer.total = freq, total
+            tokenizer.user_word_tag_tab.update(tags)
+            tokenizer.initialized = True
+        # 强制切分的词不在前缀词典中，需要重新登记
+        for word, (word_freq, _) in self._terms.items():
+            if word_freq == 0:
+                tokenizer.add_word(word, 0)
+        return True
+
+    def _save_compiled(self, tokenizer) -> None:
+        """把当前前缀词典写入编译缓存（原子替换）"""
+        tags = {word: tag for word, (_, tag) in self._terms.items() if tag}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), mode=0o700, exist_ok=True)
+            temp_path = f'{self.cache_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as f:
+                marshal.dump((self._fingerprint(tokenizer), tokenizer.FREQ, tokenizer.total, tags), f)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"用户词典缓存写入失败: {e}")
+
+    # ---------- 应用到分词器 ----------
+
+    def attach(self, tokenizer) -> bool:
+        """
+        把用户词典应用到jieba分词器（如 jieba.dt）
+
+        Returns:
+            是否直接从编译缓存加载
+        """
+        with self._lock:
+            from_cache = self._load_compiled(tokenizer)
+            if not from_cache:
+                tokenizer.initialize()
+                for word, (freq, tag) in self._terms.items():
+                    tokenizer.add_word(word, freq, tag)
+                if self._terms:
+                    self._save_compiled(tokenizer)
+
+            self._tokenizer = tokenizer
+            self._applied = {word: list(value) for word, value in self._terms.items()}
+            return from_cache
+
+    def _apply(self, changes: Dict[str, List]) -> None:
+        """增量应用变化的词汇到已加载的分词器"""
+        for word, (freq, tag) in changes.items():
+            if self._tokenizer is not None:
+                if freq == 0:
+                    self._tokenizer.del_word(word)
+                else:
+                    self._tokenizer.add_word(word, freq, tag)
+            self._applied[word] = [freq, tag]
+
+    def _commit(self, changes: Dict[str, List]) -> int:
+        """保存修改、增量应用并更新编译缓存"""
+        changes = {word: value for word, value in changes.items() if self._terms.get(word) != value}
+        if not changes:
+            return 0
+        self._terms.update(changes)
+        self._write_terms()
+        self._apply(changes)
+        if self._tokenizer is not None:
+            self._save_compiled(self._tokenizer)
+        return len(changes)
+
+    # ---------- 词汇管理 ----------
+
+    def add_words(self, words: Iterable[Union[str, Dict, Tuple]]) -> int:
+        """
+        添加词汇
+
+        Args:
+            words: 词列表，元素可以是 '词'、{'word': '词', 'freq': 词频, 'tag': '词性'}
+                或 (词, 词频, 词性)
+
+        Returns:
+            实际变化的词数
+        """
+        changes = {}
+        for item in words:
+            if isinstance(item, str):
+                word, freq, tag = item, None, None
+            elif isinstance(item, dict):
+                word, freq, tag = item.get('word', ''), item.get('freq'), item.get('tag')
+            else:
+                word, freq, tag = (tuple(item) + (None, None))[:3]
+            word = str(word).strip()
+            if word:
+                changes[word] = [int(freq) if freq is not None else None, tag or None]
+
+        with self._lock:
+            return self._commit(changes)
+
+    def remove_words(self, words: Iterable[str]) -> int:
+        """删除词汇（包括jieba自带词典中的词，删除后该词会被强制切分）"""
+        with self._lock:
+            return self._commit({word.strip(): [0, None] for word in words if word.strip()})
+
+    def load_file(self, path: str, encoding: str = 'utf-8') -> int:
+        """批量导入jieba用户词典格式的文件"""
+        with open(path, 'r', encoding=encoding) as f:
+            return self.add_words(parse_dict_lines(f))
+
+    def get_words(self) -> Dict[str, List[Dict]]:
+        """获取用户词汇和已删除的词"""
+        with self._lock:
+            words = [{'word': word, 'freq': freq, 'tag': tag}
+                     for word, (freq, tag) in sorted(self._terms.items()) if freq != 0]
+            removed = sorted(word for word, (freq, _) in self._terms.items() if freq == 0)
+            return {'words': words, 'removed': removed}
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        检查词典文件是否被其他进程修改，有变化时增量应用
+
+        从文件中移除的条目在jieba中删除（del_word）；内置分词器由调用方重建，
+        重建后不再包含这些词。
+
+        Returns:
+            是否应用了变化（调用方据此清空分词缓存）
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < REFRESH_INTERVAL:
+            return False
+        self._last_check = now
+
+        mtime = self._file_mtime()
+        if mtime == self._mtime:
+            return False
+
+        with self._lock:
+            self._mtime = mtime
+            terms = self._read_terms()
+            changes = {word: value for word, value in terms.items() if self._applied.get(word) != value}
+            # 词典文件中被移除的条目：从分词器中删除，不再记为已应用
+            removed = set(self._applied) - set(terms)
+            for word in removed:
+                changes[word] = [0, None]
+            self._terms = terms
+            self._apply(changes)
+            for word in removed:
+                self._applied.pop(word, None)
+            return bool(changes)
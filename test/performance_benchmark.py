@@ -126,7 +126,7 @@ class PerformanceBenchmark:
             )
     
     def test_segmentation_performance(self):
-        """测试分词性能"""
+        """测试分词性能（按文本长度的吞吐、延迟分位数和F1对比见 segmentation_benchmark.py）"""
         print("\n=== 分词性能测试 ===")
         
         # 准备测试文本
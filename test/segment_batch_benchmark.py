@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量分词吞吐基准测试 - 对比 segment_batch 在1/2/4/8个工作进程下的吞吐（词/秒）
+语料由 TestDataGenerator 的分词和摘要测试数据重复构造
+"""
+
+import sys
+import os
+import time
+
+# 添加父目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from code_model.text_tools import TextProcessor
+from test_data_generator import TestDataGenerator
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def build_corpus(repeat: int) -> list:
+    """构造批量分词语料"""
+    generator = TestDataGenerator()
+    texts = [text for _, text in generator.generate_segmentation_test_data()]
+    texts += [text for _, text, _ in generator.generate_summary_test_data()]
+    return texts * repeat
+
+
+def benchmark(processor: TextProcessor, texts: list, method: str, workers: int) -> dict:
+    """对一种工作进程数测量吞吐"""
+    start_time = time.perf_counter()
+    results = processor.segment_batch(texts, method=method, workers=workers)
+    elapsed = time.perf_counter() - start_time
+
+    tokens = sum(len(tokens) for tokens in results)
+    return {
+        'elapsed': elapsed,
+        'tokens': tokens,
+        'tokens_per_sec': tokens / max(elapsed, 1e-9),
+        'results': results
+    }
+
+
+def main(repeat: int = 2000):
+    processor = TextProcessor()
+    texts = build_corpus(repeat)
+    chars = sum(len(text) for text in texts)
+
+    print("=" * 64)
+    print(f"segment_batch 吞吐对比（{len(texts)} 篇文本，{chars / 1e6:.2f}M 字符，CPU核数 {os.cpu_count()}）")
+    print("=" * 64)
+
+    for method in ['jieba', 'pkuseg_default', 'basic']:
+        if method != 'basic' and method not in processor.segmenters:
+            print(f"{method}: 不可用，跳过")
+            continue
+
+        print(f"\n分词器: {method}")
+        print(f"{'进程数':<8}{'耗时(s)':>10}{'词数':>12}{'词/秒':>14}{'加速比':>10}")
+        baseline = None
+        for workers in WORKER_COUNTS:
+            result = benchmark(processor, texts, method, workers)
+            if baseline is None:
+                baseline = result
+            assert result['results'] == baseline['results'], "并行结果应与顺序结果一致"
+            speedup = result['tokens_per_sec'] / baseline['tokens_per_sec']
+            print(f"{workers:<8}{result['elapsed']:>10.2f}{result['tokens']:>12}"
+                  f"{result['tokens_per_sec']:>14.0f}{speedup:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+词性标注分词基准测试 - 对比 /api/segment_text (with_pos=true) 在
+每次请求重建pkuseg模型（旧实现）与缓存模型（新实现）下的延迟
+"""
+
+import sys
+import os
+import time
+import statistics
+
+# 添加父目录和web_application目录到路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, 'web_application'))
+
+SAMPLE_TEXT = "人工智能技术在医疗领域的应用越来越广泛，机器学习帮助医生更快地诊断疾病。"
+
+
+def summarize(timings):
+    """计算延迟统计（毫秒）"""
+    timings = sorted(timings)
+    return {
+        'p50': statistics.median(timings) * 1000,
+        'p95': timings[min(int(len(timings) * 0.95), len(timings) - 1)] * 1000,
+        'mean': statistics.mean(timings) * 1000
+    }
+
+
+def benchmark_rebuild_per_call(rounds: int):
+    """旧实现：每次请求都 pkuseg.pkuseg(postag=True) 重新加载模型"""
+    import pkuseg
+
+    timings = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        segmenter = pkuseg.pkuseg(postag=True)
+        [{'word': word, 'pos': pos} for word, pos in segmenter.cut(SAMPLE_TEXT) if word.strip()]
+        timings.append(time.perf_counter() - start_time)
+    return timings
+
+
+def benchmark_endpoint(rounds: int, method: str):
+    """新实现：通过 /api/segment_text 调用缓存的词性标注分词器"""
+    from web_backend import app
+
+    client = app.test_client()
+    payload = {'text': SAMPLE_TEXT, 'method': method, 'with_pos': True}
+
+    # 第一次请求包含模型加载
+    start_time = time.perf_counter()
+    response = client.post('/api/segment_text', json=payload)
+    cold = time.perf_counter() - start_time
+    assert response.get_json()['success']
+
+    timings = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        client.post('/api/segment_text', json=payload)
+        timings.append(time.perf_counter() - start_time)
+    return cold, timings
+
+
+def main(rounds: int = 20):
+    print("=" * 60)
+    print("/api/segment_text with_pos=true 延迟对比")
+    print("=" * 60)
+
+    try:
+        import pkuseg  # noqa: F401
+    except ImportError:
+        print("pkuseg不可用，无法运行此基准测试")
+        return
+
+    before = summarize(benchmark_rebuild_per_call(rounds))
+    print(f"每次重建模型: p50 {before['p50']:.1f}ms, p95 {before['p95']:.1f}ms")
+
+    for method in ['pkuseg_default', 'pkuseg_news']:
+        cold, timings = benchmark_endpoint(rounds, method)
+        after = summarize(timings)
+        print(f"缓存模型 {method}: 首次 {cold * 1000:.1f}ms, "
+              f"p50 {after['p50']:.1f}ms, p95 {after['p95']:.1f}ms, "
+              f"加速 {before['p50'] / max(after['p50'], 1e-6):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
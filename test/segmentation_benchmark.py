@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分词速度/准确度基准测试 - 对比 jieba（各模式）、pkuseg、thulac、basic
+
+对每个分词器和模式：
+  - 在100字符到10M字符的文本上测量吞吐（词/秒）、峰值内存（RSS）和单次调用的 p50/p95/p99 延迟
+  - 用 TestDataGenerator.generate_segmentation_reference_data 的参考切分计算F1
+  - 输出速度-准确度的帕累托表（★为帕累托最优）
+
+每个分词器在独立的子进程中运行，峰值内存互不影响；语料由测试数据按固定顺序重复构造，
+关闭分词缓存，结果可复现。
+
+用法:
+    python test/segmentation_benchmark.py
+    python test/segmentation_benchmark.py --sizes 100 10000 1000000 --methods jieba basic --json result.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+# 添加父目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from code_model.segmented_doc import SegmentedDoc
+from test_data_generator import TestDataGenerator
+
+# (分词器, 模式)，模式只对jieba有效
+CONFIGS = [
+    ('jieba', 'accurate'),
+    ('jieba', 'search'),
+    ('jieba', 'full'),
+    ('pkuseg_default', 'accurate'),
+    ('thulac', 'accurate'),
+    ('basic', 'accurate'),
+]
+
+SIZES = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# 每个文本长度的测量次数：至少MIN_CALLS次，累计耗时达到TARGET_SECONDS后停止（最多MAX_CALLS次）
+MIN_CALLS = 3
+MAX_CALLS = 200
+TARGET_SECONDS = 2.0
+
+WORD_CHAR = re.compile(r'\w')
+
+
+def build_text(size: int) -> str:
+    """按固定顺序重复测试数据，构造指定长度的文本"""
+    generator = TestDataGenerator()
+    paragraphs = [text for _, text in generator.generate_segmentation_test_data()]
+    paragraphs += [text for _, text, _ in generator.generate_summary_test_data()]
+    unit = '\n'.join(paragraphs) + '\n'
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def peak_rss_mb() -> float:
+    """当前进程的峰值常驻内存（MB）"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux以KB为单位，macOS以字节为单位
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        from code_model.backend_registry import get_process_rss_mb
+        return get_process_rss_mb() or 0.0
+
+
+def percentile(values: list, q: float) -> float:
+    """最近秩法百分位数"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _spans(doc: SegmentedDoc) -> set:
+    """分词结果的 (起始, 结束) 集合，不含纯标点的词"""
+    return {(start, start + len(word)) for word, start in zip(doc.words, doc.starts)
+            if WORD_CHAR.search(word)}
+
+
+def segmentation_f1(processor, method: str, mode: str) -> dict:
+    """按参考切分计算词级别的准确率、召回率和F1（所有句子合并计算）"""
+    correct = predicted = expected = 0
+    for _, text, reference in TestDataGenerator().generate_segmentation_reference_data():
+        doc = processor.segment_text(text, method=method, mode=mode)
+        predicted_spans = _spans(doc)
+        reference_spans = _spans(SegmentedDoc.from_words(reference, text=text))
+        correct += len(predicted_spans & reference_spans)
+        predicted += len(predicted_spans)
+        expected += len(reference_spans)
+
+    precision = correct / predicted if predicted else 0.0
+    recall = correct / expected if expected else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'precision': precision, 'recall': recall, 'f1': f1}
+
+
+def run_config(method: str, mode: str, sizes: list) -> dict:
+    """在子进程中测量一个分词器/模式（按长度从小到大，峰值内存随之单调）"""
+    from code_model.text_tools import TextProcessor
+
+    processor = TextProcessor(segment_cache_mb=0)
+    if method != 'basic' and method not in processor.segmenters:
+        return {'method': method, 'mode': mode, 'available': False}
+
+    result = {
+        'method': method,
+        'mode': mode,
+        'available': True,
+        'accuracy': segmentation_f1(processor, method, mode),
+        'sizes': []
+    }
+
+    for size in sizes:
+        text = build_text(size)
+        latencies = []
+        tokens = 0
+        while len(latencies) < MAX_CALLS:
+            start_time = time.perf_counter()
+            doc = processor.segment_text(text, method=method, mode=mode)
+            latencies.append(time.perf_counter() - start_time)
+            tokens += len(doc)
+            if len(latencies) >= MIN_CALLS and sum(latencies) >= TARGET_SECONDS:
+                break
+
+        result['sizes'].append({
+            'chars': size,
+            'calls': len(latencies),
+            'tokens_per_sec': tokens / max(sum(latencies), 1e-9),
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'peak_rss_mb': peak_rss_mb()
+        })
+    return result
+
+
+def pareto_front(results: list) -> set:
+    """速度（最大文本长度下的词/秒）和F1都不被其他配置同时超过的配置"""
+    points = {(r['method'], r['mode']): (r['sizes'][-1]['tokens_per_sec'], r['accuracy']['f1'])
+              for r in results}
+    front = set()
+    for key, (speed, f1) in points.items():
+        dominated = any(other_speed >= speed and other_f1 >= f1 and (other_speed, other_f1) != (speed, f1)
+                        for other_key, (other_speed, other_f1) in points.items() if other_key != key)
+        if not dominated:
+            front.add(key)
+    return front
+
+
+def print_report(results: list) -> None:
+    available = [r for r in results if r['available']]
+    for r in results:
+        if not r['available']:
+            print(f"\n{r['method']}: 不可用，跳过")
+
+    for r in available:
+        print(f"\n分词器: {r['method']} ({r['mode']})")
+        print(f"{'字符数':>10}{'调用次数':>8}{'词/秒':>14}{'p50(ms)':>11}{'p95(ms)':>11}{'p99(ms)':>11}{'峰值RSS(MB)':>13}")
+        for row in r['sizes']:
+            print(f"{row['chars']:>10}{row['calls']:>8}{row['tokens_per_sec']:>14.0f}"
+                  f"{row['p50_ms']:>11.2f}{row['p95_ms']:>11.2f}{row['p99_ms']:>11.2f}{row['peak_rss_mb']:>13.1f}")
+
+    if not available:
+        return
+    front = pareto_front(available)
+    print("\n" + "=" * 72)
+    print(f"速度-准确度帕累托表（速度取 {available[0]['sizes'][-1]['chars']} 字符文本的吞吐，★为帕累托最优）")
+    print("=" * 72)
+    print(f"{'':<2}{'分词器':<18}{'模式':<10}{'F1':>8}{'准确率':>8}{'召回率':>8}{'词/秒':>14}{'峰值RSS(MB)':>13}")
+    for r in sorted(available, key=lambda r: -r['accuracy']['f1']):
+        key = (r['method'], r['mode'])
+        accuracy, last = r['accuracy'], r['sizes'][-1]
+        print(f"{'★' if key in front else '':<2}{r['method']:<18}{r['mode']:<10}{accuracy['f1']:>8.3f}"
+              f"{accuracy['precision']:>8.3f}{accuracy['recall']:>8.3f}"
+              f"{last['tokens_per_sec']:>14.0f}{last['peak_rss_mb']:>13.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分词速度/准确度基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='文本长度（字符）')
+    parser.add_argument('--methods', nargs='+', help='只测试指定的分词器')
+    parser.add_argument('--json', help='把结果写入JSON文件')
+    args = parser.parse_args()
+
+    sizes = sorted(args.sizes)
+    configs = [config for config in CONFIGS if not args.methods or config[0] in args.methods]
+
+    print("=" * 72)
+    print(f"分词基准测试（Python {platform.python_version()}，{platform.platform()}，CPU核数 {os.cpu_count()}）")
+    print(f"文本长度: {sizes}")
+    print("=" * 72)
+
+    # 每个配置使用新的子进程，峰值内存只包含该分词器
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for method, mode in configs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(run_config, method, mode, sizes).result())
+
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'sizes': sizes, 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分词结果内存基准测试 - 对比每个词一个字典的列表与SegmentedDoc在约5MB文档上的内存占用
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+# 添加父目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from code_model.text_tools import TextProcessor
+from test_data_generator import TestDataGenerator
+
+
+def build_document(target_bytes: int = 5 * 1024 * 1024) -> str:
+    """重复性能测试文本，构造约target_bytes大小（UTF-8）的文档"""
+    corpus = '\n'.join(TestDataGenerator().generate_performance_test_data().values())
+    repeat = target_bytes // len(corpus.encode('utf-8')) + 1
+    return corpus * repeat
+
+
+def measure(build):
+    """测量构造结果的峰值内存（MB）和耗时"""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start_time
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024 / 1024, elapsed
+
+
+def main():
+    processor = TextProcessor()
+    text = build_document()
+    method = processor._resolve_segment_method('auto')
+    print("=" * 64)
+    print(f"文档大小 {len(text.encode('utf-8')) / 1024 / 1024:.1f}MB，分词器 {method}")
+    print("=" * 64)
+
+    for with_pos in [False, True]:
+        doc, doc_mb, doc_time = measure(lambda: processor.segment_text(text, method, with_pos=with_pos))
+        dicts, dict_mb, dict_time = measure(doc.to_list)
+        print(f"with_pos={with_pos}: {len(doc)} 个词")
+        print(f"  字典列表:     {dict_mb:8.1f}MB")
+        print(f"  SegmentedDoc: {doc_mb:8.1f}MB（含分词耗时 {doc_time:.2f}s）")
+        print(f"  节省 {(1 - doc_mb / max(dict_mb, 1e-9)) * 100:.0f}%")
+        del doc, dicts
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+情感模型量化基准测试 - 对比fp32与int8动态量化推理的准确率和延迟
+样本来自 TestDataGenerator.generate_sentiment_test_data()
+"""
+
+import sys
+import os
+import io
+import time
+import statistics
+
+# 添加父目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from code_model.text_tools import TextProcessor, TRANSFORMERS_AVAILABLE
+from test_data_generator import TestDataGenerator
+
+MODEL_KEYS = ['uer_roberta_dianping', 'erlangshen_roberta_110m']
+
+
+def model_size_mb(pipeline_model) -> float:
+    """序列化后的模型权重大小（MB）"""
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(pipeline_model.model.state_dict(), buffer)
+    return buffer.tell() / 1024 / 1024
+
+
+def evaluate(processor: TextProcessor, model_key: str, samples, rounds: int = 3) -> dict:
+    """在情感样本上评估一个模型"""
+    # 预热（包含模型加载）
+    if processor._predict_with_pipeline(samples[0][1], model_key).get('available') is not True:
+        return None
+
+    predictions = []
+    timings = []
+    for _, text, _ in samples:
+        for _ in range(rounds):
+            start_time = time.perf_counter()
+            result = processor._predict_with_pipeline(text, model_key)
+            timings.append(time.perf_counter() - start_time)
+        predictions.append(result['sentiment'])
+
+    correct = sum(1 for pred, (_, _, expected) in zip(predictions, samples) if pred == expected)
+    return {
+        'predictions': predictions,
+        'accuracy': correct / len(samples),
+        'p50_ms': statistics.median(timings) * 1000,
+        'mean_ms': statistics.mean(timings) * 1000,
+        'size_mb': model_size_mb(processor.nlp_models[model_key])
+    }
+
+
+def main():
+    print("=" * 72)
+    print("情感模型 fp32 vs int8 动态量化对比")
+    print("=" * 72)
+
+    if not TRANSFORMERS_AVAILABLE:
+        print("transformers/torch不可用，无法运行此基准测试")
+        return
+
+    samples = TestDataGenerator().generate_sentiment_test_data()
+    print(f"样本数: {len(samples)}\n")
+    print(f"{'模型':<26}{'精度':<8}{'准确率':>8}{'p50(ms)':>10}{'均值(ms)':>10}{'大小(MB)':>10}{'一致率':>8}")
+
+    for model_key in MODEL_KEYS:
+        fp32 = evaluate(TextProcessor(quantized_models=[]), model_key, samples)
+        if fp32 is None:
+            print(f"{model_key:<26}不可用")
+            continue
+        int8 = evaluate(TextProcessor(quantized_models=[model_key]), model_key, samples)
+
+        agreement = sum(1 for a, b in zip(fp32['predictions'], int8['predictions']) if a == b) / len(samples)
+        for label, result, agree in [('fp32', fp32, ''), ('int8', int8, f"{agreement:.0%}")]:
+            print(f"{model_key:<26}{label:<8}{result['accuracy']:>8.0%}{result['p50_ms']:>10.1f}"
+                  f"{result['mean_ms']:>10.1f}{result['size_mb']:>10.1f}{agree:>8}")
+        print(f"{'':<26}加速 {fp32['p50_ms'] / max(int8['p50_ms'], 1e-6):.2f}x，"
+              f"准确率变化 {(int8['accuracy'] - fp32['accuracy']) * 100:+.1f} 个百分点")
+
+
+if __name__ == '__main__':
+    main()
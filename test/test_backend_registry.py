@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+测试后端注册表（按需加载）
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.backend_registry import BackendRegistry
+from code_model.text_tools import TextProcessor
+
+
+def test_lazy_loading():
+    """测试后端只在首次使用时加载"""
+    print("=== 测试按需加载 ===")
+
+    calls = []
+    registry = BackendRegistry()
+    registry.register('dummy', lambda: calls.append(1) or 'model', group='nlp')
+
+    assert not registry.is_loaded('dummy')
+    assert registry.is_available('dummy')
+    assert calls == []
+
+    assert registry.get('dummy') == 'model'
+    assert registry.get('dummy') == 'model'
+    assert calls == [1], "加载函数只应执行一次"
+
+    stats = registry.get_stats()['dummy']
+    print(f"  状态: {stats['state']}, 耗时: {stats['load_time']}s, 内存: {stats['memory_mb']}MB")
+    assert stats['state'] == 'loaded'
+    assert stats['load_time'] is not None
+
+
+def test_failed_backend():
+    """测试加载失败的后端不会被重复尝试"""
+    print("\n=== 测试加载失败 ===")
+
+    calls = []
+
+    def broken_loader():
+        calls.append(1)
+        raise RuntimeError("模型文件不存在")
+
+    registry = BackendRegistry()
+    registry.register('broken', broken_loader, group='segmenter')
+    view = registry.view('segmenter')
+
+    assert 'broken' not in view
+    assert 'broken' not in view
+    assert calls == [1]
+    assert not registry.is_available('broken')
+    assert registry.get_stats()['broken']['error'] == "模型文件不存在"
+
+
+def test_lru_eviction():
+    """测试超出内存预算时按LRU卸载，并在需要时重新加载"""
+    print("\n=== 测试内存预算和LRU卸载 ===")
+
+    registry = BackendRegistry(memory_budget_mb=250)
+    load_counts = {}
+
+    def make_loader(name):
+        def loader():
+            load_counts[name] = load_counts.get(name, 0) + 1
+            return name
+        return loader
+
+    for name in ['model_a', 'model_b', 'model_c']:
+        registry.register(name, make_loader(name), group='nlp')
+    registry.register('pinned', make_loader('pinned'), group='nlp', evictable=False)
+
+    # 用固定的估算占用代替真实的RSS差值
+    footprints = {'model_a': 100, 'model_b': 100, 'model_c': 100, 'pinned': 40}
+    original_load = registry._load
+
+    def fake_load(name):
+        instance = original_load(name)
+        registry._stats[name]['memory_mb'] = footprints[name]
+        return instance
+
+    registry._load = fake_load
+
+    registry.get('pinned')
+    registry.get('model_a')
+    registry.get('model_b')
+    registry.get('model_a')  # model_a变为最近使用
+    registry.get('model_c')  # 超出预算，应卸载最久未用的model_b
+
+    stats = registry.get_memory_stats()
+    print(f"  内存统计: {stats}")
+    assert not registry.is_loaded('model_b')
+    assert registry.is_loaded('model_a') and registry.is_loaded('model_c')
+    assert registry.is_loaded('pinned')
+    assert stats['evictions'] == 1
+    assert stats['used_mb'] <= 250
+
+    # 被卸载的模型再次使用时重新加载
+    assert registry.get('model_b') == 'model_b'
+    assert load_counts['model_b'] == 2
+    assert registry.get_stats()['model_b']['load_count'] == 2
+
+
+def test_budget_enforced_after_reload():
+    """测试卸载后重新加载测得的内存接近0时，仍按首次加载的占用执行预算"""
+    print("\n=== 测试重新加载后的内存预算 ===")
+
+    from code_model import backend_registry
+
+    # 模块和缓存在卸载后仍留在内存中：只有第一次加载会让RSS增加
+    rss = [500.0]
+    first_loads = set()
+
+    def make_loader(name, size=100):
+        def loader():
+            if name not in first_loads:
+                first_loads.add(name)
+                rss[0] += size
+            return name
+        return loader
+
+    original_rss = backend_registry.get_process_rss_mb
+    backend_registry.get_process_rss_mb = lambda: rss[0]
+    try:
+        registry = BackendRegistry(memory_budget_mb=150)
+        for name in ['model_a', 'model_b']:
+            registry.register(name, make_loader(name), group='nlp')
+
+        registry.get('model_a')
+        registry.get('model_b')  # 超出预算，卸载model_a
+        assert not registry.is_loaded('model_a')
+
+        registry.get('model_a')  # 重新加载测得0MB，应保留100MB并卸载model_b
+        stats = registry.get_memory_stats()
+        print(f"  内存统计: {stats}")
+        assert stats['footprints_mb'] == {'model_a': 100.0}
+        assert not registry.is_loaded('model_b')
+        assert stats['used_mb'] <= 150
+        assert stats['evictions'] == 2
+        assert not stats['over_budget']
+
+        # 不可卸载的模型超出预算时，在统计中标记出来
+        registry.register('pinned', make_loader('pinned', 200), group='nlp', evictable=False)
+        registry.get('pinned')
+        stats = registry.get_memory_stats()
+        assert stats['lru_order'] == ['pinned'] and stats['over_budget']
+    finally:
+        backend_registry.get_process_rss_mb = original_rss
+
+
+def test_load_does_not_block_loaded_backends():
+    """测试一个后端加载期间，已加载的后端和其他线程的同名请求互不阻塞/不重复加载"""
+    print("\n=== 测试加载期间的并发访问 ===")
+
+    registry = BackendRegistry()
+    started = threading.Event()
+    release = threading.Event()
+    load_counts = {'slow': 0}
+
+    def slow_loader():
+        load_counts['slow'] += 1
+        started.set()
+        release.wait(5)
+        return 'slow'
+
+    registry.register('fast', lambda: 'fast', group='segmenter')
+    registry.register('slow', slow_loader, group='nlp')
+    registry.get('fast')
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('slow'))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+
+    # 慢模型加载期间，已加载的后端立即返回
+    start_time = time.perf_counter()
+    assert registry.get('fast') == 'fast'
+    assert 'fast' in registry.get_memory_stats()['lru_order']
+    assert time.perf_counter() - start_time < 0.5
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ['slow', 'slow']
+    assert load_counts['slow'] == 1
+
+
+def test_processor_startup():
+    """测试TextProcessor构造时不加载任何模型"""
+    print("\n=== 测试TextProcessor启动时间 ===")
+
+    start_time = time.perf_counter()
+    processor = TextProcessor()
+    elapsed = time.perf_counter() - start_time
+    print(f"  构造耗时: {elapsed:.3f}s")
+
+    assert processor.backends.loaded_names() == []
+    assert elapsed < 1.0
+
+    # 词频统计只会加载它用到的分词器
+    processor.load_text("人工智能是计算机科学的一个分支。人工智能研究机器学习。")
+    processor.word_frequency()
+    print(f"  词频统计后已加载: {processor.backends.loaded_names()}")
+    assert 'stanza_zh' not in processor.backends.loaded_names()
+
+
+if __name__ == '__main__':
+    test_lazy_loading()
+    test_failed_backend()
+    test_lru_eviction()
+    test_budget_enforced_after_reload()
+    test_load_does_not_block_loaded_backends()
+    test_processor_startup()
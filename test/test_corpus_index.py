@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+测试语料库索引（CSR词项-文档计数和TF-IDF）
+"""
+
+import sys
+import os
+import math
+import threading
+import time
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.corpus_index import CorpusIndex
+from code_model.text_tools import TextProcessor
+
+DOCUMENTS = [
+    "科学技术是第一生产力。科学技术推动经济发展。",
+    "市场经济是经济发展的重要方向。科学技术是经济发展的动力。",
+    "北京大学和清华大学位于北京市，两所大学都开设了计算机课程。",
+]
+
+
+def test_counts_match_word_frequency():
+    """测试每篇文档的词频与word_frequency一致，文档频率和全语料词频正确"""
+    print("=== 测试语料库计数 ===")
+
+    processor = TextProcessor()
+    index = CorpusIndex(processor)
+    assert index.add_documents(DOCUMENTS) == [0, 1, 2]
+    assert len(index) == 3
+
+    expected = []
+    for text in DOCUMENTS:
+        processor.load_text(text)
+        expected.append(processor.word_frequency())
+    for row, frequency in enumerate(expected):
+        assert index.get_document_terms(row) == frequency
+
+    total = sum((Counter(frequency) for frequency in expected), Counter())
+    # 次数相同的词顺序不固定，只比较次数
+    assert [count for _, count in index.top_terms(3)] == [count for _, count in total.most_common(3)]
+    assert index.term_frequency('科学技术') == total['科学技术']
+    assert index.document_frequency('市场经济') == sum('市场经济' in f for f in expected)
+    assert index.document_frequency('不存在的词') == 0
+    assert index.get_stats()['nonzeros'] == sum(len(f) for f in expected)
+    print("✓ 语料库计数测试通过")
+
+
+def test_incremental_add_and_tfidf():
+    """测试增量添加后文档频率更新，TF-IDF按公式计算"""
+    print("\n=== 测试增量添加和TF-IDF ===")
+
+    index = CorpusIndex()
+    index.add_document(DOCUMENTS[0], doc_id='a')
+    idf_before = index.idf('科学技术')
+    index.add_documents(DOCUMENTS[1:], doc_ids=['b', 'c'])
+    assert index.document_frequency('科学技术') == 2
+    assert index.idf('科学技术') != idf_before
+
+    terms = index.get_document_terms('c')
+    length = sum(terms.values())
+    keywords = index.top_tfidf('c', k=3)
+    assert len(keywords) == 3
+    scores = [score for _, score in keywords]
+    assert scores == sorted(scores, reverse=True)
+    word, score = keywords[0]
+    expected = terms[word] / length * (math.log(4 / (1 + index.document_frequency(word))) + 1)
+    assert abs(score - expected) < 1e-12
+
+    try:
+        index.add_document("重复的文档", doc_id='a')
+        assert False, "重复的文档ID应报错"
+    except ValueError:
+        pass
+    assert len(index) == 3
+
+    try:
+        index.top_tfidf('missing')
+        assert False, "不存在的文档应报错"
+    except KeyError:
+        pass
+    print("✓ 增量添加和TF-IDF测试通过")
+
+
+def test_queries_fast_on_many_documents():
+    """测试上千篇文档时查询在毫秒级完成"""
+    print("\n=== 测试查询速度 ===")
+
+    index = CorpusIndex()
+    texts = [f"{DOCUMENTS[i % 3]}编号{i}文章讨论主题{i % 97}。" for i in range(2000)]
+    index.add_documents(texts)
+    assert len(index) == 2000
+
+    start_time = time.perf_counter()
+    for row in range(0, 2000, 20):
+        index.top_tfidf(row, k=5)
+    index.top_terms(20)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000 / 101
+    print(f"  平均每次查询 {elapsed_ms:.3f}ms，{index.get_stats()}")
+    assert elapsed_ms < 10
+    print("✓ 查询速度测试通过")
+
+
+def test_queries_during_concurrent_add():
+    """测试入库的同时查询不会读到未写完的词或文档"""
+    print("\n=== 测试并发入库和查询 ===")
+
+    index = CorpusIndex()
+    errors = []
+    done = threading.Event()
+
+    def query_terms():
+        while not done.is_set():
+            try:
+                index.top_terms(3)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    def query_documents():
+        while not done.is_set():
+            try:
+                for doc_id in index.doc_ids[-3:]:
+                    for word, _ in index.top_tfidf(doc_id, k=3):
+                        index.document_frequency(word)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=query_terms), threading.Thread(target=query_documents)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # 频繁切换线程，让查询落在入库中途
+    for reader in readers:
+        reader.start()
+    try:
+        # 每篇文档都带来大量新词，词表增长时最容易读到写了一半的词
+        for batch in range(300):
+            index.add_documents([' '.join(f"w{batch}d{i}t{j}" for j in range(50)) for i in range(5)])
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert len(index) == 1500 and index.vocabulary_size == 75000
+    print("✓ 并发入库和查询测试通过")
+
+if __name__ == '__main__':
+    test_counts_match_word_frequency()
+    test_incremental_add_and_tfidf()
+    test_queries_fast_on_many_documents()
+    test_queries_during_concurrent_add()
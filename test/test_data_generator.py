@@ -76,7 +76,7 @@ class TestDataGenerator:
         samples.append(("数字符号", number_text))
         
         # 10. 纯标点符号
-        punctuation_text = "！@#￥%……&*（）——+{}|："《》？[]\\;',./"
+        punctuation_text = "！@#￥%……&*（）——+{}|：\"《》？[]\\;',./"
         samples.append(("纯标点", punctuation_text))
         
         return samples
@@ -190,7 +190,26 @@ class TestDataGenerator:
         test_data.append(("长句子", "随着人工智能技术的快速发展，机器学习和深度学习在图像识别、自然语言处理、语音识别等领域都取得了重大突破"))
         
         return test_data
-    
+
+    def generate_segmentation_reference_data(self) -> List[Tuple[str, str, List[str]]]:
+        """
+        生成带参考切分的分词测试数据（用于计算分词F1）
+
+        文本与 generate_segmentation_test_data 相同；参考切分不含标点，
+        专有名词和常用术语（如"人工智能"、"北京大学"）作为一个词
+        """
+        references = {
+            "基础分词": ["我", "爱", "北京", "天安门"],
+            "专业术语": ["机器学习", "和", "深度学习", "是", "人工智能", "的", "重要", "分支"],
+            "人名地名": ["张三", "在", "北京大学", "学习"],
+            "网络用语": ["这个", "AI", "模型", "真的", "很", "牛逼", "YYDS"],
+            "数字英文": ["iPhone15", "的", "价格", "是", "5999", "元"],
+            "长句子": ["随着", "人工智能", "技术", "的", "快速", "发展",
+                      "机器学习", "和", "深度学习", "在", "图像识别", "自然语言处理",
+                      "语音识别", "等", "领域", "都", "取得", "了", "重大", "突破"],
+        }
+        return [(name, text, references[name]) for name, text in self.generate_segmentation_test_data()]
+
     def generate_summary_test_data(self) -> List[Tuple[str, str, str]]:
         """生成文本摘要测试数据"""
         test_data = []
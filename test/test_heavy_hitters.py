@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+测试流式高频词近似统计（Space-Saving）
+"""
+
+import sys
+import os
+import random
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.heavy_hitters import SpaceSaving
+from code_model.text_tools import TextProcessor
+
+
+def zipf_stream(length: int, distinct: int, seed: int = 7) -> list:
+    """按齐普夫分布生成词流"""
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, distinct + 1)]
+    return [f"w{index}" for index in rng.choices(range(distinct), weights=weights, k=length)]
+
+
+def test_error_bounds_on_skewed_stream():
+    """测试计数只高估、高估不超过误差上界，且内存不超过容量"""
+    print("=== 测试误差上界 ===")
+
+    stream = zipf_stream(200_000, 50_000)
+    exact = Counter(stream)
+    sketch = SpaceSaving(max_error=0.001)
+    assert sketch.capacity == 1000
+    sketch.update_many(stream)
+
+    assert len(sketch) <= sketch.capacity
+    assert sketch.total == len(stream)
+    for word, count in sketch.top(len(sketch)):
+        assert exact[word] <= count <= exact[word] + sketch.error_bound
+
+    # 真实计数超过误差上界的词一定被保留，前10名与精确结果一致
+    for word, count in exact.items():
+        if count > sketch.error_bound:
+            assert word in sketch
+    assert [word for word, _ in sketch.top(10)] == [word for word, _ in exact.most_common(10)]
+    assert all(entry['guaranteed'] for entry in sketch.entries(5))
+    print(f"  {sketch.get_stats()}")
+    print("✓ 误差上界测试通过")
+
+
+def test_weighted_updates_match_single_updates():
+    """测试按批量计数更新与逐个更新的保证相同"""
+    print("\n=== 测试批量计数更新 ===")
+
+    stream = zipf_stream(50_000, 5_000, seed=11)
+    exact = Counter(stream)
+    sketch = SpaceSaving(capacity=200)
+    for start in range(0, len(stream), 5_000):
+        sketch.update_counts(Counter(stream[start:start + 5_000]))
+
+    assert len(sketch) <= 200 and sketch.total == len(stream)
+    for word, count in sketch.top(50):
+        assert exact[word] <= count <= exact[word] + sketch.error_bound
+    print("✓ 批量计数更新测试通过")
+
+
+def test_get_top_words_streaming():
+    """测试 get_top_words 的流式模式与精确统计一致（容量足够时）"""
+    print("\n=== 测试流式高频词 ===")
+
+    processor = TextProcessor()
+    processor.load_text('\n\n'.join([
+        "人工智能是计算机科学的一个分支。人工智能研究机器学习。",
+        "机器学习是人工智能的重要方向。深度学习是机器学习的子领域。",
+        "深度学习推动了人工智能的发展。",
+    ] * 20))
+
+    exact = processor.get_top_words(5)
+    approximate = processor.get_top_words(5, streaming=True)
+    assert approximate[:2] == exact[:2]
+    assert [count for _, count in approximate] == [count for _, count in exact]
+
+    # 容量很小时计数不低于真实值
+    small = processor.get_top_words(3, streaming=True, capacity=3)
+    frequency = processor.word_frequency()
+    for word, count in small:
+        assert count >= frequency.get(word, 0)
+
+    sketch = processor.stream_top_words(iter(["市场经济和科学技术"] * 100), capacity=10)
+    assert dict(sketch.top(2)) == {'市场经济': 100, '科学技术': 100}
+    print("✓ 流式高频词测试通过")
+
+
+if __name__ == '__main__':
+    test_error_bounds_on_skewed_stream()
+    test_weighted_updates_match_single_updates()
+    test_get_top_words_streaming()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+测试内置的双向最大匹配分词器
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.mm_segmenter import MaxMatchSegmenter
+
+
+def test_bidirectional_max_match():
+    """测试双向最大匹配的歧义消解"""
+    print("=== 测试双向最大匹配 ===")
+
+    segmenter = MaxMatchSegmenter(['研究', '研究生', '生命', '起源', '结婚', '和尚', '尚未'])
+    # 正向：研究生/命/起源，反向：研究/生命/起源 —— 词数相同，单字少的优先
+    assert segmenter.cut('研究生命起源') == ['研究', '生命', '起源']
+    # 正向：结婚/的/和尚/未/结婚/的，反向：结婚/的/和/尚未/结婚/的 —— 词数、单字数相同时取反向
+    assert segmenter.cut('结婚的和尚未结婚的') == ['结婚', '的', '和', '尚未', '结婚', '的']
+
+    segmenter.remove_word('尚未')
+    assert '尚未' not in segmenter and '和尚' in segmenter
+    assert len(segmenter) == 6
+
+
+def test_tokenize_offsets_and_punctuation():
+    """测试标点和空白被跳过，字母数字保持完整，偏移指向原文"""
+    segmenter = MaxMatchSegmenter.from_file()
+    text = "iPhone15的价格是5999元，科学技术 正在改变世界！"
+    tokens = list(segmenter.tokenize(text))
+    print(f"  {tokens}")
+
+    assert [word for word, _ in tokens] == ['iPhone15', '的', '价格', '是', '5999', '元',
+                                            '科学技术', '正在', '改变', '世界']
+    assert all(text[start:start + len(word)] == word for word, start in tokens)
+
+
+if __name__ == '__main__':
+    test_bidirectional_max_match()
+    test_tokenize_offsets_and_punctuation()
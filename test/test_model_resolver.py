@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+测试本地模型文件解析（离线优先，不访问网络）
+"""
+
+import sys
+import os
+import socket
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.model_resolver import ModelResolver, ModelArtifactMissing
+from code_model.text_tools import TextProcessor
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'w').close()
+
+
+def test_local_cache_dir():
+    """测试从本地模型目录解析transformers模型，并报告缺少的文件"""
+    print("=== 测试本地模型目录 ===")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        resolver = ModelResolver(cache_dir=cache_dir, hf_cache_dir=os.path.join(cache_dir, 'hub'))
+        model_dir = os.path.join(cache_dir, 'uer', 'roberta-base-finetuned-dianping-chinese')
+
+        _touch(os.path.join(model_dir, 'config.json'))
+        result = resolver.check('uer_roberta_dianping')
+        print(f"  不完整: {result['missing']}")
+        assert not result['available']
+        assert 'pytorch_model.bin / model.safetensors' in result['missing']
+
+        try:
+            resolver.require('uer_roberta_dianping')
+            assert False, "缺少文件时应抛出ModelArtifactMissing"
+        except ModelArtifactMissing as e:
+            print(f"  错误信息: {e}")
+            assert e.name == 'uer_roberta_dianping'
+
+        _touch(os.path.join(model_dir, 'model.safetensors'))
+        _touch(os.path.join(model_dir, 'vocab.txt'))
+        assert resolver.require('uer_roberta_dianping') == model_dir
+
+
+def test_huggingface_cache_layout():
+    """测试huggingface缓存目录结构（models--组织--模型名/snapshots/版本）"""
+    print("\n=== 测试huggingface缓存目录 ===")
+
+    with tempfile.TemporaryDirectory() as hub:
+        repo_dir = os.path.join(hub, 'models--IDEA-CCNL--Erlangshen-Roberta-110M-Sentiment')
+        snapshot = os.path.join(repo_dir, 'snapshots', 'abc123')
+        for name in ['config.json', 'pytorch_model.bin', 'vocab.txt']:
+            _touch(os.path.join(snapshot, name))
+        os.makedirs(os.path.join(repo_dir, 'refs'))
+        with open(os.path.join(repo_dir, 'refs', 'main'), 'w') as f:
+            f.write('abc123')
+
+        resolver = ModelResolver(hf_cache_dir=hub)
+        assert resolver.require('erlangshen_roberta_110m') == snapshot
+        assert not resolver.check('erlangshen_roberta_330m')['available']
+
+
+def test_no_global_socket_timeout():
+    """测试检查模型可用性不会修改全局socket超时"""
+    print("\n=== 测试无全局副作用 ===")
+
+    before = socket.getdefaulttimeout()
+    processor = TextProcessor()
+    capabilities = processor.get_nlp_capabilities()
+    print(f"  模型文件状态: {list(capabilities['model_artifacts'])}")
+    assert socket.getdefaulttimeout() == before
+    assert not hasattr(processor, '_is_offline_mode')
+
+
+if __name__ == '__main__':
+    test_local_cache_dir()
+    test_huggingface_cache_layout()
+    test_no_global_socket_timeout()
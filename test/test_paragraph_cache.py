@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+测试段落级增量分析（编辑后只重新分析变化的段落）
+"""
+
+import sys
+import os
+import threading
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.paragraph_cache import ParagraphCache, split_paragraphs
+from code_model.text_tools import TextProcessor
+
+PARAGRAPHS = [
+    "科学技术是第一生产力。科学技术推动经济发展。",
+    "北京大学和清华大学位于北京市。张伟在2023年加入了腾讯公司。",
+    "环境保护是社会发展的基础，环境保护推动了市场经济的发展。",
+]
+
+
+def test_split_paragraphs_offsets():
+    """测试分段偏移与原文一致，空白段落被跳过"""
+    print("=== 测试分段 ===")
+
+    text = "第一段\n\n  \n\n第二段\n第二段续\n\n\n\n第三段"
+    paragraphs = split_paragraphs(text)
+    assert [paragraph for _, paragraph in paragraphs] == ["第一段", "第二段\n第二段续", "第三段"]
+    for offset, paragraph in paragraphs:
+        assert text[offset:offset + len(paragraph)] == paragraph
+    print("✓ 分段测试通过")
+
+
+def test_count_subtracts_and_adds_changed_paragraphs():
+    """测试计数汇总只对变化的段落做减法和加法"""
+    print("\n=== 测试增量计数 ===")
+
+    cache = ParagraphCache()
+    computed = []
+
+    def compute(paragraphs):
+        computed.extend(paragraphs)
+        return [Counter(paragraph.split()) for paragraph in paragraphs]
+
+    assert cache.count('words', (), ['a b', 'b c', 'a b'], compute) == Counter({'a': 2, 'b': 3, 'c': 1})
+    assert computed == ['a b', 'b c']  # 重复的段落只计算一次
+
+    computed.clear()
+    assert cache.count('words', (), ['a b', 'c d'], compute) == Counter({'a': 1, 'b': 1, 'c': 1, 'd': 1})
+    assert computed == ['c d']
+
+    # 改回原来的段落时从段落缓存取结果，不重新计算
+    computed.clear()
+    assert cache.count('words', (), ['a b', 'b c'], compute) == Counter({'a': 1, 'b': 2, 'c': 1})
+    assert computed == []
+
+    # 参数不同时分别汇总
+    assert cache.count('words', ('other',), ['x'], compute) == Counter({'x': 1})
+
+    # 段落结果已被淘汰时，出现次数变化的段落沿用汇总中记录的计数
+    small = ParagraphCache(max_paragraphs=1)
+    small.count('words', (), ['a b', 'c'], compute)
+    computed.clear()
+    assert small.count('words', (), ['a b', 'a b'], compute) == Counter({'a': 2, 'b': 2})
+    assert computed == []
+    print("✓ 增量计数测试通过")
+
+
+def test_count_computes_outside_lock():
+    """测试计算段落时不持有锁，其他线程的查询和汇总不被阻塞"""
+    print("\n=== 测试计算期间不持有锁 ===")
+
+    cache = ParagraphCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_compute(paragraphs):
+        started.set()
+        assert release.wait(10)
+        return [Counter(paragraph.split()) for paragraph in paragraphs]
+
+    results = []
+    worker = threading.Thread(
+        target=lambda: results.append(cache.count('words', (), ['a b', 'b c'], slow_compute)))
+    worker.start()
+    try:
+        assert started.wait(5)
+        # 计算进行中：其他汇总和统计可以立即完成
+        finished = threading.Event()
+
+        def other():
+            cache.count('words', ('other',), ['x'], lambda ps: [Counter(p.split()) for p in ps])
+            cache.get_stats()
+            finished.set()
+
+        threading.Thread(target=other).start()
+        assert finished.wait(5)
+    finally:
+        release.set()
+        worker.join()
+
+    assert results == [Counter({'a': 1, 'b': 2, 'c': 1})]
+    assert cache.count('words', (), ['a b', 'b c'], slow_compute) == results[0]
+    print("✓ 计算期间不持有锁测试通过")
+
+
+def test_edit_recomputes_only_changed_paragraph():
+    """测试编辑一个段落后，词频和实体识别只重新分析该段落，结果与从头计算一致"""
+    print("\n=== 测试编辑后增量重新分析 ===")
+
+    processor = TextProcessor(segment_cache_mb=0)
+    processor.load_text('\n\n'.join(PARAGRAPHS))
+    processor.word_frequency()
+    processor.extract_entities()
+
+    misses = processor.paragraph_cache.get_stats()['misses']
+    _, count = processor.find_and_replace('市场经济', '科学技术')
+    assert count == 1
+
+    frequency = processor.word_frequency()
+    entities = processor.extract_entities()
+    # 词频和实体识别各重新分析了一个段落
+    assert processor.paragraph_cache.get_stats()['misses'] == misses + 2
+
+    fresh = TextProcessor(segment_cache_mb=0)
+    fresh.load_text(processor.text)
+    assert frequency == fresh.word_frequency()
+    assert entities == fresh.extract_entities()
+    assert '市场经济' not in frequency and frequency.get('环境保护') == 2
+
+    for entity in entities['entities']:
+        for position in entity['positions']:
+            assert processor.text[position['start']:position['end']].lower() == entity['text'].lower()
+    print("✓ 增量重新分析测试通过")
+
+
+def test_stopwords_change_not_served_stale():
+    """测试停用词变化后词频不使用旧的段落结果"""
+    print("\n=== 测试停用词变化 ===")
+
+    processor = TextProcessor()
+    processor.load_text('\n\n'.join(PARAGRAPHS))
+    assert '环境保护' in processor.word_frequency()
+
+    processor.add_custom_stopwords(['环境保护'])
+    assert '环境保护' not in processor.word_frequency()
+    print("✓ 停用词变化测试通过")
+
+
+if __name__ == '__main__':
+    test_split_paragraphs_offsets()
+    test_count_subtracts_and_adds_changed_paragraphs()
+    test_count_computes_outside_lock()
+    test_edit_recomputes_only_changed_paragraph()
+    test_stopwords_change_not_served_stale()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+测试长文本的多进程并行分词（pkuseg/thulac）
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.segmented_doc import SegmentedDoc
+from code_model.text_tools import TextProcessor, _segment_piece
+
+
+class PairSegmenter:
+    """按两个字切分的分词器，接口与thulac一致（返回 [词, 词性]）"""
+
+    def cut(self, text):
+        words = []
+        for part in text.split():
+            for i in range(0, len(part), 2):
+                words.append([part[i:i + 2], 'n' if part[i].isalpha() else 'w'])
+        return words
+
+
+def register_pair_segmenter(processor: TextProcessor) -> None:
+    """把PairSegmenter注册为thulac（工作进程中也通过 segment_worker_setup 调用）"""
+    processor.backends.register('thulac', PairSegmenter, group='segmenter')
+
+
+def make_processor(**kwargs) -> TextProcessor:
+    processor = TextProcessor(segment_cache_mb=0, **kwargs)
+    register_pair_segmenter(processor)
+    processor.segment_worker_setup = register_pair_segmenter
+    return processor
+
+
+def test_split_text_at_boundaries():
+    """测试按句子边界切分，分块拼接后与原文一致"""
+    processor = make_processor()
+    text = "第一句话。第二句话！\n第三句没有结束" * 50
+    chunks = list(processor._split_text(text, 64))
+
+    assert ''.join(chunk for _, chunk in chunks) == text
+    assert all(len(chunk) <= 64 for _, chunk in chunks)
+    assert all(text.startswith(chunk, offset) for offset, chunk in chunks)
+    assert all(chunk[-1] in processor.CHUNK_BOUNDARIES for _, chunk in chunks[:-1])
+
+
+def test_parallel_matches_in_process():
+    """测试并行分词结果（词、词性、偏移）与单进程一致"""
+    print("=== 测试并行分词 ===")
+
+    text = "人工智能正在改变世界。机器学习 是核心技术！\n" * 3000
+    serial = make_processor(parallel_segment_chars=0)
+    parallel = make_processor(parallel_segment_chars=10_000, segment_workers=4)
+    parallel.PARALLEL_MIN_PIECE_CHARS = 5_000
+    assert parallel._use_parallel_segment(text, 'thulac')
+    assert not parallel._use_parallel_segment(text[:100], 'thulac'), "短文本应在当前进程中处理"
+    assert not parallel._use_parallel_segment(text, 'jieba')
+
+    try:
+        for with_pos in (False, True):
+            expected = serial.segment_text(text, method='thulac', with_pos=with_pos)
+            result = parallel.segment_text(text, method='thulac', with_pos=with_pos)
+            print(f"  with_pos={with_pos}: {len(result)} 个词")
+            assert result == expected
+            last = result[-1]
+            assert text[last['start']:last['end']] == last['word']
+
+        # 多次调用复用同一个进程池
+        pool = parallel._segment_pool
+        assert pool is not None
+        parallel.segment_text(text, method='thulac')
+        assert parallel._segment_pool is pool
+    finally:
+        parallel.shutdown_segment_pool()
+
+
+def test_parallel_segment_while_other_thread_holds_registry_lock():
+    """测试其他线程持有注册表锁时并行分词不会死锁（工作进程不通过fork继承锁）"""
+    print("\n=== 测试多线程下的并行分词 ===")
+
+    text = "人工智能正在改变世界。机器学习 是核心技术！\n" * 3000
+    processor = make_processor(parallel_segment_chars=10_000, segment_workers=2)
+    processor.PARALLEL_MIN_PIECE_CHARS = 5_000
+    processor.segment_text("预先加载", method='thulac')
+
+    holding = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with processor.backends._lock:
+            holding.set()
+            release.wait(10)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    assert holding.wait(5)
+    try:
+        # 持锁期间启动工作进程；子进程不继承父进程中的锁状态
+        pool = processor._get_segment_pool()
+        futures = [pool.submit(_segment_piece, (0, "机器学习", 'thulac', 'accurate', False))
+                   for _ in range(2)]
+        assert [future.result(timeout=60).words for future in futures] == [['机器', '学习']] * 2
+    finally:
+        release.set()
+        holder.join()
+        processor.shutdown_segment_pool()
+
+
+def test_concat():
+    """测试拼接时合并词性表"""
+    first = SegmentedDoc.from_pairs([('我', 'r'), ('爱', 'v')], text='我爱')
+    second = SegmentedDoc.from_pairs([('北京', 'ns'), ('吧', 'r')], text='北京吧').shifted(2)
+    merged = SegmentedDoc.concat([first, second])
+
+    assert merged.words == ['我', '爱', '北京', '吧']
+    assert merged.pos_tags == ['r', 'v', 'ns', 'r']
+    assert list(merged.starts) == [0, 1, 2, 4]
+    assert SegmentedDoc.concat([]) == []
+
+
+if __name__ == '__main__':
+    test_split_text_at_boundaries()
+    test_parallel_matches_in_process()
+    test_parallel_segment_while_other_thread_holds_registry_lock()
+    test_concat()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+测试部署配置（lite / standard / full）
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.profiles import resolve_profile
+from code_model.text_tools import TextProcessor
+
+
+def test_builtin_profiles():
+    """测试内置配置的后端范围"""
+    print("=== 测试内置部署配置 ===")
+
+    lite = resolve_profile('lite')
+    assert lite.allows('jieba')
+    assert not lite.allows('pkuseg_default')
+    assert not lite.allows('uer_roberta_dianping')
+
+    full = resolve_profile('full')
+    assert full.allows('stanza_zh') and full.allows('pkuseg_medicine')
+    print(f"  lite: {lite.backends}")
+    print(f"  full: {full.backends}")
+
+
+def test_profile_restricts_processor():
+    """测试lite配置下重量级后端不会被注册"""
+    print("\n=== 测试lite配置下的TextProcessor ===")
+
+    processor = TextProcessor(profile='lite')
+    stats = processor.backends.get_stats()
+    disabled = [name for name, info in stats.items() if info['state'] == 'disabled']
+    print(f"  被禁用的后端: {disabled}")
+
+    for name in ['pkuseg_default', 'thulac', 'stanza_zh', 'uer_roberta_dianping']:
+        assert not processor.backends.is_available(name)
+    assert processor.qwen3_monitor is None
+    assert processor.get_nlp_capabilities()['profile']['name'] == 'lite'
+
+    # 基础功能仍然可用
+    processor.load_text("这个产品很好，我非常满意。")
+    assert processor.analyze_sentiment()['available']
+
+
+def test_profile_file_and_env():
+    """测试配置文件中的自定义配置和环境变量选择"""
+    print("\n=== 测试配置文件和环境变量 ===")
+
+    config = {
+        'default': 'news',
+        'profiles': {'news': {'description': '新闻', 'backends': ['jieba', 'pkuseg_news']}}
+    }
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump(config, f)
+        path = f.name
+
+    try:
+        profile = resolve_profile(path=path)
+        assert profile.name == 'news'
+        assert profile.allows('pkuseg_news') and not profile.allows('pkuseg_web')
+        # 未配置warmup时预热配置中列出的具体后端
+        assert profile.warmup == ['jieba', 'pkuseg_news']
+        assert 'bert_base_chinese' not in resolve_profile('full', path=path).warmup
+
+        os.environ['NLP_PROFILE'] = 'lite'
+        try:
+            assert resolve_profile(path=path).name == 'lite'
+        finally:
+            del os.environ['NLP_PROFILE']
+
+        try:
+            resolve_profile('unknown', path=path)
+            assert False, "未知配置应抛出ValueError"
+        except ValueError as e:
+            print(f"  未知配置: {e}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    test_builtin_profiles()
+    test_profile_restricts_processor()
+    test_profile_file_and_env()
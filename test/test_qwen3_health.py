@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+测试Qwen3健康监测和熔断器
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.qwen3_health import CircuitBreaker, Qwen3HealthMonitor
+from code_model.text_tools import TextProcessor
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_circuit_breaker_states():
+    """测试熔断器的关闭、打开、半开状态切换"""
+    print("=== 测试熔断器状态切换 ===")
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10, clock=clock)
+
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow_request()
+
+    # 恢复时间过后进入半开，只放行一个试探请求
+    clock.now = 10
+    assert breaker.state == 'half_open'
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    # 试探失败重新打开
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    # 再次半开后试探成功则关闭
+    clock.now = 20
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    print(f"  最终状态: {breaker.get_status()}")
+
+
+def test_monitor_fails_fast():
+    """测试服务不可用时请求路径快速失败"""
+    print("\n=== 测试健康监测快速失败 ===")
+
+    def dead_probe():
+        raise ConnectionError("连接被拒绝")
+
+    monitor = Qwen3HealthMonitor('http://localhost:6006/api/chat', 'qwen3:8b',
+                                 interval=60, probe=dead_probe)
+    start_time = time.perf_counter()
+    assert monitor.wait_first_check()
+    assert not monitor.is_available()
+    elapsed = time.perf_counter() - start_time
+    monitor.stop()
+
+    status = monitor.get_status()
+    print(f"  判断耗时: {elapsed:.3f}s, 状态: {status['state']}, 错误: {status['last_error']}")
+    assert status['state'] == 'open'
+    assert elapsed < 1.0
+
+
+def test_summary_falls_back_when_open():
+    """测试熔断器打开时Qwen3摘要直接降级"""
+    print("\n=== 测试Qwen3摘要降级 ===")
+
+    processor = TextProcessor()
+    if not processor.qwen3_monitor:
+        print("  requests不可用，跳过")
+        return
+
+    processor.qwen3_monitor._probe = lambda: False
+    processor.load_text("人工智能正在改变世界。机器学习是人工智能的核心技术。"
+                        "深度学习推动了图像识别的发展。自然语言处理让机器理解语言。")
+
+    start_time = time.perf_counter()
+    summary = processor.generate_summary(num_sentences=2, method='qwen3')
+    elapsed = time.perf_counter() - start_time
+    processor.qwen3_monitor.stop()
+
+    print(f"  降级摘要: {summary}")
+    print(f"  耗时: {elapsed:.3f}s")
+    assert summary
+    assert elapsed < 5.0
+
+
+
+def test_first_check_does_not_block():
+    """测试首次探测完成前可用性检查立即返回不可用，不阻塞请求路径"""
+    print("\n=== 测试首次探测不阻塞 ===")
+
+    release = threading.Event()
+
+    def slow_probe():
+        release.wait(5)
+        return True
+
+    monitor = Qwen3HealthMonitor('http://localhost:6006/api/chat', 'qwen3:8b',
+                                 interval=60, probe=slow_probe)
+    start_time = time.perf_counter()
+    assert not monitor.is_available()
+    elapsed = time.perf_counter() - start_time
+    print(f"  首次检查耗时: {elapsed:.3f}s")
+    assert elapsed < 0.5
+
+    release.set()
+    assert monitor.wait_first_check()
+    assert monitor.is_available()
+    monitor.stop()
+
+
+def test_availability_check_does_not_consume_trial():
+    """测试半开状态下反复检查可用性不占用试探名额，试探请求只在实际调用时放行一次"""
+    print("\n=== 测试半开状态的可用性检查 ===")
+
+    from code_model import text_tools
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+
+    def dead_probe():
+        raise ConnectionError("连接被拒绝")
+
+    monitor = Qwen3HealthMonitor('http://localhost:6006/api/chat', 'qwen3:8b',
+                                 interval=600, breaker=breaker, probe=dead_probe)
+    monitor.wait_first_check()
+    assert not monitor.is_available()
+    clock.now = 10
+    assert breaker.state == 'half_open'
+
+    processor = TextProcessor()
+    processor.qwen3_monitor = monitor
+
+    # 改写流程中多次读取 qwen3_client，都应为可用
+    assert all(processor.qwen3_client for _ in range(4))
+
+    class FakeResponse:
+        status_code = 200
+
+    class FakeRequests:
+        calls = 0
+
+        @classmethod
+        def post(cls, *args, **kwargs):
+            cls.calls += 1
+            assert breaker.state == 'half_open' and not breaker.can_attempt()
+            return FakeResponse()
+
+    original = text_tools.requests
+    text_tools.requests = FakeRequests
+    try:
+        response = processor._post_qwen3({}, {})
+    finally:
+        text_tools.requests = original
+        monitor.stop()
+
+    assert response.status_code == 200 and FakeRequests.calls == 1
+    assert breaker.state == 'closed'
+    print(f"  最终状态: {breaker.get_status()}")
+
+
+if __name__ == '__main__':
+    test_circuit_breaker_states()
+    test_monitor_fails_fast()
+    test_summary_falls_back_when_open()
+    test_first_check_does_not_block()
+    test_availability_check_does_not_consume_trial()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+测试批量分词（进程池并行）
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.text_tools import TextProcessor
+
+
+def test_segment_batch_preserves_order():
+    """测试并行分词结果与逐条分词一致，且顺序不变"""
+    print("=== 测试批量分词 ===")
+
+    processor = TextProcessor()
+    texts = [f"第{i}段文本，人工智能正在改变世界。" for i in range(40)] + ["", "最后一段"]
+
+    expected = [processor.segment_text(text, method='basic') for text in texts]
+    serial = processor.segment_batch(texts, method='basic', workers=1)
+    parallel = processor.segment_batch(texts, method='basic', workers=3)
+
+    print(f"  文本数: {len(texts)}, 第一条: {parallel[0]}")
+    assert serial == expected
+    assert parallel == expected
+    assert parallel[-2] == []
+
+
+def test_segment_batch_threaded_and_clamped():
+    """测试其他线程持有注册表锁时批量分词不会死锁，且进程数不超过 segment_workers"""
+    print("\n=== 测试多线程下的批量分词 ===")
+
+    processor = TextProcessor(segment_workers=2)
+    texts = [f"第{i}段文本，机器学习是人工智能的重要方向。" for i in range(20)]
+    expected = [processor.segment_text(text, method='basic') for text in texts]
+
+    holding = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with processor.backends._lock:
+            holding.set()
+            release.wait(10)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    assert holding.wait(5)
+    try:
+        assert processor.segment_batch(texts, method='basic', workers=1000) == expected
+        assert processor._segment_pool._max_workers == 2
+    finally:
+        release.set()
+        holder.join()
+        processor.shutdown_segment_pool()
+
+
+def test_segment_batch_empty():
+    """测试空输入"""
+    processor = TextProcessor()
+    assert processor.segment_batch([], workers=4) == []
+
+
+if __name__ == '__main__':
+    test_segment_batch_preserves_order()
+    test_segment_batch_threaded_and_clamped()
+    test_segment_batch_empty()
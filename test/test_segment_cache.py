@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+测试分词结果缓存
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.segment_cache import SegmentCache
+from code_model.segmented_doc import SegmentedDoc
+from code_model.text_tools import TextProcessor
+
+
+def test_lru_byte_budget():
+    """测试按字节容量的LRU淘汰和命中统计"""
+    print("=== 测试缓存容量和LRU淘汰 ===")
+
+    docs = {name: SegmentedDoc.from_words([f'{name}{i}' for i in range(50)]) for name in 'abc'}
+    budget = docs['a'].nbytes * 2 + 10
+    cache = SegmentCache(max_mb=budget / 1024 / 1024)
+
+    keys = {name: SegmentCache.make_key(name, 'jieba', 'accurate', False) for name in 'abc'}
+    cache.put(keys['a'], docs['a'])
+    cache.put(keys['b'], docs['b'])
+    assert cache.get(keys['a']) is docs['a']   # a变为最近使用
+    cache.put(keys['c'], docs['c'])            # 超出容量，淘汰b
+
+    assert cache.get(keys['b']) is None
+    assert cache.get(keys['c']) is docs['c']
+    stats = cache.get_stats()
+    print(f"  {stats}")
+    assert stats['hits'] == 2 and stats['misses'] == 1
+    assert stats['evictions'] == 1
+    assert stats['bytes'] <= stats['max_bytes']
+
+    # 方法、模式或词性标注不同的键互不影响
+    assert SegmentCache.make_key('a', 'jieba', 'accurate', True) != keys['a']
+
+
+def test_processor_segments_once():
+    """测试同一文本的多个功能只分词一次"""
+    print("\n=== 测试多个功能共用分词结果 ===")
+
+    processor = TextProcessor()
+    processor.load_text("人工智能是计算机科学的一个分支。人工智能研究机器学习。"
+                        "机器学习是人工智能的重要方向。深度学习是机器学习的子领域。")
+
+    processor.word_frequency()
+    processor.get_text_stats()
+    processor.generate_summary(num_sentences=2, method='frequency')
+    processor.generate_summary(num_sentences=2, method='hybrid')
+
+    stats = processor.get_nlp_capabilities()['segment_cache']
+    print(f"  {stats}")
+    # 词频和两种摘要共用同一次分词
+    assert stats['misses'] == 1 and stats['entries'] == 1
+    assert stats['hits'] >= 2
+
+    disabled = TextProcessor(segment_cache_mb=0)
+    disabled.load_text("人工智能 机器学习")
+    disabled.word_frequency()
+    assert disabled.segment_cache.get_stats()['entries'] == 0
+
+
+if __name__ == '__main__':
+    test_lru_byte_budget()
+    test_processor_segments_once()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+测试大文件流式分词
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.text_tools import TextProcessor
+
+
+def _write_temp(text: str) -> str:
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8', newline='') as f:
+        f.write(text)
+        return f.name
+
+
+def test_segment_file_offsets():
+    """测试分块只在句子边界切分，且偏移指向整个文件中的位置"""
+    print("=== 测试流式分词 ===")
+
+    text = "人工智能 正在 改变 世界。\r\n机器学习 是 核心；深度学习 很 重要！" * 50 + "最后 一句"
+    path = _write_temp(text)
+    processor = TextProcessor()
+
+    try:
+        tokens = list(processor.segment_file(path, method='basic', chunk_chars=64))
+        print(f"  词数: {len(tokens)}, 前三个: {tokens[:3]}")
+
+        for token in tokens:
+            assert text[token['start']:token['end']] == token['word']
+
+        # 分块结果与整体分词一致（没有词被切开）
+        assert [token['word'] for token in tokens] == processor.segment_text(text, method='basic').words
+
+        docs = list(processor.segment_file(path, method='basic', chunk_chars=64, batch=True))
+        assert len(docs) > 1
+        assert sum(len(doc) for doc in docs) == len(tokens)
+        assert processor.segment_cache.get_stats()['entries'] <= 1, "流式分词不应写入分词缓存"
+    finally:
+        os.remove(path)
+
+
+def test_segment_file_without_boundaries():
+    """测试没有句子边界的超长片段也能分块"""
+    text = "abc def " * 100
+    path = _write_temp(text)
+    try:
+        tokens = list(TextProcessor().segment_file(path, method='basic', chunk_chars=50))
+        assert len(tokens) == 200
+        assert all(text[t['start']:t['end']] == t['word'] for t in tokens)
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    test_segment_file_offsets()
+    test_segment_file_without_boundaries()
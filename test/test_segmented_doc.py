@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+测试紧凑的分词结果结构
+"""
+
+import sys
+import os
+import json
+import pickle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.segmented_doc import SegmentedDoc
+from code_model.text_tools import TextProcessor
+
+
+def test_dict_compatible_view():
+    """测试下标访问、遍历和JSON转换与原来的字典列表一致"""
+    print("=== 测试字典兼容视图 ===")
+
+    doc = SegmentedDoc.from_pairs([('我', 'r'), ('爱', 'v'), ('北京', 'ns'), ('北京', 'ns')])
+    expected = [{'word': '我', 'pos': 'r'}, {'word': '爱', 'pos': 'v'},
+                {'word': '北京', 'pos': 'ns'}, {'word': '北京', 'pos': 'ns'}]
+
+    assert len(doc) == 4
+    assert doc[2] == {'word': '北京', 'pos': 'ns'}
+    assert [seg['word'] for seg in doc] == ['我', '爱', '北京', '北京']
+    assert doc == expected
+    assert json.loads(json.dumps(doc.to_list(), ensure_ascii=False)) == expected
+    assert doc.words[2] is doc.words[3], "重复的词应共用同一个字符串对象"
+    assert doc[1:3].pos_tags == ['v', 'ns']
+
+    plain = SegmentedDoc.from_words(['你好', '世界'])
+    assert not plain.has_pos
+    assert plain.to_list() == [{'word': '你好'}, {'word': '世界'}]
+    assert SegmentedDoc.from_words(['你好'], pos='UNK')[0] == {'word': '你好', 'pos': 'UNK'}
+
+    # 进程池返回结果需要可序列化
+    assert pickle.loads(pickle.dumps(doc)) == doc
+
+
+def test_processor_returns_segmented_doc():
+    """测试分词器和词频统计使用SegmentedDoc"""
+    print("\n=== 测试TextProcessor分词结果 ===")
+
+    processor = TextProcessor()
+    processor.load_text("科学技术 市场经济 科学技术，环境保护。")
+
+    segments = processor.segment_text(method='basic', with_pos=True)
+    print(f"  {segments}")
+    assert isinstance(segments, SegmentedDoc)
+    assert segments[0] == {'word': '科学技术', 'pos': 'UNK', 'start': 0, 'end': 4}
+    assert processor.segment_text("   ") == []
+
+    freq = processor.word_frequency(segmentation_method='basic', exclude_stopwords=False)
+    assert freq['科学技术'] == 2
+
+
+def test_offsets_recorded_during_segmentation():
+    """测试分词结果带有原文偏移，可直接用于高亮和对齐"""
+    print("\n=== 测试字符偏移 ===")
+
+    processor = TextProcessor()
+    text = "  人工智能，正在改变 世界！\n机器学习 是核心。"
+    segments = processor.segment_text(text, method='basic')
+    for token in segments:
+        assert text[token['start']:token['end']] == token['word']
+
+    # 分词器丢弃空白和标点时，顺序定位也能对齐
+    doc = SegmentedDoc.from_pairs([('人工', 'n'), ('智能', 'n'), ('世界', 'n')], text="人工智能，世界")
+    assert list(doc.starts) == [0, 2, 5]
+    assert doc.shifted(10)[2] == {'word': '世界', 'pos': 'n', 'start': 15, 'end': 17}
+
+
+def test_sentence_words_sliced_from_document():
+    """测试摘要评分的句子词列表从全文分词结果按偏移截取，分词方法只解析一次"""
+    print("\n=== 测试句子词列表 ===")
+
+    processor = TextProcessor()
+    processor.load_text("科学技术是第一生产力。Market Economy推动社会发展！\n\n环境保护需要全社会共同努力。")
+    sentences = processor._split_sentences(processor.text)
+
+    selections = []
+    select_segmenter = processor.select_segmenter
+    processor.select_segmenter = lambda *args, **kw: selections.append(args) or select_segmenter(*args, **kw)
+    word_lists = processor._sentence_word_lists(sentences)
+    print(f"  {word_lists}")
+
+    assert selections == [(len(processor.text), False)]
+    method = processor._resolve_segment_method('auto', len(processor.text))
+    assert word_lists == [[word.lower() for word in processor.segment_text(sentence, method=method).words]
+                          for sentence in sentences]
+    assert word_lists[1][:2] == ['market', 'economy']
+
+    summary = processor.generate_summary(num_sentences=1)
+    assert summary
+
+
+if __name__ == '__main__':
+    test_dict_compatible_view()
+    test_processor_returns_segmented_doc()
+    test_offsets_recorded_during_segmentation()
+    test_sentence_words_sliced_from_document()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+测试自动分词器选择（按吞吐量和延迟预算）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.segmenter_policy import SegmenterPolicy
+from code_model.text_tools import TextProcessor
+
+
+def test_choose_by_length_and_budget():
+    """测试短文本选准确的分词器，长文本选能在预算内完成的分词器"""
+    print("=== 测试按文本长度选择分词器 ===")
+
+    policy = SegmenterPolicy(latency_budget_ms=200)
+    checked = []
+
+    def available(name):
+        checked.append(name)
+        return True
+
+    short = policy.choose(1_000, available)
+    print(f"  短文本: {short['method']} - {short['reason']}")
+    assert short['method'] == 'pkuseg_default'
+
+    checked.clear()
+    long = policy.choose(2_000_000, available)
+    print(f"  长文本: {long['method']} - {long['reason']}")
+    assert long['method'] != 'pkuseg_default'
+    assert long['estimated_ms'] <= long['budget_ms'] or long['method'] == 'basic'
+    assert 'pkuseg_default' not in checked, "超出预算的分词器不应被加载"
+    assert any(item['method'] == 'pkuseg_default' for item in long['skipped'])
+
+    # 不可用的分词器被跳过
+    fallback = policy.choose(1_000, lambda name: name == 'thulac')
+    assert fallback['method'] == 'thulac'
+
+
+def test_measured_throughput():
+    """测试实测吞吐量覆盖默认估计"""
+    print("\n=== 测试实测吞吐量 ===")
+
+    policy = SegmenterPolicy(latency_budget_ms=100)
+    policy.record('pkuseg_default', 1_000, 10.0)      # 第一个样本（含初始化开销）不计入
+    assert policy.get_stats()['throughput']['pkuseg_default']['source'] == 'default'
+    policy.record('pkuseg_default', 1_000_000, 1.0)   # 实测100万字符/秒
+    policy.record('jieba', 50, 1.0)                    # 短文本不计入统计
+
+    stats = policy.get_stats()['throughput']
+    assert stats['pkuseg_default']['source'] == 'measured'
+    assert stats['jieba']['source'] == 'default'
+
+    choice = policy.choose(50_000, lambda name: True)
+    print(f"  {choice}")
+    assert choice['method'] == 'pkuseg_default'
+
+    # 都超出预算时选择最快的分词器
+    slow = SegmenterPolicy(latency_budget_ms=0.001)
+    assert slow.choose(100_000, lambda name: True)['method'] == 'basic'
+
+
+def test_slow_sample_decays():
+    """测试偏慢的实测值随时间衰减回默认估计，被跳过的分词器之后会重新被选中"""
+    print("\n=== 测试实测吞吐量衰减 ===")
+
+    from code_model import segmenter_policy
+
+    policy = SegmenterPolicy(latency_budget_ms=200)
+    policy.record('pkuseg_default', 1_000, 1.0)
+    policy.record('pkuseg_default', 1_000, 2.5)  # 偶然偏慢：400字符/秒
+    assert policy.choose(1_000, lambda name: True)['method'] != 'pkuseg_default'
+
+    # 模拟很久没有新样本
+    key = ('pkuseg_default', False)
+    policy._measured_at[key] -= 20 * segmenter_policy.THROUGHPUT_HALF_LIFE_S
+    rate = policy.throughput('pkuseg_default')
+    assert abs(rate - segmenter_policy.DEFAULT_THROUGHPUT['pkuseg_default']) < 1
+    assert policy.choose(1_000, lambda name: True)['method'] == 'pkuseg_default'
+
+
+def test_load_time_not_measured():
+    """测试分词器的加载时间不计入吞吐量"""
+    print("\n=== 测试加载时间不计入吞吐量 ===")
+
+    import time
+
+    class SlowLoadingSegmenter:
+        def cut(self, text):
+            return [[word, 'n'] for word in text.split()]
+
+    def slow_loader():
+        time.sleep(0.5)
+        return SlowLoadingSegmenter()
+
+    processor = TextProcessor(segment_cache_mb=0, parallel_segment_chars=0)
+    processor.backends.register('thulac', slow_loader, group='segmenter')
+    text = "机器 学习 " * 2000
+    for _ in range(3):
+        processor.segment_text(text, method='thulac')
+
+    stats = processor.segmenter_policy.get_stats()['throughput']['thulac']
+    print(f"  {stats}")
+    assert stats['samples'] == 2
+    assert stats['chars_per_second'] > len(text) / 0.5
+
+
+def test_processor_auto():
+    """测试TextProcessor的auto分词报告选择结果"""
+    print("\n=== 测试auto分词 ===")
+
+    processor = TextProcessor(auto_latency_budget_ms=50)
+    selection = processor.select_segmenter(2_000_000)
+    print(f"  {selection['method']} - {selection['reason']}")
+    assert selection['method'] != 'pkuseg_default'
+
+    text = "人工智能是计算机科学的一个分支。" * 20
+    segments = processor.segment_text(text, method='auto')
+    assert len(segments) > 0
+    assert 'auto_segmenter' in processor.get_nlp_capabilities()
+
+
+if __name__ == '__main__':
+    test_choose_by_length_and_budget()
+    test_measured_throughput()
+    test_slow_sample_decays()
+    test_load_time_not_measured()
+    test_processor_auto()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+测试多进程启动入口的辅助函数
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'web_application'))
+
+from serve import get_memory_breakdown, create_listen_socket, parse_args, create_state_socket
+
+
+def test_memory_breakdown():
+    """测试共享/私有内存统计"""
+    print("=== 测试内存统计 ===")
+
+    memory = get_memory_breakdown(os.getpid())
+    if memory is None:
+        print("  当前平台不支持内存统计，跳过")
+        return
+
+    print(f"  当前进程: {memory}")
+    assert set(memory) == {'rss', 'pss', 'shared', 'private'}
+    assert memory['rss'] > 0
+
+
+def test_listen_socket():
+    """测试父进程创建的共享监听socket"""
+    print("\n=== 测试共享监听socket ===")
+
+    sock = create_listen_socket('127.0.0.1', 0)
+    try:
+        host, port = sock.getsockname()
+        print(f"  监听地址: {host}:{port}")
+        assert port > 0
+        assert sock.get_inheritable()
+    finally:
+        sock.close()
+
+
+def test_worker_count_from_env():
+    """测试工作进程数可通过环境变量配置"""
+    print("\n=== 测试工作进程数配置 ===")
+
+    os.environ['WEB_WORKERS'] = '3'
+    try:
+        args = parse_args([])
+    finally:
+        del os.environ['WEB_WORKERS']
+    print(f"  workers={args.workers}")
+    assert args.workers == 3
+    assert parse_args(['--workers', '5']).workers == 5
+    assert parse_args([]).workers == 1
+
+
+def test_state_socket_loopback():
+    """测试状态进程只监听本机回环地址"""
+    print("\n=== 测试状态进程socket ===")
+
+    sock = create_state_socket()
+    try:
+        host, port = sock.getsockname()[:2]
+        print(f"  状态进程地址: {host}:{port}")
+        assert host == '127.0.0.1' and port > 0
+    finally:
+        sock.close()
+
+
+def test_stateful_request_routing():
+    """测试只有读写进程内状态的请求才转发给状态进程"""
+    print("\n=== 测试有状态请求的划分 ===")
+
+    try:
+        from web_backend import is_stateful_request
+    except ImportError as e:
+        print(f"  Flask不可用，跳过: {e}")
+        return
+
+    assert is_stateful_request('load_text', {'text': '你好'})
+    assert is_stateful_request('corpus_top_terms', None)
+    assert is_stateful_request('segment_text', {})
+    assert not is_stateful_request('segment_text', {'text': '你好'})
+    assert not is_stateful_request('segment_batch', {'texts': ['你好']})
+    assert not is_stateful_request(None, None)
+
+
+if __name__ == '__main__':
+    test_memory_breakdown()
+    test_listen_socket()
+    test_worker_count_from_env()
+    test_state_socket_loopback()
+    test_stateful_request_routing()
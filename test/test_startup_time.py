@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+启动时间基准测试 - 测量 code_model.text_tools 的冷启动导入耗时
+防止重量级库重新回到模块顶层导入
+"""
+
+import sys
+import os
+import json
+import subprocess
+import statistics
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 冷启动导入耗时上限（秒），可通过环境变量调整
+IMPORT_BUDGET_SECONDS = float(os.environ.get('STARTUP_IMPORT_BUDGET', '0.5'))
+
+# 导入text_tools时不应该被加载的重量级库
+HEAVY_MODULES = [
+    'spacy', 'textblob', 'vaderSentiment', 'stanza', 'transformers', 'torch',
+    'snownlp', 'jieba', 'pkuseg', 'thulac', 'requests'
+]
+
+MEASURE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import code_model.text_tools
+elapsed = time.perf_counter() - start
+heavy = [name for name in %r if name in sys.modules]
+print(json.dumps({'elapsed': elapsed, 'heavy_modules': heavy}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_cold_import() -> dict:
+    """在新进程中测量一次冷启动导入"""
+    output = subprocess.check_output(
+        [sys.executable, '-c', MEASURE_SCRIPT],
+        cwd=PROJECT_ROOT,
+        text=True
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_cold_import_time():
+    """测试冷启动导入耗时和重量级库是否被延迟导入"""
+    print("=== 冷启动导入测试 ===")
+
+    result = measure_cold_import()
+    print(f"  导入耗时: {result['elapsed'] * 1000:.1f}ms (上限 {IMPORT_BUDGET_SECONDS * 1000:.0f}ms)")
+    print(f"  已导入的重量级库: {result['heavy_modules'] or '无'}")
+
+    assert result['heavy_modules'] == [], f"以下库不应在导入时加载: {result['heavy_modules']}"
+    assert result['elapsed'] < IMPORT_BUDGET_SECONDS
+
+
+def run_benchmark(rounds: int = 10):
+    """多次测量冷启动导入耗时并输出统计"""
+    print(f"=== 冷启动导入基准（{rounds} 轮）===")
+    timings = [measure_cold_import()['elapsed'] * 1000 for _ in range(rounds)]
+    print(f"  最小: {min(timings):.1f}ms")
+    print(f"  中位数: {statistics.median(timings):.1f}ms")
+    print(f"  最大: {max(timings):.1f}ms")
+
+
+if __name__ == '__main__':
+    test_cold_import_time()
+    run_benchmark()
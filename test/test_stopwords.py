@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+测试停用词管理器（合并集合缓存和版本号）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.stopwords import StopwordsManager
+
+
+def test_merged_set_cached_until_custom_change():
+    """测试合并后的停用词集合只在自定义停用词变化时重建"""
+    print("=== 测试停用词缓存 ===")
+
+    manager = StopwordsManager()
+    merged = manager.get_all_stopwords()
+    assert isinstance(merged, frozenset)
+    assert manager.get_all_stopwords() is merged
+    assert manager.is_stopword('the') and not manager.is_stopword('人工智能')
+    version = manager.version
+
+    manager.add_custom_stopwords(['人工智能', '  机器学习 '])
+    assert manager.version == version + 1
+    assert manager.is_stopword('人工智能') and manager.is_stopword('机器学习')
+    assert manager.get_all_stopwords() is not merged
+
+    # 没有实际变化时版本号不变，缓存继续有效
+    cached = manager.get_all_stopwords()
+    manager.add_custom_stopwords('人工智能')
+    manager.remove_custom_stopwords('不存在的词')
+    assert manager.version == version + 1
+    assert manager.get_all_stopwords() is cached
+
+    manager.remove_custom_stopwords('人工智能')
+    assert not manager.is_stopword('人工智能')
+    manager.clear_custom_stopwords()
+    assert manager.version == version + 3
+    assert manager.get_all_stopwords() == merged
+    print(f"  版本号: {manager.version}, 停用词数: {len(manager.get_all_stopwords())}")
+
+
+if __name__ == '__main__':
+    test_merged_set_cached_until_custom_change()
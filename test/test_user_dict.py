@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+测试用户词典（增量更新和编译缓存）
+"""
+
+import sys
+import os
+import tempfile
+import json
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_model.user_dict import UserDictionary, parse_dict_lines
+from code_model.text_tools import TextProcessor
+
+
+class FakeTokenizer:
+    """模拟jieba.Tokenizer中用户词典用到的部分"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.dictionary = 'dict.txt'
+        self.FREQ = {}
+        self.total = 0
+        self.user_word_tag_tab = {}
+        self.initialized = False
+        self.initialize_calls = 0
+
+    def initialize(self):
+        self.initialize_calls += 1
+        self.FREQ = {'北京': 100, '北': 0}
+        self.total = 100
+        self.initialized = True
+
+    def add_word(self, word, freq=None, tag=None):
+        freq = 10 if freq is None else freq
+        self.FREQ[word] = freq
+        self.total += freq
+        if tag:
+            self.user_word_tag_tab[word] = tag
+
+    def del_word(self, word):
+        self.add_word(word, 0)
+
+
+def test_incremental_updates_and_cache():
+    """测试增量添加/删除词汇，新进程从编译缓存启动"""
+    print("=== 测试用户词典 ===")
+
+    with tempfile.TemporaryDirectory() as storage, tempfile.TemporaryDirectory() as cache:
+        user_dict = UserDictionary('news', storage_dir=storage, cache_dir=cache)
+        tokenizer = FakeTokenizer()
+        assert user_dict.attach(tokenizer) is False
+        assert tokenizer.initialize_calls == 1
+
+        assert user_dict.add_words(['大语言模型', {'word': '通义千问', 'freq': 50, 'tag': 'nz'}]) == 2
+        assert tokenizer.FREQ['通义千问'] == 50
+        assert tokenizer.user_word_tag_tab['通义千问'] == 'nz'
+        assert user_dict.remove_words(['北京']) == 1
+        assert tokenizer.FREQ['北京'] == 0
+        assert tokenizer.initialize_calls == 1, "修改词典不应重新初始化"
+
+        words = user_dict.get_words()
+        print(f"  词典: {words}")
+        assert [w['word'] for w in words['words']] == ['大语言模型', '通义千问']
+        assert words['removed'] == ['北京']
+
+        # 新进程：从编译缓存加载，不执行initialize
+        fresh = FakeTokenizer()
+        assert UserDictionary('news', storage_dir=storage, cache_dir=cache).attach(fresh) is True
+        assert fresh.initialize_calls == 0
+        assert fresh.FREQ['通义千问'] == 50 and fresh.FREQ['北京'] == 0
+
+        # 其他进程修改词典后，refresh按差异增量应用
+        UserDictionary('news', storage_dir=storage, cache_dir=cache).add_words(['多模态'])
+        os.utime(user_dict.path, (0, 0))
+        assert user_dict.refresh(force=True)
+        assert tokenizer.FREQ['多模态'] == 10
+
+
+def test_entry_removed_from_file_is_deleted():
+    """测试其他进程从词典文件中移除的词被删除，而不是按默认词频重新添加"""
+    print("\n=== 测试词典文件移除条目 ===")
+
+    with tempfile.TemporaryDirectory() as storage, tempfile.TemporaryDirectory() as cache:
+        user_dict = UserDictionary('news', storage_dir=storage, cache_dir=cache)
+        tokenizer = FakeTokenizer()
+        user_dict.attach(tokenizer)
+        user_dict.add_words(['量子纠缠态', '多模态'])
+
+        with open(user_dict.path, 'w', encoding='utf-8') as f:
+            json.dump({'多模态': [None, None]}, f)
+        os.utime(user_dict.path, (0, 0))
+        assert user_dict.refresh(force=True)
+        assert tokenizer.FREQ['量子纠缠态'] == 0 and tokenizer.FREQ['多模态'] == 10
+
+        # 已删除的词不会在下次刷新时再次应用
+        os.utime(user_dict.path, (1, 1))
+        assert user_dict.refresh(force=True) is False
+
+        # 内置分词器重建后也不再包含该词
+        os.environ['NLP_USER_DICT_DIR'] = storage
+        try:
+            processor = TextProcessor()
+        finally:
+            del os.environ['NLP_USER_DICT_DIR']
+        processor.add_user_words(['量子纠缠态'])
+        assert processor.segment_text('量子纠缠态', method='basic').words == ['量子纠缠态']
+        with open(processor.user_dict.path, 'w', encoding='utf-8') as f:
+            json.dump({}, f)
+        os.utime(processor.user_dict.path, (2, 2))
+        processor.user_dict._last_check = float('-inf')
+        assert processor.segment_text('量子纠缠态', method='basic').words != ['量子纠缠态']
+
+
+def test_default_cache_dir_is_per_user():
+    """测试默认编译缓存位于用户缓存目录下，而不是所有用户可写的临时目录"""
+    previous = os.environ.pop('NLP_USER_DICT_CACHE_DIR', None)
+    os.environ['XDG_CACHE_HOME'] = '/home/demo/.cache'
+    try:
+        user_dict = UserDictionary('news', storage_dir=tempfile.gettempdir())
+        assert user_dict.cache_path == '/home/demo/.cache/nlp_process_demo/nlp_jieba_userdict_news.cache'
+        assert not user_dict.cache_path.startswith(tempfile.gettempdir())
+    finally:
+        del os.environ['XDG_CACHE_HOME']
+        if previous is not None:
+            os.environ['NLP_USER_DICT_CACHE_DIR'] = previous
+
+
+def test_parse_dict_lines():
+    """测试jieba用户词典格式解析"""
+    terms = parse_dict_lines(['# 注释', '云计算 5', '创新办 3 i', '凱特琳 nz', ''])
+    assert terms == [('云计算', 5, None), ('创新办', 3, 'i'), ('凱特琳', None, 'nz')]
+
+
+if __name__ == '__main__':
+    test_incremental_updates_and_cache()
+    test_entry_removed_from_file_is_deleted()
+    test_default_cache_dir_is_per_user()
+    test_parse_dict_lines()
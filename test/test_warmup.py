@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+测试模型预热和就绪检查
+"""
+
+import sys
+import os
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, 'web_application'))
+
+from code_model.text_tools import TextProcessor
+
+
+def test_warmup_states():
+    """测试预热会对每个后端执行推理，并记录warm/failed状态和耗时"""
+    print("=== 测试模型预热 ===")
+
+    processor = TextProcessor()
+    calls = []
+    processor.backends.register('dummy_pipeline', lambda: lambda text: calls.append(text) or [],
+                                group='nlp')
+    processor.backends.register('broken_model', lambda: None, group='nlp')
+
+    status = processor.get_warmup_status()
+    assert status['state'] == 'pending' and not status['ready']
+    assert not processor.is_ready()
+
+    status = processor.warmup(['dummy_pipeline', 'broken_model'])
+    print(f"  预热状态: {status}")
+
+    assert status['ready'] and processor.is_ready()
+    assert status['models']['dummy_pipeline']['state'] == 'warm'
+    assert status['models']['dummy_pipeline']['warmup_time'] is not None
+    assert status['models']['broken_model']['state'] == 'failed'
+    assert calls == [TextProcessor.WARMUP_TEXT_ZH]
+
+
+def test_default_warmup_follows_profile():
+    """测试默认只预热部署配置的warmup列表，环境变量可以覆盖"""
+    print("\n=== 测试默认预热列表 ===")
+
+    processor = TextProcessor(profile='full')
+    processor.backends.register('bert_base_chinese', lambda: object(), group='nlp')
+    names = processor.warmup_names()
+    print(f"  默认预热: {names}")
+    assert 'bert_base_chinese' not in names
+    assert set(names) <= set(processor.profile.warmup)
+
+    processor.backends.register('dummy_pipeline', lambda: lambda text: [], group='nlp')
+    os.environ['NLP_WARMUP_BACKENDS'] = 'dummy_pipeline, missing_model'
+    try:
+        assert processor.warmup_names() == ['dummy_pipeline']
+        status = processor.warmup()
+    finally:
+        del os.environ['NLP_WARMUP_BACKENDS']
+    assert list(status['models']) == ['dummy_pipeline']
+    assert not processor.backends.is_loaded('bert_base_chinese')
+
+
+def test_warmup_respects_memory_budget():
+    """测试超出内存预算后剩余的后端跳过预热，不会互相卸载"""
+    print("\n=== 测试预热内存预算 ===")
+
+    processor = TextProcessor(memory_budget_mb=40)
+    for name in ('big_a', 'big_b'):
+        processor.backends.register(name, lambda: (lambda data: lambda text: data[:1])(b'x' * (80 << 20)),
+                                    group='nlp')
+
+    status = processor.warmup(['big_a', 'big_b'])
+    print(f"  预热状态: {status['models']}")
+    assert status['ready']
+    assert status['models']['big_a']['state'] == 'warm'
+    assert status['models']['big_b']['state'] == 'skipped'
+    assert processor.backends.is_loaded('big_a') and not processor.backends.is_loaded('big_b')
+    assert processor.backends.get_memory_stats()['evictions'] == 0
+    processor.backends.evict('big_a')
+
+
+def test_ready_endpoint():
+    """测试 /api/ready 在预热完成前返回503"""
+    print("\n=== 测试就绪检查接口 ===")
+
+    try:
+        from web_backend import app, processor
+    except ImportError as e:
+        print(f"  Flask不可用，跳过: {e}")
+        return
+
+    client = app.test_client()
+    assert client.get('/api/health').status_code == 200
+    if not processor.is_ready():
+        assert client.get('/api/ready').status_code == 503
+
+    processor.warmup([])
+    response = client.get('/api/ready')
+    print(f"  /api/ready: {response.status_code} {response.get_json()}")
+    assert response.status_code == 200
+    assert response.get_json()['ready']
+
+
+if __name__ == '__main__':
+    test_warmup_states()
+    test_default_warmup_follows_profile()
+    test_warmup_respects_memory_budget()
+    test_ready_endpoint()
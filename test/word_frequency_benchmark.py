@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+词频统计流水线基准测试 - 对比原来的多遍处理和合并后的单遍处理
+
+原流水线：每个标点符号一次 text.replace（约45次全文复制），分词后6个列表推导式依次过滤
+单遍流水线：一个字符类正则一次完成替换，所有过滤条件合并为一个判断，词直接流入计数器
+
+两者共用同一次分词结果，分别测量预处理和过滤计数阶段的耗时与内存分配峰值（tracemalloc），
+并检查统计结果一致。
+
+用法:
+    python test/word_frequency_benchmark.py            # 默认50MB文本
+    python test/word_frequency_benchmark.py --mb 5
+"""
+
+import argparse
+import os
+import string
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+# 添加父目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from code_model.text_tools import TextProcessor
+from test_data_generator import TestDataGenerator
+
+
+def build_text(megabytes: float) -> str:
+    """由测试数据重复构造指定大小（UTF-8字节数）的文本"""
+    generator = TestDataGenerator()
+    paragraphs = [text for _, text, _ in generator.generate_summary_test_data()]
+    paragraphs += [text for _, text in generator.generate_basic_text_samples()]
+    unit = '\n'.join(paragraphs) + '\n'
+    repeat = int(megabytes * 1024 * 1024 / len(unit.encode('utf-8'))) + 1
+    return unit * repeat
+
+
+# ---------- 原流水线（合并前的 word_frequency） ----------
+
+def legacy_preprocess(text: str) -> str:
+    text = text.lower()
+    chinese_punctuation = '，。！？；：""''（）【】《》、“”……'
+    english_punctuation = string.punctuation
+    for punct in chinese_punctuation + english_punctuation:
+        text = text.replace(punct, ' ')
+    return text.replace('\n', ' ').replace('\r', ' ')
+
+
+def legacy_count(words: list, stopwords_manager) -> dict:
+    chinese_punctuation = '，。！？；：""''（）【】《》、""……'
+    all_punctuation = chinese_punctuation + string.punctuation
+    words = [word for word in words if not all(c in all_punctuation for c in word)]
+    words = [word for word in words if word.strip() and len(word) >= 1]
+    words = [word for word in words if not word.isdigit()]
+    words = [word for word in words if len(word) > 1]
+    words = stopwords_manager.filter_stopwords(words)
+    return dict(Counter(words))
+
+
+# ---------- 单遍流水线（当前的 word_frequency） ----------
+
+def fused_preprocess(text: str) -> str:
+    return TextProcessor._FREQ_PUNCT_PATTERN.sub(' ', text.lower())
+
+
+def fused_count(words: list, stopwords_manager) -> dict:
+    keep = TextProcessor._compile_word_filter(2, True, stopwords_manager.get_all_stopwords())
+    return dict(Counter(filter(keep, words)))
+
+
+def measure(func, *args) -> dict:
+    """测量耗时（不开启tracemalloc），再单独测量内存分配峰值"""
+    start_time = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'result': result, 'seconds': elapsed, 'peak_mb': peak / 1024 / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='词频统计流水线基准测试')
+    parser.add_argument('--mb', type=float, default=50, help='文本大小（MB）')
+    parser.add_argument('--method', default='auto', help='分词方法')
+    args = parser.parse_args()
+
+    processor = TextProcessor(segment_cache_mb=0)
+    text = build_text(args.mb)
+
+    print("=" * 64)
+    print(f"词频统计流水线对比（{len(text.encode('utf-8')) / 1024 / 1024:.1f}MB，{len(text) / 1e6:.1f}M 字符）")
+    print("=" * 64)
+
+    legacy_pre = measure(legacy_preprocess, text)
+    fused_pre = measure(fused_preprocess, text)
+    assert legacy_pre['result'] == fused_pre['result'], "预处理结果应一致"
+
+    # 两条流水线共用同一次分词
+    start_time = time.perf_counter()
+    words = processor.segment_text(fused_pre['result'], method=args.method).words
+    segment_seconds = time.perf_counter() - start_time
+
+    legacy_cnt = measure(legacy_count, words, processor.stopwords_manager)
+    fused_cnt = measure(fused_count, words, processor.stopwords_manager)
+    assert legacy_cnt['result'] == fused_cnt['result'], "词频统计结果应一致"
+
+    print(f"\n分词（两者共用）: {segment_seconds:.2f}s，{len(words)} 个词，"
+          f"{len(fused_cnt['result'])} 个不重复词")
+    print(f"\n{'阶段':<12}{'原流水线(s)':>14}{'单遍(s)':>12}{'加速比':>10}{'原峰值(MB)':>14}{'单遍峰值(MB)':>14}")
+    for name, legacy, fused in [('标点替换', legacy_pre, fused_pre), ('过滤计数', legacy_cnt, fused_cnt)]:
+        print(f"{name:<12}{legacy['seconds']:>14.3f}{fused['seconds']:>12.3f}"
+              f"{legacy['seconds'] / max(fused['seconds'], 1e-9):>9.1f}x"
+              f"{legacy['peak_mb']:>14.1f}{fused['peak_mb']:>14.1f}")
+
+    legacy_total = legacy_pre['seconds'] + segment_seconds + legacy_cnt['seconds']
+    fused_total = fused_pre['seconds'] + segment_seconds + fused_cnt['seconds']
+    print(f"{'合计':<12}{legacy_total:>14.3f}{fused_total:>12.3f}{legacy_total / fused_total:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+文本处理工具 - 生产环境多进程启动入口
+
+在父进程中一次性加载并预热所有模型，再fork出多个工作进程共享同一个监听端口，
+工作进程启动时 /api/ready 即返回就绪。
+模型占用的内存页以写时复制（copy-on-write）的方式在工作进程间共享，
+而不是每个进程各自重新加载一份。
+
+load_text 加载的文本、自定义停用词和语料库索引保存在进程内存中。多个工作进程时，
+另外fork一个只监听本机回环端口的状态进程：读写这些状态的请求（web_backend.STATEFUL_ENDPOINTS）
+由工作进程转发给它，请求中带文本的分析、分词等无状态接口由各工作进程直接处理。
+
+用法:
+    python web_application/serve.py --port 5000
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+# 添加当前目录到路径，以便导入web_backend
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_memory_breakdown(pid: int) -> Optional[Dict[str, float]]:
+    """
+    获取进程的共享/私有内存（MB）
+
+    优先读取 /proc/<pid>/smaps_rollup，其次使用psutil；都不可用时返回None。
+    """
+    try:
+        values = {}
+        with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    values[parts[0][:-1]] = int(parts[1]) / 1024  # kB -> MB
+        return {
+            'rss': round(values.get('Rss', 0.0), 1),
+            'pss': round(values.get('Pss', 0.0), 1),
+            'shared': round(values.get('Shared_Clean', 0.0) + values.get('Shared_Dirty', 0.0), 1),
+            'private': round(values.get('Private_Clean', 0.0) + values.get('Private_Dirty', 0.0), 1)
+        }
+    except (OSError, ValueError):
+        pass
+
+    try:
+        import psutil
+        info = psutil.Process(pid).memory_full_info()
+        return {
+            'rss': round(info.rss / 1024 / 1024, 1),
+            'pss': round(getattr(info, 'pss', 0) / 1024 / 1024, 1),
+            'shared': round(getattr(info, 'shared', 0) / 1024 / 1024, 1),
+            'private': round(info.uss / 1024 / 1024, 1)
+        }
+    except Exception:
+        return None
+
+
+def report_memory(parent_pid: int, worker_pids: List[int], state_pid: Optional[int] = None) -> None:
+    """输出父进程、状态进程和每个工作进程的共享/私有内存"""
+    print("-" * 60)
+    print(f"{'进程':<16}{'RSS':>10}{'PSS':>10}{'共享':>10}{'私有':>10}  (MB)")
+    rows = [('master', parent_pid)] + ([('state', state_pid)] if state_pid else [])
+    rows += [(f'worker-{i}', pid) for i, pid in enumerate(worker_pids)]
+    for name, pid in rows:
+        memory = get_memory_breakdown(pid)
+        if memory is None:
+            print(f"{name:<16}{'不可用':>10}")
+            continue
+        print(f"{name:<16}{memory['rss']:>10}{memory['pss']:>10}{memory['shared']:>10}{memory['private']:>10}")
+    print("-" * 60)
+
+
+def create_listen_socket(host: str, port: int, backlog: int = 128) -> socket.socket:
+    """在父进程中创建监听socket，所有工作进程共享"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def preload_models(processor, names: Optional[List[str]] = None) -> None:
+    """
+    在父进程中加载并预热模型，并冻结GC以减少fork后的写时复制
+
+    names为None时按部署配置的warmup列表，['all']表示全部已注册后端（仍受内存预算限制）
+    """
+    if names == ['all']:
+        names = processor.backends.registered_names()
+    status = processor.warmup(names)
+    failed = [name for name, info in status['models'].items() if info['state'] == 'failed']
+    if failed:
+        print(f"⚠ 预热失败的后端: {', '.join(failed)}")
+
+    # 把已有对象移出GC跟踪，避免工作进程的垃圾回收触碰共享页
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+
+
+def run_worker(app, processor, sock: socket.socket, host: str, port: int,
+               state_server: Optional[Tuple[str, int]] = None) -> None:
+    """
+    工作进程：在共享socket上运行WSGI服务
+
+    state_server 为状态进程的地址时，有状态请求转发过去；None表示本进程自己保存状态
+    """
+    from werkzeug.serving import make_server
+
+    # 线程不会跨fork保留，需要在工作进程中重新启动后台健康监测
+    if processor.qwen3_monitor:
+        processor.qwen3_monitor.start()
+
+    app.config['STATE_SERVER'] = state_server
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    server.serve_forever()
+
+
+def spawn_worker(app, processor, sock, host, port, state_server=None) -> int:
+    """fork一个工作进程，返回子进程pid"""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(app, processor, sock, host, port, state_server)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def create_state_socket() -> socket.socket:
+    """状态进程的监听socket（本机回环地址、随机端口，只接收工作进程转发的请求）"""
+    return create_listen_socket('127.0.0.1', 0)
+
+
+def serve(workers: int, host: str, port: int, preload: Optional[List[str]] = None,
+          report_interval: float = 0.0) -> None:
+    """父进程主循环：加载模型、fork工作进程、重启异常退出的进程"""
+    from web_backend import app, processor
+
+    workers = max(workers, 1)
+
+    if not hasattr(os, 'fork'):
+        # Windows等不支持fork的平台退回单进程模式
+        print("当前平台不支持fork，以单进程模式运行")
+        app.run(host=host, port=port)
+        return
+
+    preload_models(processor, preload)
+    sock = create_listen_socket(host, port)
+
+    # 单个工作进程自己保存状态；多个工作进程时由独立的状态进程保存
+    state_sock = state_server = None
+    state_pid = None
+    if workers > 1:
+        state_sock = create_state_socket()
+        state_server = state_sock.getsockname()[:2]
+        state_pid = spawn_worker(app, processor, state_sock, *state_server)
+        print(f"✓ 状态进程: {state_pid}（{state_server[0]}:{state_server[1]}）")
+
+    worker_pids = [spawn_worker(app, processor, sock, host, port, state_server) for _ in range(workers)]
+    print(f"✓ 已启动 {workers} 个工作进程: {worker_pids}")
+    print(f"访问地址: http://{host}:{port}")
+
+    running = True
+
+    def shutdown(signum, frame):
+        nonlocal running
+        running = False
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    if hasattr(signal, 'SIGUSR1'):
+        # kill -USR1 <master_pid> 随时输出内存报告
+        signal.signal(signal.SIGUSR1, lambda signum, frame: report_memory(os.getpid(), worker_pids, state_pid))
+
+    # 等待工作进程完成启动后输出一次内存报告
+    time.sleep(1.0)
+    report_memory(os.getpid(), worker_pids, state_pid)
+    last_report = time.time()
+
+    while running:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+
+        if pid and pid in worker_pids and running:
+            index = worker_pids.index(pid)
+            print(f"⚠ 工作进程 {pid} 退出（状态 {status}），正在重启")
+            worker_pids[index] = spawn_worker(app, processor, sock, host, port, state_server)
+        elif pid and pid == state_pid and running:
+            print(f"⚠ 状态进程 {pid} 退出（状态 {status}），正在重启，已加载的文本和语料库丢失")
+            state_pid = spawn_worker(app, processor, state_sock, *state_server)
+
+        if report_interval and time.time() - last_report >= report_interval:
+            report_memory(os.getpid(), worker_pids, state_pid)
+            last_report = time.time()
+
+        time.sleep(0.5)
+
+    print("\n正在停止工作进程...")
+    children = worker_pids + ([state_pid] if state_pid else [])
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in children:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    sock.close()
+    if state_sock:
+        state_sock.close()
+    print("服务器已停止")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='文本处理工具多进程Web服务器')
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('WEB_WORKERS', 1)),
+                        help='工作进程数（默认取环境变量WEB_WORKERS或1；大于1时另启动一个状态进程）')
+    parser.add_argument('--host', default=os.environ.get('WEB_HOST', '0.0.0.0'), help='监听地址')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('WEB_PORT', 5000)), help='监听端口')
+    parser.add_argument('--preload', default='profile',
+                        help="预加载并预热的后端，逗号分隔；'profile'（默认）按部署配置的warmup列表，"
+                             "'all'表示全部已注册后端")
+    parser.add_argument('--report-interval', type=float, default=0.0,
+                        help='定期输出内存报告的间隔（秒），0表示只在启动时输出')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    preload = None if args.preload == 'profile' else [name.strip() for name in args.preload.split(',') if name.strip()]
+    serve(args.workers, args.host, args.port, preload, args.report_interval)
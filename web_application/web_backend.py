@@ -4,16 +4,21 @@
 使用Flask提供RESTful API接口
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 import os
 import json
 import sys
+import threading
+import http.client
 from datetime import datetime
+from typing import Optional
 
 # 添加父目录到路径，以便导入code_model模块
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from code_model.text_tools import TextProcessor
+from code_model.user_dict import parse_dict_lines
+from code_model.corpus_index import CorpusIndex
 
 app = Flask(__name__)
 CORS(app)  # 允许跨域请求
@@ -21,6 +26,75 @@ CORS(app)  # 允许跨域请求
 # 全局文本处理器实例
 processor = TextProcessor()
 
+# 读写本进程状态（当前文本、自定义停用词、语料库索引）的接口。
+# 多进程部署时只由一个状态进程处理，其他工作进程把这些请求转发过去（见 serve.py）；
+# 其余接口只使用请求中的数据、共享的模型和文件同步的用户词典，任意工作进程都可以处理
+STATEFUL_ENDPOINTS = frozenset({
+    'load_text', 'find_text', 'replace_text', 'selective_replace', 'word_frequency',
+    'generate_summary', 'text_stats', 'reset_text', 'intelligent_rewrite', 'advanced_analysis',
+    'get_stopwords', 'add_stopwords', 'remove_stopwords', 'clear_stopwords',
+    'add_corpus_documents', 'corpus_top_terms', 'corpus_keywords', 'export_results'
+})
+
+# 请求中带text时不读取当前文本的接口（未带text时分析当前文本，属于有状态请求）
+TEXT_OPTIONAL_ENDPOINTS = frozenset({
+    'segment_text', 'extract_entities', 'analyze_sentiment', 'analyze_syntax'
+})
+
+# 转发到状态进程的超时（秒），长文本改写可能较慢
+STATE_FORWARD_TIMEOUT = 300
+
+# 转发响应时不复制的逐跳头部
+_HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'content-length',
+                       'proxy-authenticate', 'proxy-authorization', 'te', 'trailers', 'upgrade'}
+
+# 全局语料库索引（多篇文档的词频和TF-IDF）
+corpus_index = CorpusIndex(processor)
+
+
+def is_stateful_request(endpoint: Optional[str], data) -> bool:
+    """请求是否需要读写进程内状态（只能由状态进程处理）"""
+    if endpoint in STATEFUL_ENDPOINTS:
+        return True
+    if endpoint in TEXT_OPTIONAL_ENDPOINTS:
+        return not (isinstance(data, dict) and data.get('text'))
+    return False
+
+
+def forward_to_state_server(host: str, port: int) -> Response:
+    """把当前请求原样转发给状态进程，返回其响应"""
+    connection = http.client.HTTPConnection(host, port, timeout=STATE_FORWARD_TIMEOUT)
+    try:
+        headers = {'Content-Type': request.content_type} if request.content_type else {}
+        connection.request(request.method, request.full_path, body=request.get_data(), headers=headers)
+        upstream = connection.getresponse()
+        return Response(upstream.read(), status=upstream.status,
+                        headers=[(name, value) for name, value in upstream.getheaders()
+                                 if name.lower() not in _HOP_BY_HOP_HEADERS])
+    except (OSError, http.client.HTTPException) as e:
+        return jsonify({
+            'success': False,
+            'error': f'状态进程不可用: {e}'
+        }), 503
+    finally:
+        connection.close()
+
+
+@app.before_request
+def route_stateful_request():
+    """多进程部署时（serve.py 设置了 STATE_SERVER），有状态请求转发给状态进程"""
+    state_server = app.config.get('STATE_SERVER')
+    if state_server and is_stateful_request(request.endpoint, request.get_json(silent=True)):
+        return forward_to_state_server(*state_server)
+    return None
+
+
+def start_warmup():
+    """在后台线程中预热模型，预热完成前 /api/ready 返回503"""
+    thread = threading.Thread(target=processor.warmup, name='model-warmup', daemon=True)
+    thread.start()
+    return thread
+
 @app.route('/')
 def index():
     """返回前端页面"""
@@ -218,9 +292,16 @@ def word_frequency():
         exclude_numbers = data.get('exclude_numbers', True)
         exclude_single_chars = data.get('exclude_single_chars', True)
         segmentation_method = data.get('segmentation_method', 'auto')
+        # 流式近似统计（大文本时内存有上限，计数为估计值）
+        streaming = data.get('streaming', False)
+        capacity = data.get('capacity')
+        max_error = data.get('max_error')
 
         top_words = processor.get_top_words(
             n=n,
+            streaming=streaming,
+            capacity=capacity,
+            max_error=max_error,
             ignore_case=ignore_case,
             min_word_length=min_word_length,
             exclude_punctuation=exclude_punctuation,
@@ -234,7 +315,8 @@ def word_frequency():
             'success': True,
             'word_frequency': top_words,
             'segmentation_method': segmentation_method,
-            'exclude_stopwords': exclude_stopwords
+            'exclude_stopwords': exclude_stopwords,
+            'approximate': bool(streaming)
         })
 
     except Exception as e:
@@ -259,17 +341,68 @@ def segment_text():
                 'error': '文本内容不能为空'
             }), 400
 
+        # 'auto'按文本长度和延迟预算选择分词器，并在响应中说明选择理由
+        if method == 'auto':
+            selection = processor.select_segmenter(len(text), with_pos)
+        else:
+            selection = {'method': method, 'reason': '请求指定'}
+
         # 直接使用全局处理器进行分词
         segments = processor.segment_text(
             text=text,
-            method=method,
+            method=selection['method'],
             mode=mode,
             with_pos=with_pos
         )
 
         return jsonify({
             'success': True,
-            'segments': segments,
+            'segments': segments.to_list(),
+            'method': method,
+            'segmenter': selection,
+            'mode': mode,
+            'with_pos': with_pos
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/segment_batch', methods=['POST'])
+def segment_batch():
+    """批量分词（多进程并行，结果顺序与输入一致）"""
+    try:
+        data = request.get_json()
+        texts = data.get('texts', [])
+        method = data.get('method', 'auto')
+        mode = data.get('mode', 'accurate')
+        with_pos = data.get('with_pos', False)
+        workers = data.get('workers')
+
+        if not isinstance(texts, list) or not texts:
+            return jsonify({
+                'success': False,
+                'error': 'texts必须是非空的文本列表'
+            }), 400
+
+        # 客户端指定的进程数限制在 1..segment_workers 之间
+        if workers is not None:
+            workers = max(1, min(int(workers), processor.segment_workers))
+
+        results = processor.segment_batch(
+            texts,
+            method=method,
+            mode=mode,
+            with_pos=with_pos,
+            workers=workers
+        )
+
+        return jsonify({
+            'success': True,
+            'results': [doc.to_list() for doc in results],
+            'count': len(results),
             'method': method,
             'mode': mode,
             'with_pos': with_pos
@@ -507,6 +640,30 @@ def nlp_capabilities():
             'error': str(e)
         }), 400
 
+@app.route('/api/health', methods=['GET'])
+def health():
+    """存活检查：进程可以响应请求即返回200，同时给出每个模型的预热状态"""
+    warmup = processor.get_warmup_status()
+    return jsonify({
+        'success': True,
+        'status': 'ok',
+        'ready': warmup['ready'],
+        'warmup': warmup,
+        'qwen3': processor.qwen3_monitor.get_status() if processor.qwen3_monitor else None
+    })
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """就绪检查：模型预热完成前返回503，负载均衡器据此决定是否转发流量"""
+    warmup = processor.get_warmup_status()
+    return jsonify({
+        'success': warmup['ready'],
+        'ready': warmup['ready'],
+        'state': warmup['state'],
+        'duration': warmup['duration'],
+        'models': {name: info['state'] for name, info in warmup['models'].items()}
+    }), 200 if warmup['ready'] else 503
+
 @app.route('/api/advanced_analysis', methods=['POST'])
 def advanced_analysis():
     """高级文本分析（保留原有功能）"""
@@ -572,7 +729,8 @@ def get_stopwords():
         custom_stopwords = processor.get_custom_stopwords()
         return jsonify({
             'success': True,
-            'custom_stopwords': custom_stopwords
+            'custom_stopwords': custom_stopwords,
+            'version': processor.get_stopwords_version()
         })
     except Exception as e:
         return jsonify({
@@ -664,6 +822,157 @@ def clear_stopwords():
             'error': str(e)
         }), 400
 
+@app.route('/api/user_dict', methods=['GET'])
+def get_user_dict():
+    """获取当前部署配置的用户词典"""
+    try:
+        return jsonify({
+            'success': True,
+            'profile': processor.profile.name,
+            **processor.get_user_words()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/user_dict', methods=['POST'])
+def add_user_dict():
+    """添加用户词汇（words列表，或content中按jieba用户词典格式批量导入）"""
+    try:
+        data = request.get_json()
+        words = data.get('words', [])
+        content = data.get('content', '')
+
+        if isinstance(words, str):
+            import re
+            words = [word for word in re.split(r'[,，;；\s]+', words) if word.strip()]
+        if content:
+            words = list(words) + parse_dict_lines(content.splitlines())
+
+        if not words:
+            return jsonify({
+                'success': False,
+                'error': '请提供要添加的词汇'
+            }), 400
+
+        changed = processor.add_user_words(words)
+
+        return jsonify({
+            'success': True,
+            'message': f'已更新 {changed} 个词汇',
+            'changed': changed
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/user_dict', methods=['DELETE'])
+def remove_user_dict():
+    """删除用户词汇"""
+    try:
+        data = request.get_json()
+        words = data.get('words', [])
+
+        if isinstance(words, str):
+            import re
+            words = re.split(r'[,，;；\s]+', words)
+        words = [str(word).strip() for word in words if str(word).strip()]
+
+        if not words:
+            return jsonify({
+                'success': False,
+                'error': '请提供要删除的词汇'
+            }), 400
+
+        changed = processor.remove_user_words(words)
+
+        return jsonify({
+            'success': True,
+            'message': f'已删除 {changed} 个词汇',
+            'removed_words': words
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/corpus/documents', methods=['POST'])
+def add_corpus_documents():
+    """向语料库添加文档（texts列表，可选ids为对应的文档ID）"""
+    try:
+        data = request.get_json()
+        texts = data.get('texts', [])
+        doc_ids = data.get('ids')
+
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return jsonify({
+                'success': False,
+                'error': '请提供要添加的文档'
+            }), 400
+
+        doc_ids = corpus_index.add_documents(texts, doc_ids)
+
+        return jsonify({
+            'success': True,
+            'message': f'已添加 {len(doc_ids)} 篇文档',
+            'ids': doc_ids,
+            'stats': corpus_index.get_stats()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/corpus/top_terms', methods=['GET'])
+def corpus_top_terms():
+    """语料库高频词（by=count按出现次数，by=df按文档频率）"""
+    try:
+        k = request.args.get('k', 20, type=int)
+        by = request.args.get('by', 'count')
+        return jsonify({
+            'success': True,
+            'top_terms': corpus_index.top_terms(k, by=by),
+            'stats': corpus_index.get_stats()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/corpus/keywords', methods=['POST'])
+def corpus_keywords():
+    """语料库中某篇文档TF-IDF最高的词"""
+    try:
+        data = request.get_json()
+        doc_id = data.get('id')
+        k = data.get('k', 10)
+
+        if doc_id not in corpus_index:
+            return jsonify({
+                'success': False,
+                'error': f'文档不存在: {doc_id}'
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'id': doc_id,
+            'keywords': corpus_index.top_tfidf(doc_id, k)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
 @app.route('/api/export_results', methods=['POST'])
 def export_results():
     """导出处理结果"""
@@ -856,6 +1165,13 @@ if __name__ == '__main__':
     import sys
     debug_mode = '--debug' in sys.argv or os.environ.get('FLASK_ENV') == 'development'
 
+    # 后台启动Qwen3健康监测，不阻塞服务启动
+    if processor.qwen3_monitor:
+        processor.qwen3_monitor.start()
+
+    # 后台预热模型，/api/ready 在预热完成后才返回200
+    start_warmup()
+
     print("启动文本处理工具 Web 服务器...")
     print("访问地址: http://localhost:5000")
     if debug_mode: